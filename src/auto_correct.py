@@ -0,0 +1,85 @@
+'''
+Auto Correct
+
+This file contains functions for fixing every misspelled word in a text with its number one suggested word in one pass. Suggestions
+are calculated once per unique misspelled word, and the corrected text is assembled from the recorded start and end offsets of the
+misspelled words instead of rebuilding the whole string for every replacement.
+'''
+from selection_of_word import modify_capitalization
+from spell_checker import spell_check_words
+from suggestion_engine import SuggestionEngine
+from word_list import WordList
+
+
+def choose_corrections(engine:SuggestionEngine, mispelled_words:WordList, max_distance:int=1) -> dict:
+    '''
+    Finds the top suggestion for every unique misspelled word. Words whose top suggestion is more than max_distance edits away are
+    not corrected because the suggestion is not reliable enough to apply without asking
+
+    Input: engine - suggestion engine of the dictionary, mispelled_words - object containing list of misspelled words, max_distance
+    - largest edit distance of a suggestion that can be applied automatically
+    Return: corrections - dictionary of casefolded misspelled word -> replacement word
+    '''
+    corrections = {}
+    for word in mispelled_words.getWordCounts():
+        suggestions = engine.calculate(word, limit=1)
+        if len(suggestions) > 0 and suggestions[0]['distance'] <= max_distance:
+            corrections[word] = suggestions[0]['word']
+    return corrections
+
+def apply_corrections(text:str, mispelled_words:WordList, corrections:dict) -> tuple[str, list[dict]]:
+    '''
+    Builds the corrected text in a single pass over the misspelled words in the order they appear. Corrected words are removed from
+    mispelled_words and the start and end of the remaining words are moved to where they are in the corrected text
+
+    Input: text - text that was spell checked, mispelled_words - object containing list of misspelled words, corrections -
+    dictionary of casefolded misspelled word -> replacement word
+    Return: corrected text, applied - list of dictionaries with keys 'word', 'start', 'end' (offsets in original text) and
+    'replacement'
+    '''
+    pieces = []
+    applied = []
+    corrected_indexes = []
+    position = 0 # end of the text that has been copied so far
+    shift = 0 # how much longer the corrected text is than the original up to position
+
+    items = mispelled_words.getItems()
+    for index in sorted(range(len(items)), key=lambda i: items[i]['start']):
+        item = items[index]
+        replacement = corrections.get(item['word'].casefold().strip())
+        if replacement is None:
+            item['start'] += shift
+            item['end'] += shift
+            continue
+
+        replacement = modify_capitalization(text, item['start'], replacement)
+        pieces.append(text[position:item['start']])
+        pieces.append(replacement)
+        applied.append({
+            'word': item['word'],
+            'start': item['start'],
+            'end': item['end'],
+            'replacement': replacement
+        })
+        shift += len(replacement) - (item['end'] - item['start'])
+        position = item['end']
+        corrected_indexes.append(index)
+    pieces.append(text[position:])
+
+    # delete from the back so earlier indexes stay valid
+    for index in sorted(corrected_indexes, reverse=True):
+        mispelled_words.delete(index)
+    return ''.join(pieces), applied
+
+def auto_correct(engine:SuggestionEngine, text:str, mispelled_words:WordList=None, max_distance:int=1) -> tuple[str, list[dict]]:
+    '''
+    Replaces every misspelled word in text with its top suggestion if that suggestion is at most max_distance edits away
+
+    Input: engine - suggestion engine of the dictionary, text - text to correct, mispelled_words - misspelled words of text (text is spell
+    checked if not given), max_distance - largest edit distance of a suggestion that can be applied automatically
+    Return: corrected text, applied - list of corrections made (see apply_corrections)
+    '''
+    if mispelled_words is None:
+        mispelled_words = spell_check_words(engine.getDictionary(), text)
+    corrections = choose_corrections(engine, mispelled_words, max_distance)
+    return apply_corrections(text, mispelled_words, corrections)
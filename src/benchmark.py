@@ -0,0 +1,280 @@
+'''
+Benchmark
+
+Reproducible benchmarks for the hot paths of the spell checker: loading the dictionary (upload_dictionary), tokenizing
+(split_words), spell checking (spell_check_words), edit distance (edit_distance) and suggestions (SuggestionEngine.calculate). The
+input is a synthetic corpus made from words_alpha.txt with a controlled typo rate and a fixed seed, so two runs on the same machine
+are comparable.
+
+    python benchmark.py run --output before.json
+    python benchmark.py run --output after.json
+    python benchmark.py compare before.json after.json
+
+Throughput is reported in words (or pairs) per second, suggestion latency as p50 and p99 in milliseconds and memory as the peak
+traced allocation of each stage (with --memory) plus the peak resident size of the process. compare flags every metric that got
+worse by more than --threshold and exits with status 1 if there are any.
+'''
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import string
+import sys
+import time
+import tracemalloc
+
+import suggestions
+from compiled_dictionary import load_compiled_dictionary
+from main import upload_dictionary
+from spell_checker import split_words, spell_check_words
+from suggestion_engine import SuggestionEngine
+
+DEFAULT_DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dictionaries', 'words_alpha.txt')
+
+# metrics where a larger value is better, every other metric is better when smaller
+HIGHER_IS_BETTER = ('words_per_second', 'pairs_per_second')
+
+
+def make_typo(word:str, rng:random.Random) -> str:
+    '''
+    Applies one random edit (deletion, insertion, substitution or swap of adjacent letters) to a word
+
+    Input: word - word to change, rng - random number generator
+    Return: changed word
+    '''
+    position = rng.randrange(len(word))
+    edit = rng.randrange(4)
+    if edit == 0 and len(word) > 1:
+        return word[:position] + word[position + 1:]
+    elif edit == 1:
+        return word[:position] + rng.choice(string.ascii_lowercase) + word[position:]
+    elif edit == 2 or len(word) < 2:
+        return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+    position = min(position, len(word) - 2)
+    return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+
+def load_and_look_up(dictionary_name:str):
+    '''
+    Loads the compiled dictionary and looks up one word, so work a dictionary leaves for its first lookup (eg. reading the pages of
+    its hash table) is timed as loading instead of being charged to the first check
+
+    Input: dictionary_name - dictionary text file
+    Return: loaded dictionary
+    '''
+    dictionary = upload_dictionary(dictionary_name)
+    'the' in dictionary
+    return dictionary
+
+def generate_corpus(words:list[str], word_count:int, typo_rate:float, seed:int) -> tuple[str, list[str]]:
+    '''
+    Builds a text of random dictionary words where typo_rate of the words have one random edit
+
+    Input: words - dictionary words, word_count - number of words in the text, typo_rate - fraction of words with a typo, seed -
+    random seed
+    Return: text, typos - list of the misspelled words that were made
+    '''
+    rng = random.Random(seed)
+    pieces = []
+    typos = []
+    for i in range(word_count):
+        word = rng.choice(words)
+        if rng.random() < typo_rate:
+            word = make_typo(word, rng)
+            typos.append(word)
+        if rng.random() < 0.1:
+            word = word.capitalize()
+        pieces.append(word)
+        pieces.append(rng.choice(('. ', ', ', '\n')) if rng.random() < 0.1 else ' ')
+    return ''.join(pieces), typos
+
+def measure(function, trace_memory:bool):
+    '''
+    Runs a function once and measures it
+
+    Input: function - function to run, trace_memory - also measure peak memory allocated while it runs (slower)
+    Return: result of function, seconds taken, peak traced memory in bytes (None if not traced)
+    '''
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def percentile(values:list[float], fraction:float) -> float:
+    '''
+    Returns the value at a fraction (0-1) of the sorted values using the nearest rank
+    '''
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(fraction * len(values) + 0.5) - 1))
+    return values[index]
+
+def run_benchmarks(arguments:argparse.Namespace) -> dict:
+    '''
+    Runs every benchmark stage
+
+    Input: arguments - parsed run command arguments
+    Return: results - dictionary of settings, environment and metrics for each stage
+    '''
+    with open(arguments.dictionary, 'r') as file:
+        words = file.read().split()
+    text, typos = generate_corpus(words, arguments.words, arguments.typo_rate, arguments.seed)
+    word_count = len(split_words(text))
+    stages = {}
+
+    def add_stage(name, seconds, peak, amount, unit='words_per_second'):
+        stages[name] = {'seconds': round(seconds, 4), unit: round(amount / seconds, 1) if seconds > 0 else None}
+        if peak is not None:
+            stages[name]['peak_memory_bytes'] = peak
+
+    dictionary, seconds, peak = measure(lambda: upload_dictionary(arguments.dictionary, compiled=False), arguments.memory)
+    add_stage('load_text', seconds, peak, len(words))
+    # compile (or recompile) the .cdict file before timing, so load_compiled only measures loading it
+    try:
+        load_compiled_dictionary(arguments.dictionary)
+    except OSError:
+        pass # the compiled file can not be written, upload_dictionary falls back to the text file
+    compiled_dictionary, seconds, peak = measure(lambda: load_and_look_up(arguments.dictionary), arguments.memory)
+    add_stage('load_compiled', seconds, peak, len(words))
+
+    _, seconds, peak = measure(lambda: split_words(text), arguments.memory)
+    add_stage('tokenize', seconds, peak, word_count)
+    _, seconds, peak = measure(lambda: spell_check_words(dictionary, text), arguments.memory)
+    add_stage('check', seconds, peak, word_count)
+    _, seconds, peak = measure(lambda: spell_check_words(compiled_dictionary, text), arguments.memory)
+    add_stage('check_compiled', seconds, peak, word_count)
+
+    rng = random.Random(arguments.seed)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(arguments.pairs)]
+    _, seconds, peak = measure(lambda: [suggestions.edit_distance(a, b) for a, b in pairs], arguments.memory)
+    add_stage('edit_distance', seconds, peak, len(pairs), 'pairs_per_second')
+
+    # suggestions: unique typos, cache disabled so every lookup is calculated
+    suggestions.set_suggestion_method(arguments.method)
+    engine = SuggestionEngine(dictionary, cache_size=0)
+    suggest_words = list(dict.fromkeys(typos))[:arguments.suggest_words]
+    if arguments.method != 'brute_force':
+        _, seconds, peak = measure(engine.prepare, arguments.memory)
+        add_stage('build_index', seconds, peak, len(words))
+    latencies = []
+    for word in suggest_words:
+        _, seconds, _ = measure(lambda: engine.calculate(word), False)
+        latencies.append(seconds * 1000)
+    if latencies:
+        stages['suggest'] = {
+            'words': len(latencies),
+            'p50_ms': round(percentile(latencies, 0.5), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'mean_ms': round(sum(latencies) / len(latencies), 3)
+        }
+
+    return {
+        'settings': {
+            'dictionary': os.path.basename(arguments.dictionary),
+            'words': arguments.words,
+            'typo_rate': arguments.typo_rate,
+            'seed': arguments.seed,
+            'pairs': arguments.pairs,
+            'suggest_words': arguments.suggest_words,
+            'method': arguments.method,
+            'memory': arguments.memory,
+            'numpy': suggestions.numpy is not None
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'stages': stages,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        'peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    }
+
+def compare_results(before:dict, after:dict, threshold:float) -> list[dict]:
+    '''
+    Compares every metric of two benchmark runs
+
+    Input: before - results of the baseline run, after - results of the new run, threshold - fraction a metric can get worse by
+    before it is flagged
+    Return: rows - list of dictionaries with keys 'metric', 'before', 'after', 'change' (fraction) and 'regression'
+    '''
+    rows = []
+    for stage, metrics in before['stages'].items():
+        for metric, old_value in metrics.items():
+            new_value = after['stages'].get(stage, {}).get(metric)
+            if metric in ('words', 'seconds') or not old_value or new_value is None:
+                continue
+            change = (new_value - old_value) / old_value
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append({
+                'metric': f'{stage}.{metric}',
+                'before': old_value,
+                'after': new_value,
+                'change': round(change, 4),
+                'regression': worse > threshold
+            })
+    return rows
+
+def build_parser() -> argparse.ArgumentParser:
+    '''
+    Creates the command line argument parser
+    '''
+    parser = argparse.ArgumentParser(prog='benchmark', description='Benchmark the spell checker hot paths')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the benchmarks and write the results as json')
+    run.add_argument('--dictionary', default=DEFAULT_DICTIONARY, help='dictionary .txt file used for words and lookups')
+    run.add_argument('--words', type=int, default=200000, help='number of words in the generated corpus (default: 200000)')
+    run.add_argument('--typo-rate', type=float, default=0.05, help='fraction of corpus words with a typo (default: 0.05)')
+    run.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    run.add_argument('--pairs', type=int, default=20000, help='number of word pairs for edit_distance (default: 20000)')
+    run.add_argument('--suggest-words', type=int, default=50, help='number of typos to time suggestions for (default: 50)')
+    run.add_argument('--method', choices=suggestions.SUGGESTION_METHODS, default='brute_force',
+                     help='suggestion method (default: brute_force)')
+    run.add_argument('--memory', action='store_true', help='measure peak memory of each stage with tracemalloc (slower)')
+    run.add_argument('--output', help='json file to write results to (printed if not given)')
+
+    compare = commands.add_parser('compare', help='compare two result files and flag regressions')
+    compare.add_argument('before', help='results of the baseline run')
+    compare.add_argument('after', help='results of the new run')
+    compare.add_argument('--threshold', type=float, default=0.1, help='allowed fraction a metric can get worse (default: 0.1)')
+    return parser
+
+def main(arguments:list[str]=None) -> int:
+    '''
+    Runs the benchmark command line interface
+
+    Input: arguments - command line arguments (sys.argv[1:] if not given)
+    Return: exit status - 1 if compare found a regression, otherwise 0
+    '''
+    arguments = build_parser().parse_args(arguments)
+    if arguments.command == 'run':
+        results = run_benchmarks(arguments)
+        output = json.dumps(results, indent=2)
+        if arguments.output:
+            with open(arguments.output, 'w') as file:
+                file.write(output + '\n')
+        print(output)
+        return 0
+
+    with open(arguments.before, 'r') as file:
+        before = json.load(file)
+    with open(arguments.after, 'r') as file:
+        after = json.load(file)
+    if before.get('settings') != after.get('settings'):
+        print("Warning: the runs used different settings, so the results may not be comparable")
+    rows = compare_results(before, after, arguments.threshold)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else ''
+        print(f"{row['metric']:<40} {row['before']:>14} {row['after']:>14} {row['change']:>+9.1%} {flag}")
+    return 1 if any(row['regression'] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+'''
+Bucketed Dictionary
+
+This BucketedDictionary class stores the dictionary words in a set for O(1) spell checking and also buckets them by length, so the
+suggestion engine only has to look at the words whose length is within the max allowed distance of a misspelled word instead of
+every word in the dictionary.
+
+This class has the following methods
+    - add: adds a word to the set and to the bucket for its length
+    - wordsOfLength: returns the words that have a given length
+'''
+
+class BucketedDictionary():
+    '''
+    An instance of this class represents a set of dictionary words bucketed by length
+    '''
+    def __init__(self, words=()):
+        self.__words = set()
+        self.__buckets = {} # length -> list of words with that length
+        for word in words:
+            self.add(word)
+
+    def __contains__(self, word:str) -> bool:
+        return word in self.__words
+
+    def __iter__(self):
+        return iter(self.__words)
+
+    def __len__(self):
+        return len(self.__words)
+
+    def add(self, word:str):
+        '''
+        Adds a word to the dictionary
+        Input: word - word to add
+        Return: None
+        '''
+        if word in self.__words:
+            return
+        self.__words.add(word)
+        bucket = self.__buckets.get(len(word))
+        if bucket is None:
+            self.__buckets[len(word)] = [word]
+        else:
+            bucket.append(word)
+
+    def wordsOfLength(self, length:int) -> list[str]:
+        '''
+        Finds all words with a given length
+        Input: length - length of words
+        Return: list of words with that length (empty if there are none)
+        '''
+        return self.__buckets.get(length, [])
+
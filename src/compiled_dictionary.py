@@ -0,0 +1,301 @@
+'''
+Compiled Dictionary
+
+This file contains functions for compiling a dictionary text file into a compact binary file and the CompiledDictionary class used
+to query it. The compiled file is memory-mapped, so loading it does not read or split the whole text file and every process that
+opens it shares the same page-cached copy. Nothing is copied out of the file to answer a lookup: checking if a word is in the
+dictionary (and indexOf) hashes the word and probes a hash table stored in the file, which takes about the same time however many
+words there are, and suggestions (wordsOfLength) decode only the words of one length.
+
+The file also holds the graph of the DAWG suggestion index (see dawg.py), so the index is read from the file instead of being built
+again every time the program starts. Building it is the slow part of compiling. If the dictionary has a word frequency file (see
+word_frequency.py) its counts are stored too, so the frequency file does not have to be read when the program starts. The file is
+compiled again whenever the dictionary or its frequency file is newer than it.
+
+File layout (all integers are unsigned 32 bit in the byte order recorded in the header)
+    - header: magic, version, byte order, number of words, longest word length, hash table size, graph node count, graph edge count,
+      number of frequency counts (0 without a frequency file)
+    - length table: index of the first word of each length from 0 to longest length + 1
+    - offsets: start of each word in the word data, plus the end of the last word
+    - hash table: index + 1 of the word whose crc32 (or the next free slot after it) is each slot, 0 for an empty slot. The size is
+      a power of two at least twice the number of words, so probes are short
+    - graph: first edge of each node plus the end of the last node, letter (code point) of each edge, target node of each edge
+    - frequency counts: count of each word in the same order as the words
+    - graph final flags: one byte per node, 1 if the node ends a word
+    - word data: utf-8 encoded words sorted by length and then by their encoded bytes
+
+The CompiledDictionary class has the following methods
+    - add: adds a word to the dictionary for this session (added words are kept in memory, the file is not changed)
+    - indexOf: returns the position of a word in the compiled file
+    - getDawg: returns the graph of the DAWG index stored in the file
+    - getAddedWords: returns the words added this session
+    - getCounts: returns the word frequency counts stored in the file
+    - wordsOfLength: returns the words that have a given length
+    - wordCount: returns the number of words in the compiled file
+    - close: unmaps the file
+'''
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from dawg import build_dawg
+from word_frequency import MAX_COUNT, frequency_file_name, read_counts
+
+MAGIC = b'SPCD'
+VERSION = 3
+COMPILED_ENDING = '.cdict'
+# magic, version, byte order (1 = little), word count, longest word length, hash table size, graph node count, graph edge count,
+# frequency count count, padded so the arrays after it are aligned
+_HEADER = struct.Struct('=4sIBIIIIII3x')
+_LABEL_ENCODING = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def compiled_file_name(dictionary_name:str) -> str:
+    '''
+    Returns the name of the compiled file for a dictionary text file
+
+    Input: dictionary_name - path to dictionary text file
+    Return: path to compiled file (stored beside the text file)
+    '''
+    return os.path.splitext(dictionary_name)[0] + COMPILED_ENDING
+
+def compile_dictionary(dictionary_name:str, compiled_name:str=None) -> str:
+    '''
+    Reads a dictionary text file (and its frequency file if there is one) and writes it as a compiled dictionary file. The file is
+    written to a temporary file first and then renamed so processes that have the old file mapped are not affected
+
+    Input: dictionary_name - path to dictionary text file, compiled_name - path to write to (beside text file if not given)
+    Return: compiled_name - path of compiled file
+    '''
+    if compiled_name is None:
+        compiled_name = compiled_file_name(dictionary_name)
+    with open(dictionary_name, 'r') as file:
+        words = set(file.read().split())
+
+    encoded_words = sorted((len(word), word.encode('utf-8')) for word in words)
+    max_length = encoded_words[-1][0] if encoded_words else 0
+
+    # length_table[length] = index of the first word with that length (or of the next longer word if there is none)
+    length_table = array('I', [0] * (max_length + 2))
+    offsets = array('I', [0])
+    position = 0
+    for length, encoded in encoded_words:
+        length_table[length + 1] += 1
+        position += len(encoded)
+        offsets.append(position)
+    for length in range(1, max_length + 2):
+        length_table[length] += length_table[length - 1]
+
+    # open addressing with linear probing, see CompiledDictionary.indexOf
+    table_size = 1 << (2 * len(encoded_words) - 1).bit_length() if encoded_words else 1
+    mask = table_size - 1
+    table = array('I', bytes(4 * table_size))
+    for index, (_, encoded) in enumerate(encoded_words):
+        slot = zlib.crc32(encoded) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = index + 1
+
+    first_edge, labels, targets, final = build_dawg(words)
+
+    # counts of words that only differ in case are added together, the same as FrequencyTable.load
+    counts = array('I')
+    frequency_name = frequency_file_name(dictionary_name)
+    if os.path.exists(frequency_name):
+        positions = {encoded.decode('utf-8'): index for index, (_, encoded) in enumerate(encoded_words)}
+        counts = array('I', bytes(4 * len(encoded_words)))
+        for word, count in read_counts(frequency_name):
+            index = positions.get(word)
+            if index is not None:
+                counts[index] = min(counts[index] + count, MAX_COUNT)
+
+    temporary_name = f'{compiled_name}.{os.getpid()}.tmp'
+    with open(temporary_name, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, sys.byteorder == 'little', len(encoded_words), max_length, table_size, len(final),
+                                len(targets), len(counts)))
+        length_table.tofile(file)
+        offsets.tofile(file)
+        table.tofile(file)
+        first_edge.tofile(file)
+        array('I', map(ord, labels)).tofile(file)
+        targets.tofile(file)
+        counts.tofile(file)
+        file.write(final)
+        for _, encoded in encoded_words:
+            file.write(encoded)
+    os.replace(temporary_name, compiled_name)
+    return compiled_name
+
+def load_compiled_dictionary(dictionary_name:str):
+    '''
+    Loads the compiled version of a dictionary text file, compiling it first if it does not exist, is out of date (the text file
+    or its frequency file is newer) or was written by an incompatible version
+
+    Input: dictionary_name - path to dictionary text file
+    Return: CompiledDictionary for the text file
+    '''
+    compiled_name = compiled_file_name(dictionary_name)
+    source_time = os.path.getmtime(dictionary_name)
+    if os.path.exists(frequency_file_name(dictionary_name)):
+        source_time = max(source_time, os.path.getmtime(frequency_file_name(dictionary_name)))
+    if not os.path.exists(compiled_name) or os.path.getmtime(compiled_name) < source_time:
+        compile_dictionary(dictionary_name, compiled_name)
+    try:
+        return CompiledDictionary(compiled_name)
+    except ValueError:
+        compile_dictionary(dictionary_name, compiled_name)
+        return CompiledDictionary(compiled_name)
+
+
+class CompiledDictionary():
+    '''
+    An instance of this class represents a read only memory-mapped dictionary file with support for adding words in memory
+    '''
+    def __init__(self, compiled_name:str):
+        with open(compiled_name, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, little_endian, count, max_length, table_size, node_count, edge_count,
+             counts_size) = _HEADER.unpack_from(self.__map, 0)
+        except struct.error:
+            magic = None
+        if magic != MAGIC or version != VERSION or little_endian != (sys.byteorder == 'little'):
+            self.__map.close()
+            raise ValueError(f"{compiled_name} is not a compatible compiled dictionary")
+
+        view = self.__view = memoryview(self.__map)
+        sections = []
+        start = _HEADER.size
+        # every section but the word data is an array of unsigned 32 bit integers, except the final flags (bytes)
+        for size, item_format in ((max_length + 2, 'I'), (count + 1, 'I'), (table_size, 'I'), (node_count + 1, 'I'),
+                                  (edge_count, 'I'), (edge_count, 'I'), (counts_size, 'I'), (node_count, 'B')):
+            end = start + size * (4 if item_format == 'I' else 1)
+            sections.append(view[start:end].cast(item_format))
+            start = end
+        self.__sections = sections
+        (self.__length_table, self.__offsets, self.__table, self.__first_edge, self.__labels, self.__targets, self.__counts,
+         self.__final) = sections
+        self.__mask = table_size - 1
+        self.__data_start = start
+        self.__count = count
+        self.__max_length = max_length
+        self.__added = set() # words added during this session
+
+    def __getWord(self, index:int) -> bytes:
+        '''
+        Returns the encoded word at an index of the sorted word data
+        Input: index - index of word
+        Return: bytes of word
+        '''
+        start = self.__data_start + self.__offsets[index]
+        end = self.__data_start + self.__offsets[index + 1]
+        return self.__map[start:end]
+
+    def indexOf(self, word:str) -> int:
+        '''
+        Finds the position of a word in the compiled file with the hash table of the file. Positions go from 0 to wordCount() - 1
+        (shortest words first), so other data about the words can be stored in arrays parallel to the file
+        Input: word - word to look for
+        Return: index of word, -1 if it is not in the file (words added this session are not in the file)
+        '''
+        if len(word) > self.__max_length:
+            return -1
+        encoded = word.encode('utf-8', 'surrogatepass')
+        table = self.__table
+        mask = self.__mask
+        slot = zlib.crc32(encoded) & mask
+        while True:
+            index = table[slot]
+            if index == 0:
+                return -1
+            if self.__getWord(index - 1) == encoded:
+                return index - 1
+            slot = (slot + 1) & mask
+
+    def __contains__(self, word:str) -> bool:
+        '''
+        Checks if a word is in the dictionary
+        Input: word - word to look for
+        Return: True if word is in dictionary
+        '''
+        return self.indexOf(word) >= 0 or word in self.__added
+
+    def __iter__(self):
+        '''
+        Iterates over every word in the dictionary, shortest words first
+        '''
+        for index in range(self.__count):
+            yield self.__getWord(index).decode('utf-8')
+        yield from self.__added
+
+    def __len__(self):
+        return self.__count + len(self.__added)
+
+    def add(self, word:str):
+        '''
+        Adds a word to the dictionary for this session only
+        Input: word - word to add
+        Return: None
+        '''
+        if word not in self:
+            self.__added.add(word)
+
+    def getAddedWords(self) -> list[str]:
+        '''
+        Getter function for the words added this session, which are not in the file or its graph
+        Input: N/A
+        Return: list of added words
+        '''
+        return list(self.__added)
+
+    def getCounts(self):
+        '''
+        Getter function for the word frequency counts stored in the file, in the same order as the words (see FrequencyTable)
+        Input: N/A
+        Return: read only view of the counts, None if the dictionary had no frequency file when it was compiled
+        '''
+        return self.__counts if len(self.__counts) > 0 else None
+
+    def getDawg(self) -> tuple:
+        '''
+        Getter function for the graph of the DAWG index of the words in the file (see DawgIndex). The arrays are views of the file,
+        only the letters are decoded into a string
+        Input: N/A
+        Return: (first_edge, labels, targets, final, number of words)
+        '''
+        labels = self.__labels.tobytes().decode(_LABEL_ENCODING)
+        return self.__first_edge, labels, self.__targets, self.__final, self.__count
+
+    def wordsOfLength(self, length:int) -> list[str]:
+        '''
+        Finds all words with a given length. Words of the same length are stored next to each other so only that range is decoded
+        Input: length - length of words
+        Return: list of words with that length (empty if there are none)
+        '''
+        words = [word for word in self.__added if len(word) == length]
+        if 0 <= length <= self.__max_length:
+            for index in range(self.__length_table[length], self.__length_table[length + 1]):
+                words.append(self.__getWord(index).decode('utf-8'))
+        return words
+
+    def wordCount(self):
+        '''
+        Getter function for the number of words stored in the compiled file
+        Input: N/A
+        Return: int - number of words in file
+        '''
+        return self.__count
+
+    def close(self):
+        '''
+        Releases the memory-mapped file
+        Input: N/A
+        Return: None
+        '''
+        for section in self.__sections:
+            section.release()
+        self.__view.release()
+        self.__map.close()
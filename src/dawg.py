@@ -0,0 +1,237 @@
+'''
+DAWG Index
+
+This DawgIndex class stores the dictionary as a minimized trie (a directed acyclic word graph, DAWG) used to look up word
+suggestions. Words that share a prefix share the path of that prefix and words that share a suffix share the nodes of that suffix,
+so the whole dictionary fits in a few flat arrays instead of one object per word.
+
+A search walks the graph depth first and fills one row of the Damerau-Levenshtein (optimal string alignment) dp table per letter
+of the path, the same table edit_distance fills for one word at a time. A row is shared by every word below that point of the
+path, so a common prefix is only scored once, and a path is abandoned as soon as every cell of its row is over the max distance.
+Only the cells within max distance of the diagonal are calculated, like bounded_edit_distance, and the row before the previous one
+is kept for transpositions, so the results are exactly those of comparing every word with edit_distance.
+
+The graph is built once from the sorted words and can not be changed, so words added later are kept in a small list that is
+compared with the distance function on every search. Building the graph of a large dictionary takes a few seconds, so a compiled
+dictionary stores it in its file (see compiled_dictionary.py) and the index is made from the stored arrays instead.
+
+This class has the following methods
+    - add: adds a word to the index
+    - search: returns every word within a given distance of a word along with that distance
+    - searchTiers: returns the same words one distance at a time, searching further only when the next distance is needed
+    - getSize: returns the number of words in the index
+    - getNodeCount: returns the number of nodes and edges in the graph
+'''
+from array import array
+
+
+def build_dawg(words) -> tuple[array, str, array, bytearray]:
+    '''
+    Builds the minimized graph of a list of words with the incremental algorithm for sorted input (Daciuk et al.): after each word,
+    the nodes of the previous word that are not shared with it are replaced by an equal node that is already in the graph, if
+    there is one
+
+    Input: words - iterable of words
+    Return: first_edge - index of the first edge of each node (node i has edges first_edge[i] to first_edge[i + 1]), labels - string
+    with the letter of each edge, targets - node each edge goes to, final - 1 for nodes that end a word (node 0 is the root)
+    '''
+    # while building, a node is [final, {letter: child}]
+    root = [False, {}]
+    register = {} # (final, ((letter, id of child), ...)) -> node
+    unchecked = [] # (parent, letter, child) along the path of the previous word that may still be merged
+
+    def minimize(down_to:int):
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            key = (child[0], tuple((edge, id(node)) for edge, node in child[1].items()))
+            existing = register.get(key)
+            if existing is None:
+                register[key] = child
+            else:
+                parent[1][letter] = existing
+
+    previous = ''
+    for word in sorted(set(words)):
+        common = 0
+        limit = min(len(word), len(previous))
+        while common < limit and word[common] == previous[common]:
+            common += 1
+        minimize(common)
+        node = unchecked[-1][2] if unchecked else root
+        for letter in word[common:]:
+            child = [False, {}]
+            node[1][letter] = child
+            unchecked.append((node, letter, child))
+            node = child
+        node[0] = True
+        previous = word
+    minimize(0)
+
+    # number the nodes (root first) and store their edges in flat arrays
+    numbers = {id(root): 0}
+    order = [root]
+    for node in order:
+        for child in node[1].values():
+            if id(child) not in numbers:
+                numbers[id(child)] = len(order)
+                order.append(child)
+    first_edge = array('I', [0])
+    labels = []
+    targets = array('I')
+    final = bytearray(len(order))
+    for number, node in enumerate(order):
+        final[number] = node[0]
+        for letter, child in node[1].items():
+            labels.append(letter)
+            targets.append(numbers[id(child)])
+        first_edge.append(len(targets))
+    return first_edge, ''.join(labels), targets, final
+
+
+class DawgIndex():
+    '''
+    An instance of this class represents a minimized trie of words. distance_function(word1, word2, max_distance) is only used for
+    words added after the index was built and only needs to be exact for distances up to max_distance. graph is a graph built
+    earlier, (first_edge, labels, targets, final, number of words) as returned by build_dawg plus the word count, used instead of
+    building one from words
+    '''
+    def __init__(self, distance_function, words=(), graph:tuple=None):
+        self.__distance = distance_function
+        if graph is None:
+            words = list(words)
+            self.__first_edge, self.__labels, self.__targets, self.__final = build_dawg(words)
+            self.__size = len(set(words))
+        else:
+            self.__first_edge, self.__labels, self.__targets, self.__final, self.__size = graph
+        self.__added = [] # words added after the graph was built
+        self.__added_set = set()
+
+    def __contains(self, word:str) -> bool:
+        '''
+        Checks if a word is in the graph by following its letters
+        '''
+        node = 0
+        for letter in word:
+            for edge in range(self.__first_edge[node], self.__first_edge[node + 1]):
+                if self.__labels[edge] == letter:
+                    node = self.__targets[edge]
+                    break
+            else:
+                return False
+        return self.__final[node] == 1
+
+    def add(self, word:str):
+        '''
+        Adds a word to the list of words searched outside the graph
+        Input: word - word to add
+        Return: None
+        '''
+        if word in self.__added_set or self.__contains(word):
+            return
+        self.__added_set.add(word)
+        self.__added.append(word)
+        self.__size += 1
+
+    def search(self, word:str, max_distance:int) -> list[tuple]:
+        '''
+        Finds all words in the index that are at most max_distance edits away from word
+
+        Input: word - word to search for, max_distance - search radius
+        Return: matches - list of (word, distance) tuples in no particular order
+        '''
+        return next(self.searchTiers(word, max_distance, max_distance))
+
+    def searchTiers(self, word:str, max_distance:int, first_tier:int=1):
+        '''
+        Finds the words within max_distance edits of word one distance tier at a time. The rows are calculated for max_distance, so
+        the distances are exact, but a tier only follows the paths whose row minimum is within its own distance. Paths that are
+        further away are put aside by their row minimum (distances can not go down further along a path) and followed by the tier
+        of that distance, so every path is only scored once however many tiers are used
+
+        Input: word - word to search for, max_distance - search radius, first_tier - distance of the first tier
+        Return: iterator of lists of (word, distance) tuples, the first with every match within first_tier and then one list for each
+        distance up to max_distance
+        '''
+        first_edge = self.__first_edge
+        labels = self.__labels
+        targets = self.__targets
+        final = self.__final
+        n = len(word)
+        too_far = max_distance + 1
+        found = [[] for _ in range(too_far)] # matches by distance
+        deferred = [[] for _ in range(too_far)] # stack entries by the minimum of their row
+
+        # base case - the empty prefix compared against every prefix of word
+        root_row = [j if j <= max_distance else too_far for j in range(n + 1)]
+        if final[0] and root_row[n] <= max_distance:
+            found[root_row[n]].append(('', root_row[n]))
+        for added in self.__added:
+            distance = self.__distance(word, added, max_distance)
+            if distance <= max_distance:
+                found[distance].append((added, distance))
+
+        # each entry is (node, depth, prefix, row of prefix, row before it, last letter of prefix)
+        stack = [(0, 0, '', root_row, None, '')]
+        tier = first_tier = min(first_tier, max_distance)
+        while True:
+            while stack:
+                node, depth, prefix, previous_row, row_before_previous, previous_letter = stack.pop()
+                i = depth + 1
+                low = max(1, i - max_distance)
+                high = min(n, i + max_distance)
+                for edge in range(first_edge[node], first_edge[node + 1]):
+                    letter = labels[edge]
+                    current_row = [too_far] * (n + 1)
+                    if i <= max_distance:
+                        current_row[0] = i
+                    row_min = current_row[0]
+
+                    # only calculate the band of cells within max_distance of the diagonal
+                    for j in range(low, high + 1):
+                        letter2 = word[j - 1]
+                        distance = previous_row[j - 1] + (letter != letter2) # substitution
+                        if previous_row[j] + 1 < distance: # deletion
+                            distance = previous_row[j] + 1
+                        if current_row[j - 1] + 1 < distance: # insertion
+                            distance = current_row[j - 1] + 1
+                        # transposition (swap of adjacent characters)
+                        if i > 1 and j > 1 and letter == word[j - 2] and previous_letter == letter2:
+                            if row_before_previous[j - 2] + 1 < distance:
+                                distance = row_before_previous[j - 2] + 1
+                        if distance > too_far:
+                            distance = too_far
+                        current_row[j] = distance
+                        if distance < row_min:
+                            row_min = distance
+
+                    # distances can not go down further along the path, so skip everything below once the whole row is too far
+                    if row_min > max_distance:
+                        continue
+                    target = targets[edge]
+                    if final[target] and current_row[n] <= max_distance:
+                        found[current_row[n]].append((prefix + letter, current_row[n]))
+                    entry = (target, i, prefix + letter, current_row, previous_row, letter)
+                    if row_min <= tier:
+                        stack.append(entry)
+                    else:
+                        deferred[row_min].append(entry)
+
+            if tier == first_tier:
+                yield [match for distance in range(tier + 1) for match in found[distance]]
+            else:
+                yield found[tier]
+            if tier == max_distance:
+                return
+            tier += 1
+            stack = deferred[tier]
+
+    def getSize(self):
+        return self.__size
+
+    def getNodeCount(self) -> tuple[int, int]:
+        '''
+        Getter function for the size of the graph
+        Input: N/A
+        Return: number of nodes, number of edges
+        '''
+        return len(self.__final), len(self.__targets)
@@ -7,7 +7,7 @@ This file contains functions for validating user input (input is continously ask
 '''
 
 
-def validator(prompt:str, valid_values, validate_function:function):
+def validator(prompt:str, valid_values, validate_function:callable):
     '''
     This function checks if a value is valid and keeps retrying it until it is valid
     
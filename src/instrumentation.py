@@ -0,0 +1,169 @@
+'''
+Instrumentation
+
+Opt-in timing and counters for seeing where time goes in a run. It is turned on by setting the SPELLCHECK_PROFILE environment
+variable (or by calling enable, eg. from the --profile option of spellcheck.py):
+
+    SPELLCHECK_PROFILE=1 python main.py                 prints a summary to stderr at exit
+    SPELLCHECK_PROFILE=profile.json python main.py      writes a Chrome trace (chrome://tracing or Perfetto) with the summary
+
+Code marks a stage with "with stage('name'):" and counts events with count('name', amount). While profiling is off, stage returns
+a shared do nothing context manager and count returns immediately, so the marks cost almost nothing.
+
+The Chrome trace keeps only the last MAX_EVENTS stage events, so a long running process (eg. the server) does not grow without limit.
+The summary timings and counters cover the whole run.
+'''
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+PROFILE_VARIABLE = 'SPELLCHECK_PROFILE'
+MAX_EVENTS = 100000 # stage events kept for the Chrome trace
+
+_enabled = False
+_output = None # file to write the Chrome trace to, None to print the summary
+_timings = {} # stage name -> [calls, total seconds, max seconds]
+_counters = {} # counter name -> total
+_events = deque(maxlen=MAX_EVENTS) # most recent Chrome trace events
+_dropped_events = 0 # events removed from _events to make room for newer ones
+_start_time = time.perf_counter()
+_lock = threading.Lock()
+_no_stage = nullcontext()
+
+
+def enable(output:str=None):
+    '''
+    Turns profiling on and writes the report when the program exits
+
+    Input: output - json file to write a Chrome trace to, the summary is printed to stderr if not given
+    Return: None
+    '''
+    global _enabled, _output
+    if not _enabled:
+        atexit.register(write_report)
+    _enabled = True
+    _output = output
+
+def disable():
+    '''
+    Turns profiling off, nothing is reported at exit (used by worker processes that inherit SPELLCHECK_PROFILE)
+    '''
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+@contextmanager
+def _timed_stage(name:str):
+    '''
+    Context manager that records how long the code inside it takes
+    '''
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        elapsed = end - start
+        global _dropped_events
+        with _lock:
+            timing = _timings.get(name)
+            if timing is None:
+                _timings[name] = [1, elapsed, elapsed]
+            else:
+                timing[0] += 1
+                timing[1] += elapsed
+                if elapsed > timing[2]:
+                    timing[2] = elapsed
+            if _output is not None:
+                if len(_events) == _events.maxlen:
+                    _dropped_events += 1
+                _events.append({
+                    'name': name,
+                    'ph': 'X',
+                    'ts': round((start - _start_time) * 1e6, 3),
+                    'dur': round(elapsed * 1e6, 3),
+                    'pid': os.getpid(),
+                    'tid': threading.get_ident()
+                })
+
+def stage(name:str):
+    '''
+    Marks a stage of work to be timed: "with stage('tokenize'):"
+
+    Input: name - name of stage
+    Return: context manager
+    '''
+    if not _enabled:
+        return _no_stage
+    return _timed_stage(name)
+
+def count(name:str, amount:int=1):
+    '''
+    Adds to a counter
+
+    Input: name - name of counter, amount - amount to add
+    Return: None
+    '''
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def get_stats() -> dict:
+    '''
+    Getter function for the recorded timings and counters
+
+    Input: N/A
+    Return: dictionary with keys 'stages' (name -> calls, total_ms, mean_ms, max_ms) and 'counters'
+    '''
+    with _lock:
+        stages = {
+            name: {
+                'calls': calls,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total * 1000 / calls, 3),
+                'max_ms': round(longest * 1000, 3)
+            }
+            for name, (calls, total, longest) in _timings.items()
+        }
+        return {'stages': stages, 'counters': dict(_counters)}
+
+def format_summary(stats:dict) -> str:
+    '''
+    Creates a table of the stage timings (slowest total first) and counters
+    '''
+    lines = [f"{'stage':<28}{'calls':>10}{'total ms':>14}{'mean ms':>12}{'max ms':>12}"]
+    for name, timing in sorted(stats['stages'].items(), key=lambda item: item[1]['total_ms'], reverse=True):
+        lines.append(f"{name:<28}{timing['calls']:>10}{timing['total_ms']:>14}{timing['mean_ms']:>12}{timing['max_ms']:>12}")
+    if stats['counters']:
+        lines.append(f"{'counter':<28}{'total':>10}")
+        for name, total in sorted(stats['counters'].items()):
+            lines.append(f"{name:<28}{total:>10}")
+    return '\n'.join(lines)
+
+def write_report():
+    '''
+    Writes the Chrome trace file if an output file was given, otherwise prints the summary to stderr
+    '''
+    if not _enabled:
+        return
+    stats = get_stats()
+    if _output is None:
+        print(format_summary(stats), file=sys.stderr)
+        return
+    with _lock:
+        events = list(_events)
+        stats['dropped_events'] = _dropped_events
+    with open(_output, 'w') as file:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': stats}, file)
+
+# turn on from the environment so any entry point (main.py, spellcheck.py, server) can be profiled
+if os.environ.get(PROFILE_VARIABLE):
+    _value = os.environ[PROFILE_VARIABLE]
+    enable(None if _value in ('1', 'true', 'yes') else _value)
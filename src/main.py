@@ -3,22 +3,53 @@ from selection_of_word import select_word
 from spell_checker import spell_check_words
 from word_list import WordList
 from result_class import Result
-import string
-import time
+from compiled_dictionary import load_compiled_dictionary
+from bucketed_dictionary import BucketedDictionary
+from auto_correct import choose_corrections, apply_corrections
+from text_buffer import TextBuffer
+from suggestion_prefetcher import SuggestionPrefetcher, nearby_words
+from suggestion_engine import SuggestionEngine
+from instrumentation import stage
+from word_frequency import load_frequency_table
 '''
 Main program
 '''
 
-def upload_dictionary(dictionary_name:str="dictionaries/words_alpha.txt") -> set:
+def upload_dictionary(dictionary_name:str="dictionaries/words_alpha.txt", compiled:bool=True):
     '''
-    loads a set of words from a file to serve as the dictionary for the program
+    loads a set of words from a file to serve as the dictionary for the program. By default the file is compiled into a memory-mapped
+    binary file beside it (recompiled whenever the text file is newer) so it does not have to be read and split on every start.
+    Both dictionaries bucket words by length for the suggestion engine
     
-    Input: dictionary_name - file to load words from. Set to the standard dictionary if no file is given (words_alpha)
-    Return: set of all words from dictionary
+    Input: dictionary_name - file to load words from. Set to the standard dictionary if no file is given (words_alpha), compiled - 
+    use the compiled file instead of building the dictionary in memory
+    Return: CompiledDictionary or BucketedDictionary of all words from dictionary
     '''
-    words = open_file('r', file_name=dictionary_name)[0]
-    #words = input_handler.open_files(dictionary_name, 'r')
-    return set(words.split())
+    with stage('dictionary_load'):
+        dictionary = None
+        if compiled:
+            try:
+                dictionary = load_compiled_dictionary(dictionary_name)
+            except OSError:
+                pass # file does not exist or compiled file cannot be written, fall back to reading the text file
+        if dictionary is None:
+            words = open_file('r', file_name=dictionary_name)[0]
+            #words = input_handler.open_files(dictionary_name, 'r')
+            dictionary = BucketedDictionary(words.split())
+        return dictionary
+
+def load_engine(dictionary_name:str="dictionaries/words_alpha.txt", compiled:bool=True) -> SuggestionEngine:
+    '''
+    Loads a dictionary with upload_dictionary and creates the suggestion engine for it. If there is a word frequency file beside the
+    dictionary (see word_frequency.py) it is loaded too and the engine ranks suggestions by how common they are
+
+    Input: dictionary_name - file to load words from, compiled - use the compiled file instead of building the dictionary in memory
+    Return: SuggestionEngine of the dictionary
+    '''
+    dictionary = upload_dictionary(dictionary_name, compiled)
+    with stage('dictionary_load'):
+        frequencies = load_frequency_table(dictionary, dictionary_name)
+    return SuggestionEngine(dictionary, frequencies)
 
 
 def open_file(mode:str, text=None, file_name=None):
@@ -93,20 +124,25 @@ def print_menu(mispelled_words:WordList):
     print("Enter (q) to exit program")
     print("Enter (c) to choose a specific word to select (selects first occurance of word)")
     print("Enter (i) to show your text")
+    print("Enter (f) to fix all errors with the number one suggested word")
 
-def word_navigation(mispelled_words:WordList, dictionary:set, user_input:str, result:Result):
+def word_navigation(mispelled_words:WordList, engine:SuggestionEngine, user_input:str, result:Result, prefetcher:SuggestionPrefetcher=None):
     '''
     Contains word navigation loop. Continously print menu that allows user to choose an action from menu and then call appropriate
-    functions to do selected action
+    functions to do selected action. Edits are made to a text buffer and the text is only built when it is printed or saved
     
-    Input: mispelled_words - object containg list of misspelled words, dictionary - set of dictionary words, user_input - original text
-    result - object to store potentially modified user's text and if user wants to quit program
+    Input: mispelled_words - object containg list of misspelled words, engine - suggestion engine of the dictionary, user_input - original
+    text, result - object to store potentially modified user's text and if user wants to quit program, prefetcher - background thread
+    finding the first suggestions of the words near the current one
     '''
+    user_input = TextBuffer(user_input)
     while mispelled_words.getSize() > 0:
         size = mispelled_words.getSize()
+        if prefetcher is not None:
+            prefetcher.prioritize(nearby_words(mispelled_words))
         print_menu(mispelled_words)
 
-        valid_choices = ['w', 's', 'q', 'b', 'c', 'i']
+        valid_choices = ['w', 's', 'q', 'b', 'c', 'i', 'f']
         if size > 1:
             valid_choices.append('d')
             valid_choices.append('a')
@@ -130,7 +166,7 @@ def word_navigation(mispelled_words:WordList, dictionary:set, user_input:str, re
                 result.userQuits()
                 return
         elif selection == 's' or selection == 'c':
-            user_input = select_word(selection, mispelled_words, dictionary, user_input)
+            user_input = select_word(selection, mispelled_words, engine, user_input)
             if user_input == 'q':
                 result.userQuits()
                 return
@@ -138,7 +174,7 @@ def word_navigation(mispelled_words:WordList, dictionary:set, user_input:str, re
             print("Are you sure? This cannot be undone (y/n)") # prolly change
             new_selection = input_handler.validator("Please enter either y or n", ('y', 'n', 'q'), input_handler.validate_value)
             if new_selection == 'y':
-                result.setValue(user_input)
+                result.setValue(str(user_input))
                 return 
             elif new_selection == 'q':
                 result.userQuits()
@@ -149,11 +185,42 @@ def word_navigation(mispelled_words:WordList, dictionary:set, user_input:str, re
             if input(": ").casefold().strip() == 'q':
                 result.userQuits()
                 break
+        elif selection == 'f':
+            user_input = fix_all_words(mispelled_words, engine, user_input)
+            if user_input == 'q':
+                result.userQuits()
+                return
         elif selection == 'q': 
             result.userQuits()
             return 
+    result.setValue(str(user_input))
     #return user_input
 
+def fix_all_words(mispelled_words:WordList, engine:SuggestionEngine, user_input:TextBuffer) -> TextBuffer:
+    '''
+    Replaces every misspelled word with its number one suggested word (only suggestions one edit away are used) after the user
+    confirms the corrections
+
+    Input: mispelled_words - object containg list of misspelled words, engine - suggestion engine of the dictionary, user_input - text
+    Return: user_input - corrected text if user applies the corrections, otherwise original text, or 'q' if user wants to quit
+    '''
+    print("Calculating word suggestions from dictionary...")
+    corrections = choose_corrections(engine, mispelled_words)
+    if len(corrections) == 0:
+        print("No misspelled words have a suggestion close enough to fix automatically")
+        return user_input
+    for word, replacement in corrections.items():
+        print(f'"{word}" -> "{replacement}"')
+    print("Would you like to apply these corrections? (y/n)")
+    user_answer = input_handler.validator("Please select either y or n", ('y', 'n', 'q'), input_handler.validate_value)
+    if user_answer == 'q':
+        return user_answer
+    elif user_answer == 'n':
+        return user_input
+    new_user_input, applied = apply_corrections(str(user_input), mispelled_words, corrections)
+    print(f'{len(applied)} word(s) fixed. Your new text is: "{new_user_input}"')
+    return TextBuffer(new_user_input)
+
 def print_welcome_message():
     '''
     Prints welcome message for begining of program
@@ -164,9 +231,9 @@ def print_welcome_message():
 
 def assign_dictionary(result:Result):
     '''
-    Gets either a user dictionary or standard dictionary from file
+    Gets either a user dictionary or standard dictionary from file and creates its suggestion engine
 
-    Input: result - object that stores dictionary values from function or if user wants to quit program
+    Input: result - object that stores the suggestion engine of the dictionary or if user wants to quit program
     Return: None
     '''
     selection = input_handler.validator("Please Select personal dictionary (a) or standard dictionary (b)", ('a', 'b', 'q'), input_handler.validate_value)
@@ -181,10 +248,10 @@ def assign_dictionary(result:Result):
             result.userQuits()
             #print("Exiting Program...")
             return
-        dictionary = upload_dictionary(file_name)
+        engine = load_engine(file_name)
     else:
-        dictionary = upload_dictionary()
-    result.setValue(dictionary)
+        engine = load_engine()
+    result.setValue(engine)
 
 def main():
     print_welcome_message()
@@ -195,7 +262,11 @@ def main():
     if result.quit():
         print("Exiting Program...")
         return
-    dictionary = result.value()
+    # suggestion state for the dictionary, shared by every input checked in this session
+    engine = result.value()
+    dictionary = engine.getDictionary()
+    # build the suggestion index now, before the background prefetcher can need it
+    engine.prepare()
 
     # Program loop
     while True:
@@ -208,7 +279,11 @@ def main():
         mispelled_words = spell_check_words(dictionary, user_input)
         #print(f"\nAmount of mispelled words: {num_mispelled_words}")
         if mispelled_words.getSize() > 0:
-            #output = word_navigation(mispelled_words, dictionary, user_input)
+            # find the first suggestions of nearby words in the background while the user reads the menu
+            prefetcher = SuggestionPrefetcher(engine)
+            prefetcher.start(mispelled_words)
+            word_navigation(mispelled_words, engine, user_input, result, prefetcher)
+            prefetcher.stop()
             if result.quit():
                 break
             output = result.value()
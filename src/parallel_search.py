@@ -0,0 +1,128 @@
+'''
+Parallel Search
+
+This ParallelSearch class scores suggestion candidates on several processes at once. The dictionary is split into shards (every
+n-th word) and each shard is given to its own single worker process pool when the pool starts, so a shard is sent to its worker
+once instead of with every search. A search sends only the word to every worker, each worker scores the candidates of its shard
+with the search function (brute_force_search) and the per shard results, sorted by (distance, word), are merged in that order.
+
+Starting the workers and sending a word to them costs more than scoring a small dictionary, so dictionaries with fewer than
+min_words words (or a single worker) are searched in this process and no workers are started. So are searches made inside another
+worker process, eg. by spellcheck.py, which already checks files in parallel.
+
+This class has the following methods
+    - add: adds a word to the shard of one worker
+    - search: returns every word within a given distance of a word along with that distance
+    - getSize: returns the number of words that can be searched
+    - close: stops the worker processes
+'''
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+from bucketed_dictionary import BucketedDictionary
+
+DEFAULT_MIN_WORDS = 50000
+
+# shard of the dictionary owned by a worker process, set by _load_shard
+_shard = None
+
+
+def _load_shard(words:list[str]):
+    '''
+    Worker initializer that stores the shard this worker searches
+    '''
+    global _shard
+    _shard = BucketedDictionary(words)
+    instrumentation.disable() # only the main process reports timings
+
+def _add_to_shard(word:str):
+    _shard.add(word)
+
+def _search_shard(search_function, word:str, max_distance:int, length_differences:tuple=None) -> list[tuple]:
+    '''
+    Searches the shard of this worker
+    Input: search_function - function(dictionary, word, max_distance, length_differences) returning (word, distance) tuples, word -
+    word to search for, max_distance - search radius, length_differences - (smallest, largest) length difference to compare
+    Return: matches - list of (word, distance) tuples sorted by distance and then word
+    '''
+    matches = search_function(_shard, word, max_distance, length_differences)
+    matches.sort(key=lambda match: (match[1], match[0]))
+    return matches
+
+
+class ParallelSearch():
+    '''
+    An instance of this class represents a dictionary split across worker processes for searching
+    '''
+    def __init__(self, search_function, dictionary, workers:int=None, min_words:int=DEFAULT_MIN_WORDS):
+        self.__search = search_function
+        self.__dictionary = dictionary
+        self.__workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.__min_words = min_words
+        self.__pools = None # one single worker pool for each shard, started by the first search that needs them
+        self.__next_shard = 0 # shard that gets the next added word
+
+    def __useWorkers(self) -> bool:
+        # a process that is itself a worker (eg. of spellcheck.py) searches in process instead of starting more workers
+        if multiprocessing.parent_process() is not None:
+            return False
+        return self.__workers > 1 and len(self.__dictionary) >= self.__min_words
+
+    def __startWorkers(self):
+        '''
+        Splits the dictionary into shards and starts one worker process for each. spawn is used so the workers do not inherit locks
+        held by other threads of this process (eg. the SuggestionPrefetcher)
+        '''
+        words = list(self.__dictionary)
+        context = multiprocessing.get_context('spawn')
+        self.__pools = [
+            ProcessPoolExecutor(1, mp_context=context, initializer=_load_shard, initargs=(words[shard::self.__workers],))
+            for shard in range(self.__workers)
+        ]
+
+    def add(self, word:str):
+        '''
+        Adds a word to the next shard. Only needed once the workers have started, before that the word is included when the
+        dictionary is split
+        Input: word - word to add (must already be in the dictionary)
+        Return: None
+        '''
+        if self.__pools is None:
+            return
+        # a pool with one worker runs its calls in order, so the word is added before the next search of that shard
+        self.__pools[self.__next_shard].submit(_add_to_shard, word)
+        self.__next_shard = (self.__next_shard + 1) % len(self.__pools)
+
+    def search(self, word:str, max_distance:int, length_differences:tuple=None) -> list[tuple]:
+        '''
+        Finds all words in the dictionary that are at most max_distance edits away from word
+
+        Input: word - word to search for, max_distance - search radius, length_differences - (smallest, largest) length difference
+        of the words to compare (all that can be within max_distance if not given)
+        Return: matches - list of (word, distance) tuples sorted by distance and then word
+        '''
+        if not self.__useWorkers():
+            matches = self.__search(self.__dictionary, word, max_distance, length_differences)
+            matches.sort(key=lambda match: (match[1], match[0]))
+            return matches
+        if self.__pools is None:
+            self.__startWorkers()
+        futures = [pool.submit(_search_shard, self.__search, word, max_distance, length_differences) for pool in self.__pools]
+        return list(heapq.merge(*(future.result() for future in futures), key=lambda match: (match[1], match[0])))
+
+    def getSize(self):
+        return len(self.__dictionary)
+
+    def close(self):
+        '''
+        Stops the worker processes. They are started again by the next search that needs them
+        Input: N/A
+        Return: None
+        '''
+        if self.__pools is not None:
+            for pool in self.__pools:
+                pool.shutdown()
+            self.__pools = None
@@ -1,14 +1,16 @@
 import input_handler
 import string
-from suggestions import get_suggestions
+from suggestion_engine import SuggestionEngine
 from word_list import WordList
+from text_buffer import TextBuffer
+from spell_checker import recheck_ranges
 
-def add_to_dictionary(dictionary:set, word:str, user_input:str, mispelled_words:WordList):
-    dictionary.add(word.casefold().strip())
+def add_to_dictionary(engine:SuggestionEngine, word:str, user_input:str, mispelled_words:WordList):
+    engine.addWord(word)
     mispelled_words.removeAllItems(word)
     print("Word added to dictionary")
 
-def display_word_suggestions(mispelled_words:WordList, word:dict, dictionary:set, start:int, end:int):
+def display_word_suggestions(mispelled_words:WordList, word:dict, start:int, end:int):
 
     if len(word['suggestions']) > 0:
         # create output string
@@ -36,7 +38,7 @@ def contains_punctuation(word:str) -> bool:
     if word[-1] in string.punctuation:
         return True
 
-def display_word_context(word:dict, user_input:str):
+def display_word_context(word:dict, user_input:TextBuffer):
     '''
     Display context for given word by displaying 5 words before and after the word
     
@@ -44,7 +46,7 @@ def display_word_context(word:dict, user_input:str):
     Return: None
     '''
     print("Context for seleted word:")
-    user_words = user_input.split()
+    user_words = str(user_input).split()
     index = word['og_index']
     start = index-5
     if start < 0:
@@ -63,7 +65,7 @@ def display_word_context(word:dict, user_input:str):
     output += '...'
     print(output)
 
-def modify_capitalization(user_input:str, start:int, word:str) -> str:
+def modify_capitalization(user_input:TextBuffer, start:int, word:str) -> str:
     '''
     Changes the first letter of a word to match the capitalization of the original word in the user's input
     '''
@@ -71,12 +73,16 @@ def modify_capitalization(user_input:str, start:int, word:str) -> str:
         return word[0].upper() + word[1:]
     return word
 
-def replace_word(word:dict, mispelled_words:WordList, user_input:str, selection:str, selected_option:int=None, new_word:str=None) -> str:
+def replace_word(word:dict, mispelled_words:WordList, user_input:TextBuffer, selection:str, dictionary, selected_option:int=None, new_word:str=None) -> TextBuffer:
     '''
-    Replace a mispelled word with a selected suggested and modify user input
+    Replace a mispelled word with a selected suggested and modify user input. The replacement is made on a copy of the text buffer
+    and when the user saves it, the edited ranges are checked again (see recheck_ranges), so the replaced words are removed from the
+    list of misspelled words, any misspelled word in the new text (eg. a typed replacement) is added and the remaining misspelled
+    words are moved to match the new text
     
     Input: selected_option - suggested word num seleted, word - word information of misspelled word, mispelled_words - list of all misspelled 
-    words, user_input - string of user input, selection - whether user selected current word or typed a word
+    words, user_input - text buffer of user input, selection - whether user selected current word or typed a word, dictionary -
+    dictionary the text is checked against
     Return: user_input - modified user_input
     '''
     if selected_option != None:
@@ -89,25 +95,17 @@ def replace_word(word:dict, mispelled_words:WordList, user_input:str, selection:
     user_answer = input_handler.validator("Please select either y or n", ('y', 'n', 'q'), input_handler.validate_value)
     if user_answer == 'q':
         return user_answer
-    elif user_answer == 'n':
-        new_user_input = user_input[:word['start']] + new_word + user_input[word['end']:]
-        # remove word from list of missplled words
-        if selection == 'c':
-            index = mispelled_words.getIndex(word['word'].casefold())
-            assert index != None
-            mispelled_words.delete(index)
-        else:
-            mispelled_words.delete()
+    new_user_input = user_input.copy()
+    if user_answer == 'n':
+        edits = [(word['start'], word['end'], new_user_input.replace(word['start'], word['end'], new_word))]
     else:
-        new_user_input = user_input
-        mispelled_words_list = mispelled_words.getItems()
-        for index, item in enumerate(mispelled_words_list):
-            if item['word'].casefold() == word['word'].casefold():
-                new_user_input = new_user_input[:item['start']] + new_word + new_user_input[item['end']:]
-                mispelled_words.delete(index)
+        # every occurance is replaced in one pass over the text instead of one edit per occurance
+        ranges = [(item['start'], item['end']) for item in mispelled_words.getOccurrences(word['word'])]
+        edits = new_user_input.replaceAll(ranges, new_word)
     print(f'Your new text is: "{new_user_input}"\n Would you like to save and continue? (y/n)')
     user_answer = input_handler.validator("Please select either y or n", ('y', 'n', 'q'), input_handler.validate_value)
     if user_answer == 'y':
+        recheck_ranges(dictionary, str(new_user_input), mispelled_words, edits)
         return new_user_input
     elif user_answer == 'q':
         return user_answer
@@ -134,7 +132,7 @@ def print_selection_menu():
     print("Enter (r) to remove this word as a misspelled word")
     print("Enter (b) to go back to previous screen")
 
-def select_word(selection:str, mispelled_words:WordList, dictionary:set, user_input:str):
+def select_word(selection:str, mispelled_words:WordList, engine:SuggestionEngine, user_input:TextBuffer):
     if selection == 'c':
         mispelled_words_set = mispelled_words.createSet()
         mispelled_words_set.add('q')
@@ -156,23 +154,30 @@ def select_word(selection:str, mispelled_words:WordList, dictionary:set, user_in
     print(f'You have selected the word "{word}"')
     display_word_context(word_info, user_input)
 
-    get_suggestions(mispelled_words, dictionary, word_info)
+    # suggestions are found a distance tier at a time, only when a page needs them. One more than the page is found so (m) is
+    # only offered when there is another suggestion to show
+    stream = engine.getSuggestions(mispelled_words, word_info, limit=6)
 
     start = 0 # start index to display suggested words from
     end = 5 # end index so that only 5 are displayed at a time
-    total_words = len(word_info['suggestions'])
     while True:
+        if stream is not None and len(word_info['suggestions']) <= end:
+            stream = engine.getSuggestions(mispelled_words, word_info, limit=end + 1, stream=stream)
+        if start > 0 and start >= len(word_info['suggestions']):
+            print("No more suggestions")
+            start -= 5
+            end -= 5
         # set up start and end indecies to display at most 5 suggested words at at time
         start, end = set_up_start_end(start, end, word_info)
-        display_word_suggestions(mispelled_words, word_info, dictionary, start, end)
+        display_word_suggestions(mispelled_words, word_info, start, end)
 
         print_selection_menu()
 
         # set up valid_input
         valid_inputs = {'d', 'b', 'c', 'r', 'q'}
-        for i in range(start, end):
+        for i in range(start, min(end, len(word_info['suggestions']))):
             valid_inputs.add(str(i+1))
-        if total_words >= 5:
+        if len(word_info['suggestions']) > end:
             print("Enter (m) to see more suggestions")
             valid_inputs.add('m')
         if start >= 1:
@@ -181,21 +186,19 @@ def select_word(selection:str, mispelled_words:WordList, dictionary:set, user_in
 
         selected_option = input_handler.validator("Please enter a valid selection", valid_inputs, input_handler.validate_value)
         if selected_option == 'd':
-            add_to_dictionary(dictionary, word, user_input, mispelled_words)
+            add_to_dictionary(engine, word, user_input, mispelled_words)
             return user_input
         elif selected_option == 'b':
             return user_input
         elif selected_option == 'm':
             start += 5
             end += 5
-            total_words -= 5
         elif selected_option == 'l':
             start -= 5
             end -= 5
-            total_words += 5
         elif selected_option == 'c':
             custom_word = input("Enter your new word (Entering 'q' here does not exit program): ").strip()
-            return replace_word(word_info, mispelled_words, user_input, selection, new_word=custom_word)
+            return replace_word(word_info, mispelled_words, user_input, selection, engine.getDictionary(), new_word=custom_word)
         elif selected_option == 'r':
             mispelled_words.delete(index)
             print("Word removed")
@@ -204,4 +207,4 @@ def select_word(selection:str, mispelled_words:WordList, dictionary:set, user_in
             return selected_option
         else:
             # select selection and update user input  
-            return replace_word(word_info, mispelled_words, user_input, selection, int(selected_option))
\ No newline at end of file
+            return replace_word(word_info, mispelled_words, user_input, selection, engine.getDictionary(), int(selected_option))
\ No newline at end of file
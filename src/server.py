@@ -0,0 +1,237 @@
+'''
+Spell Check Server
+
+Long running asyncio server that loads the dictionary and suggestion index once and answers many small requests from local
+clients over a Unix socket or a localhost TCP port. Requests and responses are json objects, one per line:
+
+    {"id": 1, "method": "check", "params": {"text": "Helo wrold", "suggestions": 3}}
+    {"id": 1, "result": [{"word": "Helo", "start": 0, "end": 4, "suggestions": ["halo", "hel", "helco"]}, ...]}
+
+Methods
+    - check: params text (or texts, a list of texts) and suggestions (number of suggestions per misspelled word, default 0)
+    - suggest: params word (or words, a list of words) and limit (max number of suggestions, default all)
+    - add_word: params word, adds the word to the dictionary for the rest of the server's life
+
+A line can also hold a json list of requests, which is answered with a list of responses in the same order. Clients are served
+concurrently; the spell checking itself runs on one worker thread so the dictionary and caches are never used by two requests at the
+same time. A line longer than MAX_LINE_SIZE is answered with a "request too large" error and the connection is closed, since the
+rest of the line can not be told apart from the next request. See spellcheck_client.py for a client.
+'''
+import asyncio
+import itertools
+import json
+import os
+import socket
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+from spell_checker import spell_check_words
+from suggestion_engine import SuggestionEngine
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_LINE_SIZE = 1 << 24 # bytes in one request line
+
+def string_list(params:dict, key:str) -> list[str]:
+    '''
+    Reads a list of strings from the params of a request. Throws a ValueError if it is not a list of strings, eg. a single string
+    that would otherwise be used one character at a time
+
+    Input: params - params of a request, key - name of the list
+    Return: list of strings
+    '''
+    values = params[key]
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"{key} must be a list of strings")
+    return values
+
+def remove_stale_socket(unix_path:str):
+    '''
+    Removes a Unix socket left behind by a server that has stopped. Throws an OSError if the path is not a socket or another server
+    is still listening on it, so neither is ever removed
+
+    Input: unix_path - path of the Unix socket
+    Return: None
+    '''
+    try:
+        mode = os.stat(unix_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{unix_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(unix_path)
+        except ConnectionRefusedError:
+            os.remove(unix_path)
+            return
+    raise OSError(f"another server is listening on {unix_path}")
+
+
+class SpellCheckServer():
+    '''
+    An instance of this class represents a spell check server for one loaded dictionary
+    '''
+    def __init__(self, engine:SuggestionEngine):
+        self.__engine = engine
+        self.__worker = ThreadPoolExecutor(max_workers=1)
+        self.__methods = {
+            'check': self.check,
+            'suggest': self.suggest,
+            'add_word': self.addWord
+        }
+
+    def check(self, params:dict):
+        '''
+        Spell checks one text or a list of texts
+
+        Input: params - dictionary with key 'text' or 'texts' and optionally 'suggestions'
+        Return: list of misspelled words for the text, or a list of those lists for texts
+        '''
+        suggestion_count = int(params.get('suggestions', 0))
+        if 'texts' in params:
+            return [self.__checkText(text, suggestion_count) for text in string_list(params, 'texts')]
+        return self.__checkText(params['text'], suggestion_count)
+
+    def __checkText(self, text:str, suggestion_count:int) -> list[dict]:
+        '''
+        Spell checks a text
+        Input: text - text to check, suggestion_count - suggestions to include for each misspelled word
+        Return: list of dictionaries with keys 'word', 'start', 'end' and 'suggestions'
+        '''
+        if not isinstance(text, str):
+            raise ValueError("text must be a string")
+        results = []
+        mispelled_words = spell_check_words(self.__engine.getDictionary(), text)
+        # suggestions are calculated once per unique misspelled word
+        word_suggestions = {}
+        if suggestion_count > 0:
+            for word in mispelled_words.getWordCounts():
+                word_suggestions[word] = [suggestion['word'] for suggestion in self.__engine.calculate(word)][:suggestion_count]
+        for item in mispelled_words.getItems():
+            results.append({
+                'word': item['word'],
+                'start': item['start'],
+                'end': item['end'],
+                'suggestions': word_suggestions.get(item['word'].casefold(), [])
+            })
+        return results
+
+    def suggest(self, params:dict):
+        '''
+        Finds suggestions for one word or a list of words
+
+        Input: params - dictionary with key 'word' or 'words' and optionally 'limit'
+        Return: list of suggestions (dictionaries with keys 'word' and 'distance') for word, or a list of those lists for words
+        '''
+        limit = params.get('limit')
+        if limit is not None:
+            limit = int(limit)
+        words = string_list(params, 'words') if 'words' in params else [params['word']]
+        results = []
+        for word in words:
+            if not isinstance(word, str):
+                raise ValueError("word must be a string")
+            if limit is None:
+                results.append(self.__engine.calculate(word))
+            else:
+                # only the distance tiers needed for limit suggestions are searched
+                results.append(list(itertools.islice(self.__engine.iterSuggestions(word), limit)))
+        return results if 'words' in params else results[0]
+
+    def addWord(self, params:dict) -> bool:
+        '''
+        Adds a word to the dictionary and suggestion indexes
+
+        Input: params - dictionary with key 'word'
+        Return: True
+        '''
+        word = params['word']
+        if not isinstance(word, str) or word.strip() == '':
+            raise ValueError("word must be a non empty string")
+        self.__engine.addWord(word)
+        return True
+
+    def handleRequest(self, request) -> dict:
+        '''
+        Calls the method named in a request and builds the response. Errors are returned in the response instead of being raised,
+        including unexpected ones, so one bad request never closes the connection
+
+        Input: request - decoded json request
+        Return: response dictionary with key 'id' and either 'result' or 'error'
+        '''
+        if not isinstance(request, dict):
+            return {'id': None, 'error': "request must be a json object"}
+        request_id = request.get('id')
+        method = self.__methods.get(request.get('method'))
+        if method is None:
+            return {'id': request_id, 'error': f"unknown method {request.get('method')!r}"}
+        params = request.get('params')
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            return {'id': request_id, 'error': "params must be a json object"}
+        try:
+            return {'id': request_id, 'result': method(params)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {'id': request_id, 'error': f"invalid params: {e}"}
+        except Exception as e:
+            return {'id': request_id, 'error': f"internal error: {type(e).__name__}: {e}"}
+
+    def handleLine(self, line:bytes) -> bytes:
+        '''
+        Answers one line of a connection, which is a single request or a list of requests
+        Input: line - json encoded request(s)
+        Return: json encoded response(s) ending in a new line
+        '''
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return (json.dumps({'id': None, 'error': "invalid json"}) + '\n').encode('utf-8')
+        if isinstance(request, list):
+            response = [self.handleRequest(item) for item in request]
+        else:
+            response = self.handleRequest(request)
+        return (json.dumps(response) + '\n').encode('utf-8')
+
+    async def handleConnection(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+        '''
+        Answers requests from one client until it disconnects
+        '''
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write((json.dumps({'id': None, 'error': "request too large"}) + '\n').encode('utf-8'))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                if line.strip() == b'':
+                    continue
+                writer.write(await loop.run_in_executor(self.__worker, self.handleLine, line))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host:str=DEFAULT_HOST, port:int=DEFAULT_PORT, unix_path:str=None):
+        '''
+        Serves clients forever on a Unix socket if unix_path is given, otherwise on host and port. A socket left at unix_path by a
+        server that stopped is replaced, anything else there is an error (see remove_stale_socket)
+
+        Input: host - address to listen on (localhost by default), port - TCP port, unix_path - path of Unix socket
+        Return: None
+        '''
+        if unix_path is not None:
+            remove_stale_socket(unix_path)
+            server = await asyncio.start_unix_server(self.handleConnection, path=unix_path, limit=MAX_LINE_SIZE)
+            print(f"Spell check server listening on {unix_path}")
+        else:
+            server = await asyncio.start_server(self.handleConnection, host, port, limit=MAX_LINE_SIZE)
+            print(f"Spell check server listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
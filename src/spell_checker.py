@@ -1,4 +1,34 @@
+import re
+from bisect import bisect_right
+from array import array
 from word_list import WordList
+from instrumentation import stage, count
+
+# a word is a run of characters that are alphanumeric (str.isalnum) or one of - and '. [^\W_] matches exactly the characters where
+# isalnum() is true. \w also matches _, so the faster pattern can only be used for text without underscores
+WORD_PATTERN = re.compile(r"[\w'-]+")
+UNDERSCORE_WORD_PATTERN = re.compile(r"(?:[^\W_]+|['-]+)+")
+EXTRA_WORD_CHARACTERS = ('-', "'")
+
+def is_word_character(character:str) -> bool:
+    '''
+    Checks if a character can be part of a word
+    
+    Input: character - character to check
+    Return: True if character is alphanumeric, - or '
+    '''
+    return character.isalnum() or character in EXTRA_WORD_CHARACTERS
+
+def word_pattern(text:str) -> re.Pattern:
+    '''
+    Returns the compiled pattern that matches the words of text
+
+    Input: text - string that will be split
+    Return: compiled regular expression
+    '''
+    if '_' in text:
+        return UNDERSCORE_WORD_PATTERN
+    return WORD_PATTERN
 
 def split_words(text:str) -> list[dict]:
     '''
@@ -7,49 +37,126 @@ def split_words(text:str) -> list[dict]:
     Input: text - string to split
     Return: words - list of dictionary
     '''
-    words = []
-    in_word = False
-    start = 0
-    extra_valid_ch = ('-', "'")
-
-    for i, ch in enumerate(text):
-        if ch.isalnum() or ch in extra_valid_ch:
-            if not in_word:
-                in_word = True
-                start = i
-        else:
-            if in_word:
-                words.append({
-                    "word": text[start:i],
-                    "start": start,
-                    "end": i
-                })
-                in_word = False
+    return [
+        {"word": match.group(), "start": match.start(), "end": match.end()}
+        for match in word_pattern(text).finditer(text)
+    ]
 
-    # handle case where text ends in a word
-    if in_word:
-        words.append({
-            "word": text[start:len(text)],
-            "start": start,
-            "end": len(text)
-        })
+def split_word_offsets(text:str) -> tuple[array, array]:
+    '''
+    Compact version of split_words that only keeps the start and end indecies of each word in two parallel arrays (word i is
+    text[starts[i]:ends[i]]) instead of creating a dictionary and string for every word
 
-    return words
+    Input: text - string to split
+    Return: starts, ends - arrays of start and end indecies
+    '''
+    starts = array('l')
+    ends = array('l')
+    for match in word_pattern(text).finditer(text):
+        start, end = match.span()
+        starts.append(start)
+        ends.append(end)
+    return starts, ends
 
 
 def spell_check_words(dictionary:set, words:str) -> WordList:
     '''
-    Loops through all words in word string and checks if they are in the dictionary
+    Loops through all words in word string and checks if they are in the dictionary. Text repeats the same words many times, so
+    each unique word is only casefolded and looked up the first time it appears and later occurances reuse the result. The number
+    of occurances of each unique misspelled word is available from the result's getWordCounts
 
     Input: dictionary - set of dictionary words, words - string to spell check
     Return: mispelled_words - object contining list of misspelled words
     '''
-    words = split_words(words)
     mispelled_words = WordList()
+    misspelled = {} # word as written in the text -> True if it is not in the dictionary
+
+    # tokenizing and looking up are done in the same pass over the text so they are timed together
+    index = -1
+    with stage('tokenize_and_lookup'):
+        for index, match in enumerate(word_pattern(words).finditer(words)):
+            word = match.group()
+            is_misspelled = misspelled.get(word)
+            if is_misspelled is None:
+                # convert word to lower case for comparison
+                is_misspelled = misspelled[word] = word.casefold() not in dictionary
+
+            if is_misspelled:
+                mispelled_words.append(word, match.start(), match.end(), index)
+    count('words_checked', index + 1)
+    count('unique_words_looked_up', len(misspelled))
+    count('misspellings', mispelled_words.getSize())
+    return mispelled_words
+
+def recheck_range(dictionary:set, text:str, mispelled_words:WordList, start:int, end:int, delta:int):
+    '''
+    Spell checks only the part of the text around an edit and patches the list of misspelled words instead of spell checking the
+    whole text again. The checked range is widened to the whole words touching the edit, misspelled words that were in that range
+    are removed, words after it are moved by delta and the words now in the range are checked and inserted in text order. New words
+    take the og_index of the first misspelled word they replace (or of the misspelled word before them)
+
+    Input: dictionary - set of dictionary words, text - text after the edit, mispelled_words - object containing list of misspelled
+    words of the text before the edit, start - start index of the edited range, end - end index of the edited range before the
+    edit, delta - change in length of the text
+    Return: None
+    '''
+    recheck_ranges(dictionary, text, mispelled_words, [(start, end, delta)])
+
+def recheck_ranges(dictionary:set, text:str, mispelled_words:WordList, edits:list[tuple[int, int, int]]):
+    '''
+    Same as recheck_range for several edits made at once (eg. every occurance of a word replaced with TextBuffer.replaceAll). Edits
+    whose widened ranges touch are checked as one range, the misspelled words in all of the ranges are removed in one pass and the
+    other words are moved in one sweep, so the time depends on the size of the edited ranges instead of the number of edits times
+    the number of misspelled words
+
+    Input: dictionary - set of dictionary words, text - text after the edits, mispelled_words - object containing list of
+    misspelled words of the text before the edits, edits - (start, end, delta) of each edit, start and end being the edited range
+    in the text before any of the edits and delta the change in length of the text
+    Return: None
+    '''
+    edits = sorted(edits)
+    # widen each edit to whole words in the edited text and merge the ranges that touch. Each range is
+    # [left, right, change in length before the range, change in length up to the end of the range]
+    ranges = []
+    shift = 0
+    for start, end, delta in edits:
+        left = start + shift
+        while left > 0 and is_word_character(text[left - 1]):
+            left -= 1
+        right = end + shift + delta
+        while right < len(text) and is_word_character(text[right]):
+            right += 1
+        shift += delta
+        if ranges and left <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], right)
+            ranges[-1][3] = shift
+        else:
+            ranges.append([left, right, shift - delta, shift])
 
-    for index, word in enumerate(words):
-        comparrison_word = word['word'].casefold() # convert word to lower and remove trailing and leading whitespace
+    # find the misspelled words in each range (in the text before the edits) and the og_index new words in the range will get
+    items = mispelled_words.getItems()
+    removed = []
+    og_indexes = []
+    for left, right, shift_before, shift_after in ranges:
+        old_left = left - shift_before
+        old_right = right - shift_after
+        index = bisect_right(items, old_left, key=lambda item: item['end'])
+        og_index = None
+        if index > 0 and items[index - 1]['og_index'] is not None:
+            # first misspelled word before the range
+            og_index = items[index - 1]['og_index'] + 1
+        if index < len(items) and items[index]['start'] < old_right:
+            og_index = items[index]['og_index']
+        while index < len(items) and items[index]['start'] < old_right:
+            removed.append(index)
+            index += 1
+        og_indexes.append(0 if og_index is None else og_index)
+    mispelled_words.deleteItems(removed)
+    mispelled_words.remapOffsets([(end, delta) for _, end, delta in edits])
 
-        if comparrison_word not in dictionary:
-            mispelled_words.append(word['word'], word['start'], word['end'], index)
-    return mispelled_words
\ No newline at end of file
+    for (left, right, _, _), og_index in zip(ranges, og_indexes):
+        region = text[left:right]
+        for match in word_pattern(region).finditer(region):
+            word = match.group()
+            if word.casefold() not in dictionary:
+                mispelled_words.insert(word, left + match.start(), left + match.end(), og_index)
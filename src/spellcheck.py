@@ -0,0 +1,317 @@
+'''
+Spell Check Command Line
+
+Non interactive entry point for spell checking many files at once, eg. in a pipeline:
+
+    python -m spellcheck check notes.txt docs/ --suggestions 3 --workers 4 > results.jsonl
+    python -m spellcheck serve --port 8765
+
+Directories are searched recursively for files matching --pattern. Files are checked in parallel with a process pool. Each worker
+uses the dictionary loaded by the parent when processes are forked, otherwise it loads the memory-mapped compiled dictionary, which
+is shared between processes through the page cache. Files are read in chunks (see stream_checker.py) and large files are cut into
+parts of about PART_SIZE bytes that are checked as separate tasks, so neither a file nor all of its misspelled words are ever held
+in memory or sent between processes at once. Every misspelled word is written as one json object per line with the keys file, word, start, end (character offsets in
+the file, counting line endings as they are stored) and suggestions, and a throughput summary is written to stderr.
+
+The serve command starts the local spell check server in server.py instead, so the dictionary is only loaded once for many checks.
+
+--cache FILE keeps the suggestions calculated by check or serve in a json file between runs. It is only loaded if it was saved for
+the same dictionary (see dictionary_key), so changing the dictionary or its .freq file starts a new cache.
+
+--profile prints the stage timings and counters of instrumentation.py to stderr at exit and --profile-output FILE writes them as a
+Chrome trace instead. Only the main process is profiled, so use --workers 1 to include the checking stages.
+'''
+import argparse
+import asyncio
+import fnmatch
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+import suggestions
+from main import load_engine
+from server import DEFAULT_HOST, DEFAULT_PORT, SpellCheckServer
+from stream_checker import split_file, stream_misspellings
+from word_frequency import frequency_file_name
+
+DEFAULT_DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dictionaries', 'words_alpha.txt')
+PART_SIZE = 1 << 22 # bytes of a file checked by one task
+
+# suggestion engine (and dictionary) used by check_file, loaded once per process
+_engine = None
+
+
+def find_files(paths:list[str], pattern:str) -> list[str]:
+    '''
+    Expands the given paths into a list of files. Directories are searched recursively for files whose name matches pattern
+
+    Input: paths - files and directories to check, pattern - glob pattern for file names inside directories
+    Return: files - list of file paths in the order given (directory contents sorted)
+    '''
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, file_names in sorted(os.walk(path)):
+                for file_name in sorted(file_names):
+                    if fnmatch.fnmatch(file_name, pattern):
+                        files.append(os.path.join(directory, file_name))
+        else:
+            files.append(path)
+    return files
+
+def dictionary_key(dictionary_name:str) -> str:
+    '''
+    Identifies a dictionary for the suggestion cache file: its full path and the modification times of the dictionary and its
+    frequency file, so a cache saved before either of them changed is not loaded
+
+    Input: dictionary_name - dictionary .txt file
+    Return: key string
+    '''
+    parts = [os.path.abspath(dictionary_name)]
+    for file_name in (dictionary_name, frequency_file_name(dictionary_name)):
+        try:
+            parts.append(str(os.stat(file_name).st_mtime_ns))
+        except OSError:
+            parts.append('')
+    return '|'.join(parts)
+
+def load_worker_dictionary(dictionary_name:str, method:str, cache_file:str=None):
+    '''
+    Pool initializer that loads the dictionary unless it was inherited from the parent process
+
+    Input: dictionary_name - dictionary file to load, method - suggestion method to use in this process, cache_file - suggestion
+    cache file to load with the dictionary (None for no cache)
+    Return: None
+    '''
+    global _engine
+    suggestions.set_suggestion_method(method)
+    if _engine is None:
+        _engine = load_engine(dictionary_name)
+        if cache_file is not None:
+            _engine.loadCache(cache_file, dictionary_key(dictionary_name))
+
+def file_parts(files:list[str], part_size:int=PART_SIZE) -> list[tuple[str, int, int]]:
+    '''
+    Cuts files into the parts checked by one task each (see stream_checker.split_file)
+
+    Input: files - files to check, part_size - bytes in a part before it is ended at the next line ending
+    Return: list of (file, start, end) in file order, end is None for the last part of a file. A file that can not be read is one
+    part, so the error is reported when it is checked
+    '''
+    parts = []
+    for file_name in files:
+        try:
+            ranges = split_file(file_name, part_size)
+        except OSError:
+            ranges = [(0, None)]
+        parts.extend((file_name, start, end) for start, end in ranges)
+    return parts
+
+def check_file(file_name:str, suggestion_count:int, share_suggestions:bool=False, start:int=0, end:int=None) -> dict:
+    '''
+    Spell checks one file, or one part of it, with the dictionary of this process. The file is read in chunks with
+    stream_misspellings, so only the misspelled words of the part are kept in memory however large it is
+
+    Input: file_name - file to check, suggestion_count - number of suggestions to include for each misspelled word,
+    share_suggestions - also return every suggestion calculated so a parent process can cache them, start - byte offset of the
+    part, end - byte offset of the end of the part (None for the end of the file)
+    Return: dictionary with keys 'file', 'characters', 'misspellings' (list of result dictionaries with offsets from the start of
+    the part), 'error' (None if file was read) and 'suggestions' (misspelled word -> full list returned by calculate, empty unless
+    share_suggestions is set)
+    '''
+    misspellings = []
+    counts = {}
+    # suggestions are calculated once per unique misspelled word
+    word_suggestions = {}
+    calculated = {}
+    try:
+        for item in stream_misspellings(_engine.getDictionary(), file_name, counts=counts, start=start, end=end):
+            word = item['word'].casefold()
+            if suggestion_count > 0 and word not in word_suggestions:
+                calculated[word] = _engine.calculate(word)
+                word_suggestions[word] = [suggestion['word'] for suggestion in calculated[word]][:suggestion_count]
+            misspellings.append({
+                'file': file_name,
+                'word': item['word'],
+                'start': item['start'],
+                'end': item['end'],
+                'suggestions': word_suggestions.get(word, [])
+            })
+    except OSError as e:
+        return {'file': file_name, 'characters': 0, 'misspellings': [], 'error': str(e), 'suggestions': {}}
+    return {'file': file_name, 'characters': counts['characters'], 'misspellings': misspellings, 'error': None,
+            'suggestions': calculated if share_suggestions else {}}
+
+def ordered_results(executor:ProcessPoolExecutor, parts:list[tuple[str, int, int]], suggestion_count:int, share_suggestions:bool,
+                    window:int):
+    '''
+    Checks parts on a process pool and yields their results in order. Only window parts are submitted ahead of the part being
+    yielded, so results finished early do not pile up in this process while an earlier part is still being checked
+
+    Input: executor - process pool, parts - (file, start, end) parts from file_parts, suggestion_count - suggestions per
+    misspelled word, share_suggestions - workers return the suggestions they calculated, window - parts submitted at a time
+    Return: generator of check_file results in the order of parts
+    '''
+    pending = deque()
+    for file_name, start, end in parts:
+        pending.append(executor.submit(check_file, file_name, suggestion_count, share_suggestions, start, end))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def check_files(files:list[str], dictionary_name:str, workers:int, suggestion_count:int, method:str, output=sys.stdout,
+                cache_file:str=None) -> dict:
+    '''
+    Spell checks files in parallel and writes every misspelled word to output as a json line, in the order of files
+
+    Input: files - files to check, dictionary_name - dictionary file, workers - number of processes (1 checks in this process),
+    suggestion_count - suggestions per misspelled word, method - suggestion method, output - file object to write results to,
+    cache_file - json file to load suggestions from and save them to (None for no cache)
+    Return: summary - dictionary of counts and throughput
+    '''
+    global _engine
+    start_time = time.perf_counter()
+    _engine = load_engine(dictionary_name)
+    suggestions.set_suggestion_method(method)
+    if cache_file is not None:
+        _engine.loadCache(cache_file, dictionary_key(dictionary_name))
+    load_time = time.perf_counter() - start_time
+
+    summary = {'files': 0, 'characters': 0, 'misspellings': 0, 'errors': 0}
+    parts = file_parts(files, PART_SIZE)
+    if workers <= 1 or len(parts) <= 1:
+        results = (check_file(file_name, suggestion_count, False, start, end) for file_name, start, end in parts)
+        executor = None
+    else:
+        # forked workers inherit the loaded dictionary and cache, spawned workers load them in the initializer
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        executor = ProcessPoolExecutor(workers, mp_context=context, initializer=load_worker_dictionary,
+                                       initargs=(dictionary_name, method, cache_file))
+        # workers send back their suggestions so they can be saved with the cache of this process
+        results = ordered_results(executor, parts, suggestion_count, cache_file is not None, workers * 2)
+
+    try:
+        offset = 0 # characters in the parts of the current file that were already written
+        failed = False # an earlier part of the current file could not be read
+        for (file_name, start, end), result in zip(parts, results):
+            if start == 0:
+                offset = 0
+                failed = False
+            if failed:
+                continue
+            if result['error'] is not None:
+                print(f"{result['file']}: {result['error']}", file=sys.stderr)
+                summary['errors'] += 1
+                failed = True
+                continue
+            for misspelling in result['misspellings']:
+                misspelling['start'] += offset
+                misspelling['end'] += offset
+                output.write(json.dumps(misspelling) + '\n')
+            for word, word_suggestions in result['suggestions'].items():
+                _engine.cacheSuggestions(word, word_suggestions)
+            offset += result['characters']
+            summary['characters'] += result['characters']
+            summary['misspellings'] += len(result['misspellings'])
+            if end is None:
+                summary['files'] += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if cache_file is not None:
+            _engine.saveCache(cache_file, dictionary_key(dictionary_name))
+
+    elapsed = time.perf_counter() - start_time
+    summary['load_seconds'] = round(load_time, 3)
+    summary['seconds'] = round(elapsed, 3)
+    summary['files_per_second'] = round(summary['files'] / elapsed, 1) if elapsed > 0 else 0.0
+    summary['characters_per_second'] = round(summary['characters'] / elapsed) if elapsed > 0 else 0
+    return summary
+
+def build_parser() -> argparse.ArgumentParser:
+    '''
+    Creates the command line argument parser
+    '''
+    parser = argparse.ArgumentParser(prog='spellcheck', description='Spell check text files without the interactive menu')
+    parser.add_argument('--profile', action='store_true', help='print stage timings and counters to stderr at exit')
+    parser.add_argument('--profile-output', metavar='FILE', help='write stage timings as a Chrome trace json file at exit')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help='spell check files and directories, writing json lines to stdout')
+    check.add_argument('paths', nargs='+', help='files or directories to check')
+    check.add_argument('--dictionary', default=DEFAULT_DICTIONARY, help='dictionary .txt file (default: words_alpha.txt)')
+    check.add_argument('--pattern', default='*.txt', help='file name pattern used inside directories (default: *.txt)')
+    check.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='number of processes (default: cpu count)')
+    check.add_argument('--suggestions', type=int, default=0, help='number of suggestions per misspelled word (default: 0)')
+    check.add_argument('--method', choices=suggestions.SUGGESTION_METHODS, default='brute_force',
+                       help='suggestion method (default: brute_force, which needs no index to be built)')
+    check.add_argument('--cache', metavar='FILE', help='json file to keep calculated suggestions in between runs')
+
+    serve = commands.add_parser('serve', help='run a local spell check server (see server.py)')
+    serve.add_argument('--dictionary', default=DEFAULT_DICTIONARY, help='dictionary .txt file (default: words_alpha.txt)')
+    serve.add_argument('--host', default=DEFAULT_HOST, help=f'address to listen on (default: {DEFAULT_HOST})')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'TCP port (default: {DEFAULT_PORT})')
+    serve.add_argument('--unix', help='listen on this Unix socket path instead of TCP')
+    serve.add_argument('--method', choices=suggestions.SUGGESTION_METHODS, default=suggestions.suggestion_method,
+                       help=f'suggestion method (default: {suggestions.suggestion_method})')
+    serve.add_argument('--cache', metavar='FILE', help='json file to keep calculated suggestions in between runs')
+    return parser
+
+def run_server(arguments:argparse.Namespace) -> int:
+    '''
+    Loads the dictionary and suggestion index and serves requests until interrupted
+
+    Input: arguments - parsed serve command arguments
+    Return: exit status - 0 once interrupted, 2 if the server could not listen
+    '''
+    engine = load_engine(arguments.dictionary)
+    suggestions.set_suggestion_method(arguments.method)
+    if arguments.cache is not None:
+        engine.loadCache(arguments.cache, dictionary_key(arguments.dictionary))
+    engine.prepare()
+    try:
+        asyncio.run(SpellCheckServer(engine).serve(arguments.host, arguments.port, arguments.unix))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"spellcheck: {e}", file=sys.stderr)
+        return 2
+    finally:
+        # suggestions calculated after a word was added are not saved, see SuggestionCache.save
+        if arguments.cache is not None:
+            engine.saveCache(arguments.cache, dictionary_key(arguments.dictionary))
+    return 0
+
+def main(arguments:list[str]=None) -> int:
+    '''
+    Runs the command line interface
+
+    Input: arguments - command line arguments (sys.argv[1:] if not given)
+    Return: exit status - 0 if no misspelled words were found, 1 if there were, 2 if the dictionary or a file could not be read
+    '''
+    arguments = build_parser().parse_args(arguments)
+    # the dictionary loader of main.py asks for another file when it can not be read, which would wait on stdin forever here
+    if not os.path.isfile(arguments.dictionary) or not os.access(arguments.dictionary, os.R_OK):
+        print(f"spellcheck: can not read dictionary {arguments.dictionary}", file=sys.stderr)
+        return 2
+    if arguments.profile or arguments.profile_output:
+        instrumentation.enable(arguments.profile_output)
+    if arguments.command == 'serve':
+        return run_server(arguments)
+    files = find_files(arguments.paths, arguments.pattern)
+    summary = check_files(files, arguments.dictionary, arguments.workers, arguments.suggestions, arguments.method,
+                          cache_file=arguments.cache)
+    print(json.dumps(summary), file=sys.stderr)
+    if summary['errors'] > 0:
+        return 2
+    return 1 if summary['misspellings'] > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
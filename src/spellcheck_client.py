@@ -0,0 +1,113 @@
+'''
+Spell Check Client
+
+Small client for the spell check server in server.py. Connects over a Unix socket or localhost TCP port and sends one json request
+per line.
+
+    client = SpellCheckClient(port=8765)
+    client.check("Helo wrold", suggestions=3)
+    client.suggest("recieve", limit=5)
+    client.addWord("ajakpovi")
+    client.close()
+'''
+import itertools
+import json
+import socket
+
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class SpellCheckError(Exception):
+    '''
+    Raised when the server answers a request with an error
+    '''
+
+
+class SpellCheckClient():
+    '''
+    An instance of this class represents a connection to a spell check server
+    '''
+    def __init__(self, host:str=DEFAULT_HOST, port:int=DEFAULT_PORT, unix_path:str=None, timeout:float=None):
+        if unix_path is not None:
+            self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.__socket.settimeout(timeout)
+            self.__socket.connect(unix_path)
+        else:
+            self.__socket = socket.create_connection((host, port), timeout=timeout)
+        self.__file = self.__socket.makefile('rwb')
+        self.__ids = itertools.count(1)
+
+    def __send(self, requests):
+        '''
+        Sends a request (or list of requests) and waits for the response line
+        Input: requests - request dictionary or list of them
+        Return: decoded response
+        '''
+        self.__file.write((json.dumps(requests) + '\n').encode('utf-8'))
+        self.__file.flush()
+        line = self.__file.readline()
+        if not line:
+            raise ConnectionError("spell check server closed the connection")
+        return json.loads(line)
+
+    def __request(self, method:str, params:dict):
+        '''
+        Sends one request and returns its result. Throws SpellCheckError if the server returns an error
+        '''
+        response = self.__send({'id': next(self.__ids), 'method': method, 'params': params})
+        if 'error' in response:
+            raise SpellCheckError(response['error'])
+        return response['result']
+
+    def check(self, text:str, suggestions:int=0) -> list[dict]:
+        '''
+        Spell checks a text
+        Input: text - text to check, suggestions - number of suggestions to include for each misspelled word
+        Return: list of dictionaries with keys 'word', 'start', 'end' and 'suggestions'
+        '''
+        return self.__request('check', {'text': text, 'suggestions': suggestions})
+
+    def checkMany(self, texts:list[str], suggestions:int=0) -> list[list[dict]]:
+        '''
+        Spell checks many texts in one request
+        Input: texts - list of texts, suggestions - number of suggestions to include for each misspelled word
+        Return: list of check results in the same order as texts
+        '''
+        return self.__request('check', {'texts': texts, 'suggestions': suggestions})
+
+    def suggest(self, word:str, limit:int=None) -> list[dict]:
+        '''
+        Finds suggestions for a word
+        Input: word - word to find suggestions for, limit - max number of suggestions (all if not given)
+        Return: list of dictionaries with keys 'word' and 'distance'
+        '''
+        return self.__request('suggest', {'word': word, 'limit': limit})
+
+    def suggestMany(self, words:list[str], limit:int=None) -> list[list[dict]]:
+        '''
+        Finds suggestions for many words in one request
+        Input: words - list of words, limit - max number of suggestions per word
+        Return: list of suggestion lists in the same order as words
+        '''
+        return self.__request('suggest', {'words': words, 'limit': limit})
+
+    def addWord(self, word:str) -> bool:
+        '''
+        Adds a word to the server's dictionary
+        Input: word - word to add
+        Return: True
+        '''
+        return self.__request('add_word', {'word': word})
+
+    def close(self):
+        '''
+        Closes the connection
+        '''
+        self.__file.close()
+        self.__socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,148 @@
+'''
+Stream Checker
+
+This file contains functions for spell checking files that are too large to read into memory at once. The file is read in chunks
+and split into words with split_words, holding back a word that reaches the end of a chunk until the next chunk shows where it
+ends. Misspelled words are yielded one at a time with their absolute character offsets in the file, so memory use stays the same no
+matter how large the file is.
+
+Files are opened with newline='' so the offsets count the characters as they are stored in the file, eg. a Windows line ending
+is two characters. A run of word characters longer than MAX_WORD_LENGTH (eg. in a binary or minified file) is not held back whole,
+so the text read at a time never grows past chunk_size + MAX_WORD_LENGTH; the part read so far is yielded as a word and the rest
+becomes the next word.
+
+A large file can also be checked in parts (eg. one part per task of a process pool, see spellcheck.py). split_file cuts the file
+into byte ranges that each start after a line ending, so no word is split between two parts, and stream_misspellings checks only
+one range, with offsets counted from the start of the range.
+
+Each unique word is only looked up the first time it appears. The remembered results are forgotten once there are MAX_MEMO_SIZE of
+them, so a file with many different words (eg. a word list) does not keep every one of them in memory.
+'''
+import codecs
+
+from spell_checker import split_words
+
+CHUNK_SIZE = 1 << 20 # characters read from the file at a time
+MAX_WORD_LENGTH = 1024 # longest word held back at the end of a chunk
+MAX_MEMO_SIZE = 1 << 16 # unique words whose lookup is remembered
+
+
+def iter_words(file, chunk_size:int=CHUNK_SIZE, counts:dict=None):
+    '''
+    Reads a file object in chunks and yields its words in order
+
+    Input: file - text file object to read, chunk_size - number of characters to read at a time, counts - dictionary that gets the
+    number of characters read under the key 'characters' once the whole file is read
+    Return: generator of (word, start, end, index) tuples where start and end are offsets in the whole file and index is the
+    position of the word in the file
+    '''
+    carry = '' # text of a word that reached the end of the previous chunk
+    carry_start = 0 # offset in the file of the start of carry
+    index = 0
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        text = carry + chunk
+        words = split_words(text)
+
+        # a word at the very end of the text may continue in the next chunk, unless it is already too long to be a word
+        if len(words) > 0 and words[-1]['end'] == len(text) and len(text) - words[-1]['start'] <= MAX_WORD_LENGTH:
+            last_word = words.pop()
+            carry = text[last_word['start']:]
+            next_start = carry_start + last_word['start']
+        else:
+            carry = ''
+            next_start = carry_start + len(text)
+
+        for word in words:
+            yield word['word'], carry_start + word['start'], carry_start + word['end'], index
+            index += 1
+        carry_start = next_start
+
+    # handle case where file ends in a word
+    if carry:
+        yield carry, carry_start, carry_start + len(carry), index
+    if counts is not None:
+        counts['characters'] = carry_start + len(carry)
+
+class FileRange():
+    '''
+    An instance of this class represents a text file object that reads a range of bytes of a utf-8 file, decoding the same way as
+    opening the file with encoding='utf-8', errors='replace' and newline=''
+    '''
+    def __init__(self, file, start:int=0, end:int=None):
+        file.seek(start)
+        self.__file = file # binary file object
+        self.__remaining = end - start if end is not None else None # bytes left in the range, None to read to the end of the file
+        self.__decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def read(self, size:int) -> str:
+        '''
+        Reads up to size characters, an empty string at the end of the range
+        '''
+        while True:
+            if self.__remaining is not None:
+                size = min(size, self.__remaining)
+            data = self.__file.read(size) if size > 0 else b''
+            if self.__remaining is not None:
+                self.__remaining -= len(data)
+            text = self.__decoder.decode(data, final=len(data) == 0)
+            # a read that ends inside a multi byte character decodes to nothing until the rest of the character is read
+            if text or len(data) == 0:
+                return text
+
+def split_file(file_name:str, part_size:int) -> list[tuple[int, int]]:
+    '''
+    Cuts a file into byte ranges of about part_size bytes that each start after a line ending (a line ending is never part of a word
+    or of a multi byte character). A file without line endings is one range
+
+    Input: file_name - file to split, part_size - bytes in a range before it is ended at the next line ending
+    Return: list of (start, end) byte ranges in file order, end is None for the last range (to the end of the file)
+    '''
+    ranges = []
+    start = 0
+    with open(file_name, 'rb') as file:
+        while True:
+            file.seek(start + part_size)
+            # find the next line ending without reading a long line into memory at once
+            position = file.tell()
+            while True:
+                block = file.read(1 << 16)
+                if not block:
+                    ranges.append((start, None))
+                    return ranges
+                line_end = block.find(b'\n')
+                if line_end != -1:
+                    break
+                position += len(block)
+            end = position + line_end + 1
+            ranges.append((start, end))
+            start = end
+
+def stream_misspellings(dictionary:set, file_name:str, chunk_size:int=CHUNK_SIZE, counts:dict=None, start:int=0, end:int=None):
+    '''
+    Lazily spell checks a file, or a byte range of it (see split_file), without reading all of it into memory. Like
+    spell_check_words, each unique word is only looked up the first time it appears (until MAX_MEMO_SIZE words are remembered)
+
+    Input: dictionary - set of dictionary words, file_name - file to check, chunk_size - number of characters to read at a time,
+    counts - dictionary that gets the number of characters read from the file under the key 'characters' once the file is done,
+    start - byte offset to start checking at, end - byte offset to stop at (None for the end of the file)
+    Return: generator of dictionaries with keys 'word', 'start', 'end' (character offsets from the start of the range) and
+    'og_index' (position of the word in the range)
+    '''
+    misspelled = {} # word as written in the file -> True if it is not in the dictionary
+    with open(file_name, 'rb') as file:
+        for word, word_start, word_end, index in iter_words(FileRange(file, start, end), chunk_size, counts):
+            is_misspelled = misspelled.get(word)
+            if is_misspelled is None:
+                if len(misspelled) >= MAX_MEMO_SIZE:
+                    misspelled.clear()
+                is_misspelled = misspelled[word] = word.casefold() not in dictionary
+            if is_misspelled:
+                yield {
+                    'word': word,
+                    'start': word_start,
+                    'end': word_end,
+                    'og_index': index
+                }
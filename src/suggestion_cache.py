@@ -0,0 +1,161 @@
+'''
+Suggestion Cache
+
+This SuggestionCache class is a least recently used (LRU) cache of suggestion lists so a word that is selected again, or that
+appears again in another input, does not have its suggestions recalculated. Entries are keyed by the casefolded word, the
+generation of the dictionary (a counter that goes up every time a word is added to the dictionary) so suggestions calculated before
+a word was added are never reused, and the suggestion method that calculated them. Every SuggestionEngine has its own cache, so a
+cache only holds suggestions from one dictionary.
+
+Besides the full list of a word, an entry can hold only its first distance tier (distance 0 and 1), which is all the background
+SuggestionPrefetcher calculates. The cache is filled by the prefetcher as well as the main thread, so every method holds a lock.
+
+This class has the following methods
+    - get: returns the cached suggestions for a word or None, counting hits and misses
+    - peek: same as get without counting or marking the entry as used, for checks made by the engine itself
+    - put: stores suggestions (or the first tier of them) for a word, evicting the least recently used entry when the cache is full
+    - clear: removes every entry
+    - setMaxSize: changes how many words can be cached
+    - getStats: returns the size, max size, hits and misses of the cache
+    - save: writes the entries for the unmodified dictionary to a json file
+    - load: reads entries written by save if they were made with the same dictionary
+'''
+import json
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_SIZE = 1024
+
+class SuggestionCache():
+    '''
+    An instance of this class represents an LRU cache of suggestion lists
+    '''
+    def __init__(self, max_size:int=DEFAULT_MAX_SIZE):
+        self.__entries = OrderedDict() # (casefolded word, generation, method, first tier only) -> list of suggestions
+        self.__max_size = max_size
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    def get(self, word:str, generation:int, method:str, first_tier:bool=False):
+        '''
+        Finds the cached suggestions of a word and marks them as most recently used
+        Input: word - word to find suggestions for, generation - current dictionary generation, method - current suggestion method,
+        first_tier - find the entry holding only the first tier instead of the full list
+        Return: list of suggestions, None if word is not cached
+        '''
+        key = (word.casefold(), generation, method, first_tier)
+        with self.__lock:
+            suggestions = self.__entries.get(key)
+            if suggestions is None:
+                self.__misses += 1
+                return None
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return suggestions
+
+    def peek(self, word:str, generation:int, method:str, first_tier:bool=False):
+        '''
+        Finds the cached suggestions of a word without counting a hit or miss or changing which entry is least recently used, so
+        checks that are not a lookup of the user (eg. whether the prefetcher still has work to do) do not change the statistics
+        Input: word - word to find suggestions for, generation - current dictionary generation, method - current suggestion method,
+        first_tier - find the entry holding only the first tier instead of the full list
+        Return: list of suggestions, None if word is not cached
+        '''
+        with self.__lock:
+            return self.__entries.get((word.casefold(), generation, method, first_tier))
+
+    def put(self, word:str, generation:int, method:str, suggestions:list, first_tier:bool=False):
+        '''
+        Stores the suggestions of a word, removing the least recently used entries if the cache is full. Storing the full list
+        replaces the first tier entry of the word
+        Input: word - word the suggestions are for, generation - dictionary generation they were calculated with, method -
+        suggestion method that calculated them, suggestions - list, first_tier - suggestions only hold the first tier
+        Return: None
+        '''
+        if self.__max_size <= 0:
+            return
+        key = (word.casefold(), generation, method, first_tier)
+        with self.__lock:
+            if not first_tier:
+                self.__entries.pop((word.casefold(), generation, method, True), None)
+            self.__entries[key] = suggestions
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        '''
+        Removes all entries and resets the hit and miss counters
+        Input: N/A
+        Return: None
+        '''
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def setMaxSize(self, max_size:int):
+        '''
+        Setter function for the number of words that can be cached. Removes least recently used entries if there are too many
+        Input: max_size - new max size (0 disables the cache)
+        Return: None
+        '''
+        with self.__lock:
+            self.__max_size = max_size
+            while len(self.__entries) > max(max_size, 0):
+                self.__entries.popitem(last=False)
+
+    def getStats(self) -> dict:
+        '''
+        Getter function for cache statistics
+        Input: N/A
+        Return: dictionary with keys 'size', 'max_size', 'hits' and 'misses'
+        '''
+        with self.__lock:
+            return {
+                'size': len(self.__entries),
+                'max_size': self.__max_size,
+                'hits': self.__hits,
+                'misses': self.__misses
+            }
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def save(self, file_name:str, dictionary_key:str):
+        '''
+        Writes the full entries calculated with the unmodified dictionary (generation 0) to a json file. Words added to the
+        dictionary are not saved, so entries from later generations would not be valid in the next run
+
+        Input: file_name - json file to write, dictionary_key - string identifying the dictionary (eg. its file name)
+        Return: None
+        '''
+        with self.__lock:
+            entries = [
+                [word, method, suggestions] for (word, generation, method, first_tier), suggestions in self.__entries.items()
+                if generation == 0 and not first_tier
+            ]
+        with open(file_name, 'w') as file:
+            json.dump({'dictionary': dictionary_key, 'entries': entries}, file)
+
+    def load(self, file_name:str, dictionary_key:str) -> bool:
+        '''
+        Reads entries written by save as generation 0 entries. Nothing is loaded if the file does not exist, is invalid or was saved
+        for a different dictionary, and entries that are not [word, method, suggestions] lists are skipped
+
+        Input: file_name - json file to read, dictionary_key - string identifying the current dictionary
+        Return: True if entries were loaded
+        '''
+        try:
+            with open(file_name, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get('dictionary') != dictionary_key:
+            return False
+        for entry in data.get('entries', []):
+            if isinstance(entry, list) and len(entry) == 3:
+                word, method, suggestions = entry
+                self.put(word, 0, method, suggestions)
+        return True
@@ -0,0 +1,311 @@
+'''
+Suggestion Engine
+
+This SuggestionEngine class holds everything needed to find suggestions for one loaded dictionary: the dictionary itself, the
+suggestion indexes built over it (see suggestions.build_index), an LRU cache of calculated suggestions, the generation of the
+dictionary (a counter that goes up whenever a word is added, so suggestions cached before are not used) and an optional word
+frequency table used to rank suggestions. One engine is created by main for the session and passed to the word navigation and
+selection menus instead of the raw dictionary, and the command line and server create one for the dictionary they load. Nothing is
+shared between engines, so the suggestions of one dictionary are never used for another.
+
+The background SuggestionPrefetcher calls prefetch from another thread, so an index is only built, searched or changed while the
+engine's lock is held. prefetch only searches the first distance tier, so the lock is never held for long, and it never prints.
+
+This class has the following methods
+    - getDictionary: returns the dictionary used for spell checking
+    - getCache: returns the suggestion cache
+    - getFrequencyTable: returns the word frequency table used to rank suggestions
+    - setFrequencyTable: changes the word frequency table used to rank suggestions
+    - prepare: builds the suggestion index now instead of on the first lookup
+    - addWord: adds a word to the dictionary and suggestion indexes
+    - prefetch: caches the first distance tier of the suggestions of a word
+    - cacheSuggestions: stores suggestions calculated by another process
+    - loadCache: loads suggestions saved by an earlier run
+    - saveCache: saves calculated suggestions for later runs
+    - calculate: returns all suggestions for a word
+    - iterSuggestions: returns the suggestions for a word one distance tier at a time
+    - getSuggestions: adds a page of suggestions to a misspelled word of a WordList
+'''
+import functools
+import threading
+
+import suggestions
+from instrumentation import stage, count
+from suggestion_cache import SuggestionCache, DEFAULT_MAX_SIZE
+from word_list import WordList
+
+class SuggestionEngine():
+    '''
+    An instance of this class represents the suggestion state of one loaded dictionary
+    '''
+    def __init__(self, dictionary:set, frequencies=None, cache_size:int=DEFAULT_MAX_SIZE):
+        self.__dictionary = dictionary
+        self.__frequencies = frequencies # FrequencyTable of the dictionary (see word_frequency.py) or None
+        self.__indexes = {} # suggestion method -> index built over the dictionary
+        self.__cache = SuggestionCache(cache_size)
+        self.__generation = 0
+        self.__lock = threading.RLock()
+
+    def getDictionary(self) -> set:
+        '''
+        Getter function for the dictionary
+        Input: N/A
+        Return: dictionary words
+        '''
+        return self.__dictionary
+
+    def getCache(self) -> SuggestionCache:
+        '''
+        Getter function for the cache of calculated suggestions (eg. to change its size or read its statistics)
+        Input: N/A
+        Return: SuggestionCache
+        '''
+        return self.__cache
+
+    def getFrequencyTable(self):
+        '''
+        Getter function for the word frequency table
+        Input: N/A
+        Return: FrequencyTable, None if suggestions are ranked alphabetically
+        '''
+        return self.__frequencies
+
+    def setFrequencyTable(self, frequencies):
+        '''
+        Ranks suggestions by a word frequency table. The suggestions cached by this engine are removed because their order changes
+        Input: frequencies - FrequencyTable of the dictionary, None to rank alphabetically
+        Return: None
+        '''
+        self.__frequencies = frequencies
+        self.__cache.clear()
+
+    def __getIndex(self, method:str):
+        '''
+        Returns the index of a method, building it the first time it is needed. Must be called while holding the lock
+        '''
+        index = self.__indexes.get(method)
+        if index is None:
+            index = self.__indexes[method] = suggestions.build_index(self.__dictionary, method)
+        return index
+
+    def prepare(self):
+        '''
+        Builds the suggestion index of the current suggestion method if it has not been built yet
+        Input: N/A
+        Return: None
+        '''
+        method = suggestions.suggestion_method
+        if method == 'brute_force':
+            return
+        with self.__lock:
+            # parallel search has no index and the dawg index of a compiled dictionary is read from its file
+            stored = method == 'dawg' and hasattr(self.__dictionary, 'getDawg')
+            if method not in self.__indexes and method != 'parallel' and not stored:
+                print("Building suggestion index for dictionary (only done once)...")
+            self.__getIndex(method)
+
+    def addWord(self, word:str):
+        '''
+        Adds a word to the dictionary and to every suggestion index built for it. Suggestions cached before the word was added are
+        no longer used
+        Input: word - word to add
+        Return: None
+        '''
+        word = word.casefold().strip()
+        with self.__lock: # the background prefetcher may be searching the dictionary
+            self.__dictionary.add(word)
+            for index in self.__indexes.values():
+                index.add(word)
+            self.__generation += 1
+
+    def __search(self, word:str, max_dist:int) -> list[tuple]:
+        '''
+        Finds every dictionary word within max_dist edits of a word with the current suggestion method
+
+        Input: word - casefolded word to search for, max_dist - max edit distance allowed
+        Return: matches - list of (word, distance) tuples in no particular order
+        '''
+        with self.__lock:
+            method = suggestions.suggestion_method
+            if method == 'brute_force':
+                matches = suggestions.brute_force_search(self.__dictionary, word, max_dist)
+            else:
+                index = self.__getIndex(method)
+                with stage('index_search'):
+                    matches = index.search(word, max_dist)
+        count('candidates_accepted', len(matches))
+        return matches
+
+    def calculate(self, word:str, limit:int=None) -> list[dict]:
+        '''
+        Finds all dictionary words within the max allowed distance of a word, using the suggestion cache when the word has already
+        been calculated for the current dictionary generation
+
+        Input: word - word to find suggestions for, limit - max number of suggestions needed (all if not given)
+        Return: suggestions - list of dictionaries with keys 'word' and 'distance' sorted by distance, then by frequency if the
+        engine has a frequency table, and then alphabetically
+        '''
+        comparrison_word = word.casefold().strip()
+        generation = self.__generation
+        method = suggestions.suggestion_method
+        cached = self.__cache.get(comparrison_word, generation, method)
+        if cached is None and limit is not None:
+            # suggestions are ranked by distance first, so the best limit suggestions may all be in the prefetched first tier. The
+            # miss of the full list was already counted, so the first tier is only peeked at
+            cached = self.__cache.peek(comparrison_word, generation, method, first_tier=True)
+            if cached is not None and len(cached) < limit:
+                cached = None
+        if cached is not None:
+            count('suggestion_cache_hits')
+            return cached if limit is None else cached[:limit]
+        count('suggestion_cache_misses')
+
+        max_dist = suggestions.max_allowed_distance(word.strip())
+        matches = self.__search(comparrison_word, max_dist)
+
+        with stage('sorting'):
+            ranked = suggestions.rank_matches(matches, self.__frequencies, limit)
+        # a list cut down to limit is not cached, later calls may need every suggestion
+        if len(ranked) == len(matches) and generation == self.__generation:
+            self.__cache.put(comparrison_word, generation, method, ranked)
+        return ranked
+
+    def __searchTiers(self, word:str, max_dist:int, first_tier:int=1):
+        '''
+        Tiered version of __search (see DawgIndex.searchTiers). Must be advanced while holding the lock
+
+        Input: word - casefolded word to search for, max_dist - max edit distance allowed, first_tier - distance of the first tier
+        Return: iterator of lists of (word, distance) tuples, the first with every match within first_tier and then one list for
+        each distance
+        '''
+        method = suggestions.suggestion_method
+        if method == 'brute_force':
+            search_function = functools.partial(suggestions.brute_force_search, self.__dictionary)
+            yield from suggestions.search_tiers_by_length(search_function, word, max_dist, first_tier)
+            return
+        index = self.__getIndex(method)
+        if method == 'parallel':
+            yield from suggestions.search_tiers_by_length(index.search, word, max_dist, first_tier)
+            return
+        yield from index.searchTiers(word, max_dist, first_tier)
+
+    def prefetch(self, word:str):
+        '''
+        Finds the first distance tier (distance 0 and 1) of the suggestions of a word and caches it, so the first page of
+        suggestions is ready when the word is selected. Only the first tier is searched because it is cheap, so the lock is never
+        held for long. Does nothing if the word is already cached
+
+        Input: word - word to find suggestions for
+        Return: None
+        '''
+        comparrison_word = word.casefold().strip()
+        generation = self.__generation
+        method = suggestions.suggestion_method
+        # the prefetcher is not a user of the cache, so its checks are not counted as hits or misses
+        if (self.__cache.peek(comparrison_word, generation, method) is not None or
+                self.__cache.peek(comparrison_word, generation, method, first_tier=True) is not None):
+            return
+        max_dist = suggestions.max_allowed_distance(word.strip())
+        with self.__lock:
+            matches = next(self.__searchTiers(comparrison_word, max_dist))
+        ranked = suggestions.rank_matches(matches, self.__frequencies)
+        if generation == self.__generation:
+            # when the first tier is the only one it is the full list
+            self.__cache.put(comparrison_word, generation, method, ranked, first_tier=max_dist > 1)
+
+    def iterSuggestions(self, word:str):
+        '''
+        Generator version of calculate that finds the suggestions one distance tier at a time: distance 0 and 1 first, then 2 and
+        then 3 (up to the max allowed distance of the word). A tier is only searched once the suggestions of the tier before it have
+        been used, so the first suggestions are ready almost immediately, and the first tier is taken from the cache if the
+        SuggestionPrefetcher has already found it. The search carries on from where the tier before it stopped instead of starting
+        again, so searching every tier costs about the same as one call to calculate. Once every tier has been searched the full
+        list is cached like calculate
+
+        Input: word - word to find suggestions for
+        Return: iterator of dictionaries with keys 'word' and 'distance' in the same order as calculate
+        '''
+        comparrison_word = word.casefold().strip()
+        generation = self.__generation
+        method = suggestions.suggestion_method
+        cached = self.__cache.get(comparrison_word, generation, method)
+        if cached is not None:
+            count('suggestion_cache_hits')
+            yield from cached
+            return
+        count('suggestion_cache_misses')
+
+        max_dist = suggestions.max_allowed_distance(word.strip())
+        # the SuggestionPrefetcher may already have found the first tier
+        prefetched = self.__cache.peek(comparrison_word, generation, method, first_tier=True)
+        found = list(prefetched) if prefetched is not None else []
+        yield from found
+        first_tier = 1 if prefetched is None else 2
+        tiers = self.__searchTiers(comparrison_word, max_dist, first_tier)
+        for _ in range(first_tier, max_dist + 1):
+            with stage('suggestion_tier'):
+                with self.__lock:
+                    matches = next(tiers)
+                if first_tier > 1:
+                    # the first list also holds the distances that were taken from the cache
+                    matches = [match for match in matches if match[1] >= first_tier]
+                count('candidates_accepted', len(matches))
+            # a tier can hold hundreds of suggestions but usually only a page of them is shown
+            for suggestion in suggestions.iter_ranked(matches, self.__frequencies):
+                found.append(suggestion)
+                yield suggestion
+        if generation == self.__generation:
+            self.__cache.put(comparrison_word, generation, method, found)
+
+    def cacheSuggestions(self, word:str, word_suggestions:list[dict]):
+        '''
+        Stores the full list of suggestions of a word calculated somewhere else with this engine's dictionary (eg. by a spellcheck
+        worker process) so the word is not calculated again
+        Input: word - word the suggestions are for, word_suggestions - list returned by calculate
+        Return: None
+        '''
+        if self.__generation == 0:
+            self.__cache.put(word.casefold().strip(), 0, suggestions.suggestion_method, word_suggestions)
+
+    def loadCache(self, file_name:str, dictionary_key:str) -> bool:
+        '''
+        Loads suggestions saved by saveCache. Only done before any word is added, cached suggestions are for the unchanged dictionary
+        Input: file_name - path of the cache file, dictionary_key - identifies the dictionary the cache must have been saved for
+        Return: True if the cache was loaded
+        '''
+        if self.__generation != 0:
+            return False
+        return self.__cache.load(file_name, dictionary_key)
+
+    def saveCache(self, file_name:str, dictionary_key:str):
+        '''
+        Saves the suggestions calculated for the unchanged dictionary so later runs can load them with loadCache
+        Input: file_name - path of the cache file, dictionary_key - identifies the dictionary the suggestions were calculated for
+        Return: None
+        '''
+        self.__cache.save(file_name, dictionary_key)
+
+    def getSuggestions(self, mispelled_words:WordList, word:dict, limit:int=None, stream=None):
+        '''
+        Adds suggestions for a misspelled word to mispelled_words (shared by every occurance of the word) until the word has at least
+        limit suggestions. Suggestions are taken from stream, a generator returned by an earlier call, or from a new iterSuggestions
+        generator that skips the suggestions the word already has, so only the distance tiers that are needed are searched
+
+        Input: mispelled_words - object containing list of misspelled words, word - misspelled word information, limit - number of
+        suggestions needed (all if not given), stream - generator returned by the last call for the word
+        Return: stream to pass to the next call for more suggestions, or None once every suggestion has been added
+        '''
+        if stream is None:
+            print("Calculating word suggestions from dictionary...")
+            known = set(word['suggestions'])
+            stream = (suggestion for suggestion in self.iterSuggestions(word['word']) if suggestion['word'] not in known)
+        new_suggestions = []
+        with stage('suggest'):
+            while limit is None or len(word['suggestions']) + len(new_suggestions) < limit:
+                suggestion = next(stream, None)
+                if suggestion is None:
+                    stream = None
+                    break
+                new_suggestions.append(suggestion)
+        mispelled_words.updateSuggestions(new_suggestions, word['word'])
+        return stream
@@ -0,0 +1,125 @@
+'''
+Suggestion Prefetcher
+
+This SuggestionPrefetcher class finds the first suggestions of misspelled words on a background thread while the user is reading
+the word navigation menu, so selecting a word usually finds its first page of suggestions already in the suggestion cache. Only
+the words the user is about to look at are queued (the current word, its neighbours and the next PREFETCH_AHEAD words, see
+nearby_words) and the queue is replaced whenever the user navigates, so no time is spent on words the user may never select.
+
+Only the first distance tier of each word is found (see SuggestionEngine.prefetch). It is cheap, so the engine's lock is never held
+for long and selecting a word does not wait for the thread, and the further tiers are only searched if the user asks for more
+suggestions. The suggestion index is built by main before the thread starts and the thread never prints, so nothing is printed
+in the middle of a menu.
+
+A thread is used instead of a process pool because the results have to end up in the suggestion cache of this process and the
+dictionary and suggestion index would otherwise have to be copied to every worker.
+
+This class has the following methods
+    - start: queues the words near the current misspelled word of a WordList and starts the thread
+    - prioritize: replaces the queue with the words the user is about to look at
+    - stop: empties the queue and stops the thread after the word it is working on
+    - getStats: returns the number of queued and prefetched words
+'''
+import threading
+from collections import deque
+
+from suggestion_engine import SuggestionEngine
+from word_list import WordList
+
+# number of misspelled words after the current one that are prefetched
+PREFETCH_AHEAD = 3
+
+def nearby_words(mispelled_words:WordList, ahead:int=PREFETCH_AHEAD) -> list[str]:
+    '''
+    Finds the words the user is about to look at: the current misspelled word, the next one, the previous one and then the ahead
+    words after the current one (navigation wraps around the list)
+
+    Input: mispelled_words - object containing list of misspelled words, ahead - number of words after the current one to include
+    Return: words - list of unique casefolded words, most likely to be selected first
+    '''
+    items = mispelled_words.getItems()
+    if not items:
+        return []
+    current = mispelled_words.current()
+    offsets = [0, 1, -1] + list(range(2, ahead + 1))
+    words = []
+    for offset in offsets:
+        word = items[(current + offset) % len(items)]['word'].casefold()
+        if word not in words:
+            words.append(word)
+    return words
+
+
+class SuggestionPrefetcher():
+    '''
+    An instance of this class represents a background thread that fills the suggestion cache for one suggestion engine
+    '''
+    def __init__(self, engine:SuggestionEngine):
+        self.__engine = engine
+        self.__queue = deque() # casefolded words waiting to be prefetched, next word on the left
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__stopped = False
+        self.__prefetched = 0
+
+    def start(self, mispelled_words:WordList):
+        '''
+        Queues the words near the current misspelled word and starts the background thread
+        Input: mispelled_words - object containing list of misspelled words
+        Return: None
+        '''
+        with self.__condition:
+            self.__stopped = False
+        self.prioritize(nearby_words(mispelled_words))
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__thread = threading.Thread(target=self.__run, name='suggestion-prefetcher', daemon=True)
+            self.__thread.start()
+
+    def prioritize(self, words:list[str]):
+        '''
+        Replaces the queue with words, the first word first. Words that are already cached are skipped by the engine
+        Input: words - list of words (eg. from nearby_words)
+        Return: None
+        '''
+        with self.__condition:
+            self.__queue.clear()
+            for word in words:
+                word = word.casefold().strip()
+                if word not in self.__queue:
+                    self.__queue.append(word)
+            self.__condition.notify()
+
+    def stop(self):
+        '''
+        Empties the queue and lets the thread finish after the word it is working on. Does not wait for the thread
+        Input: N/A
+        Return: None
+        '''
+        with self.__condition:
+            self.__queue.clear()
+            self.__stopped = True
+            self.__condition.notify()
+
+    def getStats(self) -> dict:
+        '''
+        Getter function for the progress of the prefetcher
+        Input: N/A
+        Return: dictionary with keys 'queued' and 'prefetched'
+        '''
+        with self.__condition:
+            return {'queued': len(self.__queue), 'prefetched': self.__prefetched}
+
+    def __run(self):
+        '''
+        Prefetches queued words until stop is called
+        '''
+        while True:
+            with self.__condition:
+                while not self.__queue and not self.__stopped:
+                    self.__condition.wait()
+                if self.__stopped:
+                    return
+                word = self.__queue.popleft()
+            self.__engine.prefetch(word)
+            with self.__condition:
+                self.__prefetched += 1
@@ -1,4 +1,23 @@
-from word_list import WordList
+import heapq
+from dawg import DawgIndex
+from symspell import SymSpellIndex
+from parallel_search import ParallelSearch, DEFAULT_MIN_WORDS
+from instrumentation import stage, count
+
+try:
+    import numpy
+except ImportError:
+    numpy = None # batch_edit_distance is only used when numpy is installed
+
+# methods that can be used to find suggestions. dawg and symspell build an index over the dictionary the first time they are used,
+# parallel is brute_force split across worker processes. Indexes, cached suggestions and frequency tables belong to the
+# SuggestionEngine of each dictionary (see suggestion_engine.py)
+SUGGESTION_METHODS = ('dawg', 'symspell', 'brute_force', 'parallel')
+suggestion_method = 'dawg'
+
+# settings for the parallel method, see configure_parallel
+parallel_workers = None
+parallel_min_words = DEFAULT_MIN_WORDS
 
 def edit_distance(word1:str, word2:str) -> int:
     '''
@@ -50,6 +69,112 @@ def edit_distance(word1:str, word2:str) -> int:
 
     return dp[m][n]
 
+def bounded_edit_distance(word1:str, word2:str, max_distance:int) -> int:
+    '''
+    Calculates the same Damerau-Levenshtein edit distance as edit_distance but only when it is at most max_distance, which is all
+    that is needed when looking for suggestions. Only the cells within max_distance of the diagonal of the dp table can hold a
+    distance <= max_distance, so only that band is calculated, only the last three rows are kept (transpositions look two rows
+    back) and the calculation stops as soon as every cell in a row is over max_distance
+
+    Input: word1 and word2 are the words to calculate edit distance, max_distance - largest distance that needs to be known
+    Return: edit distance if it is at most max_distance, otherwise max_distance + 1
+    '''
+    m = len(word1)
+    n = len(word2)
+    too_far = max_distance + 1 # value for cells outside of the band or over max_distance
+    if abs(m - n) > max_distance:
+        return too_far
+    if word1 == word2:
+        return 0
+
+    # base case - comparing against empty string
+    previous_row = [j if j <= max_distance else too_far for j in range(n + 1)]
+    row_before_previous = previous_row
+
+    for i in range(1, m + 1):
+        current_row = [too_far] * (n + 1)
+        if i <= max_distance:
+            current_row[0] = i
+        row_min = current_row[0]
+        letter1 = word1[i - 1]
+
+        # only calculate the band of cells within max_distance of the diagonal
+        for j in range(max(1, i - max_distance), min(n, i + max_distance) + 1):
+            letter2 = word2[j - 1]
+            distance = previous_row[j - 1] + (letter1 != letter2) # substitution
+            if previous_row[j] + 1 < distance: # deletion
+                distance = previous_row[j] + 1
+            if current_row[j - 1] + 1 < distance: # insertion
+                distance = current_row[j - 1] + 1
+            # transposition (swap of adjacent characters)
+            if i > 1 and j > 1 and letter1 == word2[j - 2] and word1[i - 2] == letter2:
+                if row_before_previous[j - 2] + 1 < distance:
+                    distance = row_before_previous[j - 2] + 1
+            if distance > too_far:
+                distance = too_far
+            current_row[j] = distance
+            if distance < row_min:
+                row_min = distance
+
+        # distances can not go down in later rows, so stop early once the whole row is too far
+        if row_min > max_distance:
+            return too_far
+        row_before_previous = previous_row
+        previous_row = current_row
+
+    return previous_row[n]
+
+def batch_edit_distance(word:str, candidates:list[str]) -> list[int]:
+    '''
+    Calculates the same Damerau-Levenshtein edit distance as edit_distance between word and many candidates at once using numpy.
+    Candidates of the same length are encoded into one matrix of character codes and the dp table is filled one row (letter of
+    word) at a time for all of them together. Insertions are the only edit that depends on the cell to the left in the same row, so
+    a row is finished with a running minimum: row[j] = min over l <= j of (best[l] + j - l)
+
+    Input: word - word to compare against, candidates - list of words to calculate edit distance to
+    Return: distances - list of edit distances in the same order as candidates
+    '''
+    m = len(word)
+    distances = [0] * len(candidates)
+    word_codes = [ord(letter) for letter in word]
+
+    # group candidates by length so each group can be stored in a matrix
+    groups = {}
+    for position, candidate in enumerate(candidates):
+        groups.setdefault(len(candidate), []).append(position)
+
+    for n, positions in groups.items():
+        if n == 0 or m == 0:
+            for position in positions:
+                distances[position] = max(m, n)
+            continue
+        count = len(positions)
+        text = ''.join(candidates[position] for position in positions)
+        codes = numpy.frombuffer(text.encode('utf-32-le'), dtype=numpy.uint32).reshape(count, n)
+        columns = numpy.arange(n + 1, dtype=numpy.int32)
+
+        # base case - comparing against empty string
+        previous_row = numpy.broadcast_to(columns, (count, n + 1))
+        row_before_previous = previous_row
+        for i in range(1, m + 1):
+            best = numpy.empty((count, n + 1), dtype=numpy.int32)
+            best[:, 0] = i
+            # substitution and deletion
+            numpy.minimum(previous_row[:, :-1] + (codes != word_codes[i - 1]), previous_row[:, 1:] + 1, out=best[:, 1:])
+            # transposition (swap of adjacent characters)
+            if i > 1 and n > 1:
+                swapped = (codes[:, :-1] == word_codes[i - 1]) & (codes[:, 1:] == word_codes[i - 2])
+                transposition = numpy.where(swapped, row_before_previous[:, :-2] + 1, best[:, 2:])
+                numpy.minimum(best[:, 2:], transposition, out=best[:, 2:])
+            # insertion
+            current_row = numpy.minimum.accumulate(best - columns, axis=1) + columns
+            row_before_previous = previous_row
+            previous_row = current_row
+
+        for position, distance in zip(positions, previous_row[:, n].tolist()):
+            distances[position] = distance
+    return distances
+
 def max_allowed_distance(word:str) -> int:
     '''
     Calculates the max allowed edit distance and length distance allowed for this word when comapring against other words
@@ -66,22 +191,155 @@ def max_allowed_distance(word:str) -> int:
     else:
         return 3
 
-def get_suggestions(mispelled_words:WordList, dictionary:set, word:dict):
-    print("Calculating word suggestions from dictionary...")
-    dictionary_list = list(dictionary)
-    max_dist = max_allowed_distance(word['word'].strip())
-    suggestions = []
+def set_suggestion_method(method:str):
+    '''
+    Changes the method used by get_suggestions. Throws an exception if method is not one of SUGGESTION_METHODS
 
-    for candidate in dictionary_list:
-        if abs(len(candidate) - len(word['word'])) > max_dist:
-            continue
+    Input: method - 'dawg' (default, a compact trie searched one shared prefix at a time), 'symspell' for fast batch lookups,
+    'brute_force' to compare against every word or 'parallel' to compare against every word on several processes
+    Return: None
+    '''
+    global suggestion_method
+    if method not in SUGGESTION_METHODS:
+        raise ValueError(f"Invalid suggestion method {method}. Choose from {', '.join(SUGGESTION_METHODS)}")
+    suggestion_method = method
+
+def configure_parallel(workers:int=None, min_words:int=None):
+    '''
+    Changes the settings of the parallel suggestion method. Takes effect for dictionaries searched with it for the first time
 
-        dist = edit_distance(word['word'].casefold().strip(), candidate)
+    Input: workers - number of worker processes (cpu count if not given), min_words - dictionaries with fewer words are searched
+    without starting workers
+    Return: None
+    '''
+    global parallel_workers, parallel_min_words
+    parallel_workers = workers
+    if min_words is not None:
+        parallel_min_words = min_words
+
+def candidate_words(dictionary:set, word:str, max_dist:int, min_dist:int=0):
+    '''
+    Finds the dictionary words whose length is close enough to word to be within max_dist edits. Dictionaries bucketed by length
+    (BucketedDictionary and CompiledDictionary) only visit the 2 * max_dist + 1 buckets that can match, others are filtered
+
+    Input: dictionary - dictionary words, word - word to find candidates for, max_dist - max edit distance allowed, min_dist -
+    smallest length difference to include (used to search one distance tier at a time)
+    Return: iterator of candidate words
+    '''
+    if hasattr(dictionary, 'wordsOfLength'):
+        for length in range(max(0, len(word) - max_dist), len(word) + max_dist + 1):
+            if abs(length - len(word)) >= min_dist:
+                yield from dictionary.wordsOfLength(length)
+    else:
+        for candidate in dictionary:
+            if min_dist <= abs(len(candidate) - len(word)) <= max_dist:
+                yield candidate
+
+def brute_force_search(dictionary:set, word:str, max_dist:int, length_differences:tuple=None) -> list[tuple]:
+    '''
+    Compares a word against every word in the dictionary whose length is close enough to be within max_dist edits. Uses
+    batch_edit_distance when numpy is installed
 
-        if dist <= max_dist:
-            suggestions.append({
-                'word':candidate,
-                "distance": dist
-            })
-    suggestions.sort(key=lambda x: (x["distance"], x["word"])) # sort based on distance from low to high and alphabetically if there is a tie
-    mispelled_words.updateSuggestions(suggestions, word['word'])
\ No newline at end of file
+    Input: dictionary - set of dictionary words, word - word to search for, max_dist - max edit distance allowed,
+    length_differences - (smallest, largest) length difference of the words to compare (0 to max_dist if not given)
+    Return: matches - list of (word, distance) tuples
+    '''
+    low, high = length_differences if length_differences is not None else (0, max_dist)
+    with stage('candidate_filtering'):
+        candidates = list(candidate_words(dictionary, word, high, low))
+    count('candidates_scanned', len(candidates))
+
+    with stage('distance_computation'):
+        if numpy is not None:
+            distances = batch_edit_distance(word, candidates)
+        else:
+            distances = [bounded_edit_distance(word, candidate, max_dist) for candidate in candidates]
+        matches = [(candidate, dist) for candidate, dist in zip(candidates, distances) if dist <= max_dist]
+    return matches
+
+def search_tiers_by_length(search_function, word:str, max_dist:int, first_tier:int=1):
+    '''
+    Tiered search for the methods that compare every candidate (brute_force and parallel). A word within d edits differs in length
+    by at most d, so tier t only compares the candidates whose length differs by exactly t and keeps the matches it finds for
+    later tiers. Every candidate is compared once, up to max_dist, over all of the tiers
+
+    Input: search_function - function(word, max_dist, length_differences) returning (word, distance) tuples, word - word to
+    search for, max_dist - max edit distance allowed, first_tier - distance of the first tier
+    Return: iterator of lists of (word, distance) tuples, the first with every match within first_tier and then one list for each
+    distance up to max_dist
+    '''
+    first_tier = min(first_tier, max_dist)
+    found = [[] for _ in range(max_dist + 1)] # matches by distance
+    for tier in range(first_tier, max_dist + 1):
+        for match in search_function(word, max_dist, (0 if tier == first_tier else tier, tier)):
+            found[match[1]].append(match)
+        if tier == first_tier:
+            yield [match for distance in range(tier + 1) for match in found[distance]]
+        else:
+            yield found[tier]
+
+def build_index(dictionary:set, method:str):
+    '''
+    Builds the suggestion index of a dictionary for a method. Building the dawg or symspell index takes a few seconds for a large
+    dictionary, so the SuggestionEngine of the dictionary builds it once and keeps it. A compiled dictionary stores the graph of
+    the dawg index in its file, so that index is only read from the file (plus the words added since it was loaded)
+
+    Input: dictionary - set of dictionary words, method - 'dawg', 'symspell' or 'parallel'
+    Return: DAWG, SymSpell index or ParallelSearch containing every word in the dictionary
+    '''
+    if method == 'parallel':
+        # worker processes are only started by the first search that needs them
+        return ParallelSearch(brute_force_search, dictionary, parallel_workers, parallel_min_words)
+    with stage('index_build'):
+        if method == 'symspell':
+            return SymSpellIndex(bounded_edit_distance, dictionary)
+        if hasattr(dictionary, 'getDawg'):
+            index = DawgIndex(bounded_edit_distance, graph=dictionary.getDawg())
+            for word in dictionary.getAddedWords():
+                index.add(word)
+            return index
+        return DawgIndex(bounded_edit_distance, dictionary)
+
+def ranking_key(frequencies=None):
+    '''
+    Returns the sort key for (word, distance) matches: by distance, then most common word first if there is a frequency table, then
+    alphabetically
+
+    Input: frequencies - FrequencyTable of the dictionary (see word_frequency.py) or None
+    Return: key function
+    '''
+    if frequencies is None:
+        return lambda match: (match[1], match[0])
+    get_count = frequencies.getCount
+    return lambda match: (match[1], -get_count(match[0]), match[0])
+
+def rank_matches(matches:list[tuple], frequencies=None, limit:int=None) -> list[dict]:
+    '''
+    Orders matches with ranking_key. When only the best limit matches are needed they are picked with a heap (heapq.nsmallest)
+    instead of sorting every match
+
+    Input: matches - list of (word, distance) tuples, frequencies - FrequencyTable of the dictionary or None, limit - number of
+    matches to keep (all if not given)
+    Return: suggestions - list of dictionaries with keys 'word' and 'distance' in ranked order
+    '''
+    key = ranking_key(frequencies)
+    if limit is None or limit >= len(matches):
+        ranked = sorted(matches, key=key)
+    else:
+        ranked = heapq.nsmallest(limit, matches, key=key)
+    return [{'word': candidate, 'distance': dist} for candidate, dist in ranked]
+
+def iter_ranked(matches:list[tuple], frequencies=None):
+    '''
+    Lazy version of rank_matches for suggestions that are shown a page at a time. The matches are put in a heap (heapq.heapify
+    takes linear time) and popped one at a time as they are used, so only the suggestions that are shown are ordered
+
+    Input: matches - list of (word, distance) tuples, frequencies - FrequencyTable of the dictionary or None
+    Return: iterator of dictionaries with keys 'word' and 'distance' in ranked order
+    '''
+    key = ranking_key(frequencies)
+    heap = [(key(match), match) for match in matches] # keys hold the word, so two entries are never equal
+    heapq.heapify(heap)
+    while heap:
+        candidate, dist = heapq.heappop(heap)[1]
+        yield {'word': candidate, 'distance': dist}
@@ -0,0 +1,144 @@
+'''
+SymSpell Index
+
+This SymSpellIndex class is a symmetric delete index used to look up word suggestions. For every dictionary word, all strings that
+can be made by deleting up to max_distance letters from the start of the word (its prefix) are precomputed and mapped back to the
+word. A misspelled word is looked up by generating its own deletes, so only words sharing a delete with it have to be compared
+with the edit distance function instead of the whole dictionary.
+
+This class has the following methods
+    - add: precomputes the deletes of a word and adds them to the index
+    - search: returns every word within a given distance of a word along with that distance
+    - searchTiers: returns the same words one distance at a time, looking up more deletes only when the next distance is needed
+    - getSize: returns the number of words in the index
+    - maxDistance: returns the largest distance the index can answer searches for
+'''
+
+def delete_levels(word:str, max_distance:int):
+    '''
+    Generates the strings that can be made by deleting letters from word one number of deletes at a time, so a search can stop
+    before generating the deletes it does not need
+
+    Input: word - word to delete letters from, max_distance - max number of letters to delete
+    Return: iterator of sets, the first holding word itself and then the new deletes made with one more letter deleted
+    '''
+    deletes = {word}
+    current_deletes = {word}
+    yield current_deletes
+    for _ in range(max_distance):
+        next_deletes = set()
+        for item in current_deletes:
+            # one letter words are deleted to the empty string too, so words no longer than the distance can still be matched
+            if not item:
+                continue
+            for i in range(len(item)):
+                next_deletes.add(item[:i] + item[i + 1:])
+        next_deletes -= deletes
+        deletes |= next_deletes
+        current_deletes = next_deletes
+        yield current_deletes
+
+def generate_deletes(word:str, max_distance:int) -> set:
+    '''
+    Generates every string that can be made by deleting at most max_distance letters from word (including word itself)
+
+    Input: word - word to delete letters from, max_distance - max number of letters to delete
+    Return: deletes - set of all deletes
+    '''
+    return set().union(*delete_levels(word, max_distance))
+
+
+class SymSpellIndex():
+    '''
+    An instance of this class represents a symmetric delete index of words. distance_function(word1, word2, max_distance) is used
+    to verify candidates and only needs to be exact for distances up to max_distance
+    '''
+    def __init__(self, distance_function, words=(), max_distance:int=3, prefix_length:int=7):
+        self.__distance = distance_function
+        self.__max_distance = max_distance
+        self.__prefix_length = prefix_length
+        self.__deletes = {} # delete -> word, or list of words when more than one word has the same delete
+        self.__words = set()
+        for word in words:
+            self.add(word)
+
+    def add(self, word:str):
+        '''
+        Adds a word to the index by precomputing the deletes of its prefix
+        Input: word - word to add
+        Return: None
+        '''
+        if word in self.__words:
+            return
+        self.__words.add(word)
+        for delete in generate_deletes(word[:self.__prefix_length], self.__max_distance):
+            entry = self.__deletes.get(delete)
+            if entry is None:
+                self.__deletes[delete] = word # most deletes only belong to one word, so avoid creating a list
+            elif type(entry) is str:
+                self.__deletes[delete] = [entry, word]
+            else:
+                entry.append(word)
+
+    def search(self, word:str, max_distance:int) -> list[tuple]:
+        '''
+        Finds all words in the index that are at most max_distance edits away from word. Candidates are found through shared
+        deletes and then verified with the distance function
+
+        Input: word - word to search for, max_distance - search radius (capped to the max distance of the index)
+        Return: matches - list of (word, distance) tuples in no particular order
+        '''
+        max_distance = min(max_distance, self.__max_distance)
+        return next(self.searchTiers(word, max_distance, max_distance))
+
+    def searchTiers(self, word:str, max_distance:int, first_tier:int=1):
+        '''
+        Finds the words within max_distance edits of word one distance tier at a time. A word within d edits shares a delete made
+        with at most d deletes, so tier t only looks up the deletes of word made with t deletes. Candidates are verified once, up to
+        max_distance, and the ones further away than the current tier are kept for later tiers
+
+        Input: word - word to search for, max_distance - search radius (capped to the max distance of the index), first_tier -
+        distance of the first tier
+        Return: iterator of lists of (word, distance) tuples, the first with every match within first_tier and then one list for each
+        distance up to max_distance
+        '''
+        max_distance = min(max_distance, self.__max_distance)
+        first_tier = min(first_tier, max_distance)
+        found = [[] for _ in range(max_distance + 1)] # matches by distance
+        checked = set()
+        for tier, deletes in enumerate(delete_levels(word[:self.__prefix_length], max_distance)):
+            for delete in deletes:
+                entry = self.__deletes.get(delete)
+                if entry is None:
+                    continue
+                if type(entry) is str:
+                    entry = (entry,)
+                for candidate in entry:
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    if abs(len(candidate) - len(word)) > max_distance:
+                        continue
+                    distance = self.__distance(word, candidate, max_distance)
+                    if distance <= max_distance:
+                        found[distance].append((candidate, distance))
+            if tier == first_tier:
+                yield [match for distance in range(tier + 1) for match in found[distance]]
+            elif tier > first_tier:
+                yield found[tier]
+
+    def getSize(self):
+        '''
+        Getter function for the number of words in the index
+        Input: N/A
+        Return: int - size of index
+        '''
+        return len(self.__words)
+
+    def maxDistance(self):
+        '''
+        Getter function for the largest distance the index was built for
+        Input: N/A
+        Return: int - max distance
+        '''
+        return self.__max_distance
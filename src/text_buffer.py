@@ -0,0 +1,158 @@
+'''
+Text Buffer
+
+This TextBuffer class is a piece table used to edit the user's text. Instead of building a new copy of the whole text for every
+replacement, the text is kept as a list of pieces that each point to a part of the original text or of a replacement word. A
+replacement only splits the pieces at the start and end of the replaced range and swaps the pieces in between for one new piece,
+and the full string is only built (and then cached until the next edit) when it is needed for printing or saving.
+
+This class has the following methods
+    - replace: replaces a range of the text with new text and returns how much the length of the text changed
+    - replaceAll: replaces many ranges of the text with the same new text in one pass (eg. every occurance of a word)
+    - copy: returns a new buffer with the same text that can be edited separately
+'''
+from bisect import bisect_right
+
+class TextBuffer():
+    '''
+    An instance of this class represents an editable piece table of text
+    '''
+    def __init__(self, text:str=''):
+        self.__pieces = [] # (source string, start, end) for each piece of the text in order
+        self.__starts = [] # offset in the text where each piece starts
+        if len(text) > 0:
+            self.__pieces.append((text, 0, len(text)))
+            self.__starts.append(0)
+        self.__length = len(text)
+        self.__text = text # cached full text, None after an edit until it is built again
+
+    def __len__(self):
+        return self.__length
+
+    def __str__(self):
+        if self.__text is None:
+            self.__text = ''.join(source[start:end] for source, start, end in self.__pieces)
+        return self.__text
+
+    def __getitem__(self, key):
+        '''
+        Returns a character (int key) without building the full text, or a substring (slice key)
+        '''
+        if isinstance(key, slice):
+            return str(self)[key]
+        if key < 0:
+            key += self.__length
+        if not 0 <= key < self.__length:
+            raise IndexError("TextBuffer index out of range")
+        index = bisect_right(self.__starts, key) - 1
+        source, start, _ = self.__pieces[index]
+        return source[start + key - self.__starts[index]]
+
+    def __split(self, position:int) -> int:
+        '''
+        Makes sure a piece starts at position by splitting the piece that contains it
+        Input: position - offset in the text
+        Return: index of the piece that starts at position (number of pieces if position is the end of the text)
+        '''
+        if position == self.__length:
+            return len(self.__pieces)
+        index = bisect_right(self.__starts, position) - 1
+        if self.__starts[index] == position:
+            return index
+        source, start, end = self.__pieces[index]
+        cut = start + position - self.__starts[index]
+        self.__pieces[index] = (source, start, cut)
+        self.__pieces.insert(index + 1, (source, cut, end))
+        self.__starts.insert(index + 1, position)
+        return index + 1
+
+    def replace(self, start:int, end:int, text:str) -> int:
+        '''
+        Replaces the text from start to end with new text. Throws an exception if the range is not in the text
+
+        Input: start - start index of range to replace, end - end index of range, text - text to put in its place
+        Return: delta - change in length of the text (offsets at or after end move by delta)
+        '''
+        assert 0 <= start <= end <= self.__length
+        first = self.__split(start)
+        last = self.__split(end)
+        delta = len(text) - (end - start)
+
+        if len(text) > 0:
+            self.__pieces[first:last] = [(text, 0, len(text))]
+            self.__starts[first:last] = [start]
+            first += 1
+        else:
+            del self.__pieces[first:last]
+            del self.__starts[first:last]
+        if delta != 0:
+            for index in range(first, len(self.__starts)):
+                self.__starts[index] += delta
+
+        self.__length += delta
+        self.__text = None
+        return delta
+
+    def __piecesBetween(self, start:int, end:int) -> list:
+        '''
+        Finds the pieces that make up a range of the text without changing the buffer
+        Input: start - start index of range, end - end index of range
+        Return: list of (source string, start, end) pieces, the first and last cut to the range
+        '''
+        pieces = []
+        if start >= end:
+            return pieces
+        index = bisect_right(self.__starts, start) - 1
+        while start < end:
+            source, piece_start, piece_end = self.__pieces[index]
+            cut_start = piece_start + start - self.__starts[index]
+            cut_end = min(piece_end, piece_start + end - self.__starts[index])
+            pieces.append((source, cut_start, cut_end))
+            start += cut_end - cut_start
+            index += 1
+        return pieces
+
+    def replaceAll(self, ranges:list[tuple[int, int]], text:str) -> list[tuple[int, int]]:
+        '''
+        Replaces every range with the same new text. The pieces are rebuilt once instead of once per range, so replacing k ranges
+        takes one pass over the pieces instead of k. Throws an exception if the ranges overlap or are not in the text
+
+        Input: ranges - (start, end) ranges in the current text, text - text to put in place of each range
+        Return: edits - (start, end, delta) for each range in text order, start and end being in the text before the edit (see
+        spell_checker.recheck_ranges)
+        '''
+        pieces = []
+        edits = []
+        position = 0
+        for start, end in sorted(ranges):
+            assert position <= start <= end <= self.__length
+            pieces.extend(self.__piecesBetween(position, start))
+            if len(text) > 0:
+                pieces.append((text, 0, len(text)))
+            edits.append((start, end, len(text) - (end - start)))
+            position = end
+        pieces.extend(self.__piecesBetween(position, self.__length))
+
+        starts = []
+        length = 0
+        for source, start, end in pieces:
+            starts.append(length)
+            length += end - start
+        self.__pieces = pieces
+        self.__starts = starts
+        self.__length = length
+        self.__text = None
+        return edits
+
+    def copy(self):
+        '''
+        Creates a new buffer with the same text. Pieces only point to strings, so the text itself is not copied
+        Input: N/A
+        Return: TextBuffer
+        '''
+        new_buffer = TextBuffer()
+        new_buffer.__pieces = list(self.__pieces)
+        new_buffer.__starts = list(self.__starts)
+        new_buffer.__length = self.__length
+        new_buffer.__text = self.__text
+        return new_buffer
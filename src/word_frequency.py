@@ -0,0 +1,140 @@
+'''
+Word Frequency
+
+This file contains functions for loading an optional word frequency table for a dictionary and the FrequencyTable class that
+stores it. The table is a text file beside the dictionary with the same name and the ending .freq (eg. words_alpha.freq for
+words_alpha.txt) holding one word and how often it is used per line:
+
+    the 23135851162
+    of 13151942776
+
+When a table is loaded, suggestions at the same edit distance are ranked by how common they are instead of alphabetically, so the
+word the user meant is usually on the first page. Words missing from the table count as 0.
+
+For a CompiledDictionary the counts are stored in an array of unsigned 32 bit integers parallel to the words of the compiled file
+(the count of the word at indexOf(word) is at the same index), which costs 4 bytes per dictionary word. The compiled file holds a
+copy of that array made when it was compiled (see compiled_dictionary.py, which compiles again when the frequency file is newer), so
+the frequency file is not read at all when the program starts. Other dictionaries have no word index, so their counts are kept in a
+dictionary of word -> count.
+
+The FrequencyTable class has the following methods
+    - setCount: sets the count of a dictionary word
+    - getCount: returns the count of a word
+    - load: reads counts from a frequency file
+'''
+import os
+from array import array
+
+FREQUENCY_ENDING = '.freq'
+MAX_COUNT = 0xFFFFFFFF # counts are stored as unsigned 32 bit integers
+
+
+def frequency_file_name(dictionary_name:str) -> str:
+    '''
+    Returns the name of the frequency file for a dictionary text file
+
+    Input: dictionary_name - path to dictionary text file
+    Return: path to frequency file (stored beside the text file)
+    '''
+    return os.path.splitext(dictionary_name)[0] + FREQUENCY_ENDING
+
+def read_counts(file_name:str):
+    '''
+    Reads the counts of a frequency file, skipping lines that do not hold a word and a whole number
+
+    Input: file_name - frequency file to read
+    Return: generator of (casefolded word, count) tuples in file order
+    '''
+    with open(file_name, 'r', encoding='utf-8') as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) != 2 or not parts[1].isdigit():
+                continue
+            yield parts[0].casefold(), int(parts[1])
+
+def load_frequency_table(dictionary, dictionary_name:str):
+    '''
+    Loads the frequency file of a dictionary if there is one. The counts stored in a compiled dictionary are used instead of reading
+    the file when it has them
+
+    Input: dictionary - loaded dictionary, dictionary_name - path to dictionary text file
+    Return: FrequencyTable, None if the dictionary has no frequency file
+    '''
+    file_name = frequency_file_name(dictionary_name)
+    if not os.path.exists(file_name):
+        return None
+    stored_counts = dictionary.getCounts() if hasattr(dictionary, 'getCounts') else None
+    table = FrequencyTable(dictionary, stored_counts)
+    if stored_counts is None:
+        table.load(file_name)
+    return table
+
+
+class FrequencyTable():
+    '''
+    An instance of this class represents the usage counts of the words of one dictionary. counts is an array of counts parallel to
+    the words of a compiled dictionary to start from (eg. the one stored in its file), which is copied so it can be changed
+    '''
+    def __init__(self, dictionary, counts=None):
+        self.__dictionary = dictionary
+        if counts is not None:
+            self.__counts = array('I')
+            self.__counts.frombytes(counts.tobytes())
+        elif hasattr(dictionary, 'indexOf'):
+            self.__counts = array('I', bytes(4 * dictionary.wordCount())) # all 0
+        else:
+            self.__counts = {}
+
+    def setCount(self, word:str, count:int) -> bool:
+        '''
+        Sets the count of a word. Words that are not in the dictionary are ignored
+        Input: word - dictionary word, count - number of times the word is used
+        Return: True if the count was stored
+        '''
+        count = min(max(count, 0), MAX_COUNT)
+        if isinstance(self.__counts, dict):
+            if word not in self.__dictionary:
+                return False
+            self.__counts[word] = count
+            return True
+        index = self.__dictionary.indexOf(word)
+        if index < 0:
+            return False
+        self.__counts[index] = count
+        return True
+
+    def getCount(self, word:str) -> int:
+        '''
+        Getter function for the count of a word
+        Input: word - word to find count of
+        Return: count, 0 if the word has no count
+        '''
+        if isinstance(self.__counts, dict):
+            return self.__counts.get(word, 0)
+        index = self.__dictionary.indexOf(word)
+        return self.__counts[index] if index >= 0 else 0
+
+    def load(self, file_name:str) -> int:
+        '''
+        Reads counts from a frequency file. Counts of words that only differ in case are added together and lines that do not hold
+        a word and a whole number are skipped
+
+        Input: file_name - frequency file to read
+        Return: number of counts stored
+        '''
+        stored = 0
+        counts = self.__counts
+        if isinstance(counts, dict):
+            for word, count in read_counts(file_name):
+                if word in self.__dictionary:
+                    counts[word] = min(counts.get(word, 0) + count, MAX_COUNT)
+                    stored += 1
+            return stored
+        # one lookup per line, the count is added where the word's index points
+        index_of = self.__dictionary.indexOf
+        for word, count in read_counts(file_name):
+            index = index_of(word)
+            if index >= 0:
+                counts[index] = min(counts[index] + count, MAX_COUNT)
+                stored += 1
+        return stored
@@ -3,14 +3,15 @@ Word List
 Hilda Ajakpovi
 
 This WordList class is used to store a list of misspelled words. It contains properties such as items - a list of the actual items 
-that eventually becomes a list of dicts, current - an int that stores the index item in the list that the user is currently viewing
-as the current word, size - an int that stores the number of words in the list (allows for duplicates)
+that eventually becomes a list of Misspelling records, current - an int that stores the index item in the list that the user is
+currently viewing as the current word, size - an int that stores the number of words in the list (allows for duplicates)
 
 This class has the following methods
     - add: adds a dictionary with keys 'word' - str of the actual misspelled word, 'start' - the start index of the word from original
             text, 'end' - the end index of the word from the original text, 'suggestions' - a list suggested correctly spelt words based
             on the misspelled word from the given dictionary
     - append: same as add but instead adds the dictionary to the end of the list
+    - insert: same as add but instead adds the dictionary at the position that keeps the list sorted by start index
     - goLeft: increments the current property and wraps around to beggining of list if current is set to the last element
     - goRight decrements the current property and wraps around to the end of the list if current is set to the first element
     - delete: removes item at a specified index or the item at current index if no index is given
@@ -23,10 +24,50 @@ This class has the following methods
     - createSet: creates and returns a set representaion of items in the list
     - findItem: finds and returns the first instance of an item in the list whose key 'word' has a value that matches the given value
     - removeAllItems: removes all items in the list whose 'word' key has a value that matches the given value
-    - updateSuggestions: adds suggested words as value for 'suggestions' key for a value item in the list
+    - deleteItems: removes the items at several indexes in a single pass
+    - updateSuggestions: adds suggested words to the 'suggestions' list shared by every occurance of a word
     - getIndex: returns the index of the first occurance of an item whose 'word' key has a value that matches the given value
+    - getOccurrences: returns all items whose 'word' key has a value that matches the given value, in list order
+    - getWordCounts: returns the number of occurances of every unique misspelled word
+    - shiftOffsets: moves the start and end of every item at or after a position in the text (used after the text is edited)
+    - remapOffsets: same as shiftOffsets for many edits made at once, in one pass over the items
     - getItems: returns the list of items
+
+Each item is a Misspelling record. Records use __slots__ instead of a dict per word and can still be read and changed like the
+dicts used before (item['word']). Suggestions are stored once per unique casefolded word and every record of that word refers to
+the same list, so occurrences of a word do not each keep their own copy. The list also keeps a mapping from each casefolded word to
+its records so finding, removing and updating a word depends on the number of occurances of that word instead of the list size.
+Items are kept in text order, so the index of a record is found with a binary search on its start instead of scanning the list.
 '''
+from bisect import bisect_left, bisect_right
+
+class Misspelling():
+    '''
+    An instance of this class represents one occurance of a misspelled word
+    '''
+    __slots__ = ('word', 'start', 'end', 'og_index', 'suggestions')
+
+    def __init__(self, word:str, start:int, end:int, og_index:int, suggestions:list):
+        self.word = word
+        self.start = start
+        self.end = end
+        self.og_index = og_index
+        self.suggestions = suggestions # shared with every other occurance of the same word
+
+    def __getitem__(self, key:str):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __setitem__(self, key:str, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __repr__(self):
+        return f"Misspelling(word={self.word!r}, start={self.start}, end={self.end}, og_index={self.og_index})"
+
 class WordList():
     '''
     An instance of this class represents a blackbox circular list of words 
@@ -35,6 +76,8 @@ class WordList():
         self.__items = []
         self.__current = 0 # Index of active node
         self.__size = 0
+        self.__suggestions = {} # casefolded word -> list of suggestions shared by all occurances of the word
+        self.__occurrences = {} # casefolded word -> list of records of that word in list order
         
     def add(self, item, start, end):
         '''
@@ -42,14 +85,13 @@ class WordList():
         Input: item - data that will go into the new node
         Return: None
         '''
-        word_info = {
-            'word': item,
-            'start': start,
-            'end': end,
-            'suggestions': []
-        }
+        word_info = Misspelling(item, start, end, None, self.__sharedSuggestions(item))
         self.__size += 1  
         self.__items.insert(self.__current, word_info)
+        # keep occurrences in list order by counting the occurances of the word that come before the new item
+        occurrences = self.__occurrences.setdefault(item.casefold().strip(), [])
+        position = sum(1 for occurrence in occurrences if self.__position(occurrence) < self.__current)
+        occurrences.insert(position, word_info)
 
     def append(self, item, start, end, index):
         '''
@@ -57,16 +99,40 @@ class WordList():
         Input: item - data that will go inside new node
         Return: None
         '''
-        word_info = {
-            'word': item,
-            'start': start,
-            'end': end,
-            'og_index': index,
-            'suggestions': []
-        }
+        word_info = Misspelling(item, start, end, index, self.__sharedSuggestions(item))
         self.__size += 1  
         self.__items.append(word_info)
+        self.__occurrences.setdefault(item.casefold().strip(), []).append(word_info)
+
+
+    def insert(self, item, start, end, index):
+        '''
+        Responsible for adding a new node in the list before the first item that starts after it, so the list stays in the same
+        order as the words in the text. The current item stays the same
+        Input: item - data that will go inside new node
+        Return: None
+        '''
+        word_info = Misspelling(item, start, end, index, self.__sharedSuggestions(item))
+        position = bisect_right(self.__items, start, key=lambda list_item: list_item['start'])
+        if position <= self.__current and self.__size > 0:
+            self.__current += 1
+        self.__size += 1
+        self.__items.insert(position, word_info)
+        occurrences = self.__occurrences.setdefault(item.casefold().strip(), [])
+        occurrences.insert(bisect_right(occurrences, start, key=lambda list_item: list_item['start']), word_info)
 
+    def __sharedSuggestions(self, item:str) -> list:
+        '''
+        Finds the suggestion list shared by all occurances of a word, creating it for the first occurance
+        Input: item - misspelled word
+        Return: list of suggestions for the word
+        '''
+        key = item.casefold().strip()
+        suggestions = self.__suggestions.get(key)
+        if suggestions is None:
+            suggestions = []
+            self.__suggestions[key] = suggestions
+        return suggestions
 
     def goLeft(self):
         '''
@@ -97,8 +163,9 @@ class WordList():
         if index == None:
             index = self.__current
         try:
-            self.__items.pop(index)
+            word_info = self.__items.pop(index)
             self.__size -= 1
+            self.__removeOccurrence(word_info)
             if index <= self.__current:
                 self.goLeft() # without this, current goes to the item to the right of the deleted item
         except Exception as e:
@@ -183,10 +250,7 @@ class WordList():
         Input: N/A
         Return: word_set - set containg all the values in list
         '''
-        word_set = set()
-        for item in self.__items:
-            word_set.add(item['word'].casefold().strip())
-        return word_set
+        return set(self.__occurrences)
     
     def findItem(self, item):
         '''
@@ -195,31 +259,102 @@ class WordList():
         Input: item - item to find
         Return: dictionary associated to item, None if not found
         '''
-        item = next((i for i in self.__items if i["word"].lower() == item.lower()), None)
-        return item
+        occurrences = self.__occurrences.get(item.casefold().strip())
+        if occurrences is None:
+            return None
+        return occurrences[0]
     
     def removeAllItems(self, item):
         '''
-        Finds all instances of the item and removes them from list
+        Finds all instances of the item and removes them from list in a single pass
         
         Input: item to be removed
         Return: None
         '''
-        for index, list_item in enumerate(self.__items):
-            if item.lower() == list_item["word"].lower():
-                self.delete(index)
+        occurrences = self.__occurrences.pop(item.casefold().strip(), None)
+        if occurrences is None:
+            return
+        self.__removePositions(sorted(self.__position(word_info) for word_info in occurrences))
+
+    def deleteItems(self, indexes:list[int]):
+        '''
+        Removes the items at several indexes in a single pass, moving current the same as calling delete for each of them
+
+        Input: indexes - indexes of the items to remove
+        Return: None
+        '''
+        positions = sorted(set(indexes))
+        for position in positions:
+            self.__removeOccurrence(self.__items[position])
+        self.__removePositions(positions)
+
+    def __removePositions(self, positions:list[int]):
+        '''
+        Removes the items at sorted indexes from the list (not from the mapping of words to their records)
+        Input: positions - sorted indexes of the items to remove
+        Return: None
+        '''
+        if not positions:
+            return
+        # current moves left once for every removed item at or before it, the same as calling delete for each item
+        removed_before_current = bisect_right(positions, self.__current)
+        # copy the runs of items between the removed ones instead of visiting every item
+        remaining = []
+        previous = 0
+        for position in positions:
+            remaining.extend(self.__items[previous:position])
+            previous = position + 1
+        remaining.extend(self.__items[previous:])
+        self.__items = remaining
+        self.__size = len(remaining)
+        if self.__size == 0:
+            self.__current = 0
+        else:
+            self.__current = (self.__current - removed_before_current) % self.__size
+
+    def __position(self, word_info:Misspelling) -> int:
+        '''
+        Finds the index of a record in the list. Items are kept in text order (sorted by start), so the record is found with a binary
+        search on its start. A record that is not where the search expects it (eg. one placed out of order by add) is found by
+        checking every item instead
+        Input: word_info - record in the list
+        Return: index of the record
+        '''
+        position = bisect_left(self.__items, word_info['start'], key=lambda list_item: list_item['start'])
+        if position < len(self.__items) and self.__items[position] is word_info:
+            return position
+        return self.__items.index(word_info) # records are only equal to themselves, so this finds this exact record
+
+    def __removeOccurrence(self, word_info:Misspelling):
+        '''
+        Removes a record from the mapping of words to their records
+        Input: word_info - record that was removed from the list
+        Return: None
+        '''
+        key = word_info['word'].casefold().strip()
+        occurrences = self.__occurrences[key]
+        for position, occurrence in enumerate(occurrences):
+            if occurrence is word_info:
+                occurrences.pop(position)
+                break
+        if len(occurrences) == 0:
+            del self.__occurrences[key]
 
     def updateSuggestions(self, new_suggestions:list, item:str):
         '''
-        changes the suggestions for all items in the list that are the same word
+        adds suggestions for all items in the list that are the same word. All occurances share one list, which is filled a page at a
+        time, so suggested words that are already in it are skipped
         
         Input: new_suggestions - list of suggested words, item - word whose suggestions should be updated
         Return: None
         '''
-        for list_item in self.__items:
-            if item.lower() == list_item["word"].lower() and len(list_item['suggestions']) == 0:
-                for suggestion in new_suggestions:
-                    list_item['suggestions'].append(suggestion['word'])
+        suggestions = self.__suggestions.get(item.casefold().strip())
+        if suggestions is not None:
+            known = set(suggestions)
+            for suggestion in new_suggestions:
+                if suggestion['word'] not in known:
+                    known.add(suggestion['word'])
+                    suggestions.append(suggestion['word'])
 
     def getIndex(self, item:str):
         '''
@@ -228,9 +363,62 @@ class WordList():
         Input: item - item to find
         Return: index - index of item, None if not found
         '''
-        for index, list_item in enumerate(self.__items):
-            if list_item['word'].lower() == item.lower():
-                return index
+        word_info = self.findItem(item)
+        if word_info is None:
+            return None
+        return self.__position(word_info)
+
+    def getOccurrences(self, item:str) -> list:
+        '''
+        Finds all occurances of a word
+
+        Input: item - word to find
+        Return: list of records of the word in list order (empty if not found)
+        '''
+        return list(self.__occurrences.get(item.casefold().strip(), []))
+
+    def getWordCounts(self) -> dict:
+        '''
+        Counts the occurances of every unique misspelled word, so work that only depends on the word (eg. suggestions) can be done
+        once per word
+
+        Input: N/A
+        Return: dictionary of casefolded word -> number of occurances, in the order the words were first added
+        '''
+        return {word: len(occurrences) for word, occurrences in self.__occurrences.items()}
+
+    def shiftOffsets(self, position:int, delta:int):
+        '''
+        Updates the start and end of the items after an edit of the text so they still point at their words
+
+        Input: position - offset in the text where the edited range ended, delta - change in length of the text
+        Return: None
+        '''
+        self.remapOffsets([(position, delta)])
+
+    def remapOffsets(self, edits:list[tuple[int, int]]):
+        '''
+        Updates the start and end of the items after several edits of the text were made at once (eg. by TextBuffer.replaceAll).
+        Items are in text order, so the first moved item is found with a binary search and the items after it are moved in one
+        sweep by the total delta of the edits at or before their start
+
+        Input: edits - (position, delta) for each edit in text order, position being where the edited range ended in the text before
+        any of the edits and delta the change in length of the text
+        Return: None
+        '''
+        edits = [edit for edit in edits if edit[1] != 0]
+        if not edits:
+            return
+        first = bisect_left(self.__items, edits[0][0], key=lambda list_item: list_item.start)
+        shift = 0
+        next_edit = 0
+        for index in range(first, len(self.__items)):
+            list_item = self.__items[index]
+            while next_edit < len(edits) and edits[next_edit][0] <= list_item.start:
+                shift += edits[next_edit][1]
+                next_edit += 1
+            list_item.start += shift
+            list_item.end += shift
 
     def getItems(self):
         '''
@@ -0,0 +1,46 @@
+'''
+Test configuration
+
+The modules of the spell checker are imported by name from src (the program is run from that directory), so src is added to the
+import path for every test. The word lists shared by the suggestion search tests are fixtures here.
+'''
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from suggestions import edit_distance # imported after src is on the import path
+
+
+def random_word(rng:random.Random, letters:str, max_length:int) -> str:
+    return ''.join(rng.choice(letters) for _ in range(rng.randint(0, max_length)))
+
+@pytest.fixture(scope='session')
+def words() -> list[str]:
+    '''
+    Dictionary for the suggestion searches. A small alphabet makes many words close to each other, including transpositions and
+    words of one or two letters
+    '''
+    rng = random.Random(1)
+    return sorted({random_word(rng, 'abcde', 8) for _ in range(1500)} - {''})
+
+@pytest.fixture(scope='session')
+def queries() -> list[str]:
+    '''
+    Words to search for, including letters that are not in the dictionary and the empty word
+    '''
+    rng = random.Random(2)
+    return [random_word(rng, 'abcdef', 9) for _ in range(60)] + ['', 'a', 'ba', 'abcdeabcde']
+
+@pytest.fixture(scope='session')
+def expected_matches(words):
+    '''
+    Finds the matches every search must return by comparing the word against every dictionary word with edit_distance
+    '''
+    def find(word:str, max_distance:int) -> list[tuple]:
+        matches = [(candidate, edit_distance(word, candidate)) for candidate in words]
+        return sorted(match for match in matches if match[1] <= max_distance)
+    return find
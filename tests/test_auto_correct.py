@@ -0,0 +1,49 @@
+'''
+Checks that auto correcting a text replaces the misspelled words with close suggestions in one pass and keeps the start and end of
+the words that are not corrected pointing at them in the corrected text
+'''
+from auto_correct import apply_corrections, auto_correct, choose_corrections
+from spell_checker import spell_check_words
+from suggestion_engine import SuggestionEngine
+
+DICTIONARY = {'the', 'cat', 'sat', 'on', 'a', 'mat', 'and', 'dog'}
+
+
+def words_at_offsets(text:str, mispelled_words) -> list[str]:
+    return [text[item['start']:item['end']] for item in mispelled_words.getItems()]
+
+def test_choose_corrections_skips_distant_words():
+    text = 'teh cat sat on teh mta xyzzy'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    corrections = choose_corrections(SuggestionEngine(set(DICTIONARY)), mispelled_words, max_distance=1)
+    assert corrections == {'teh': 'the', 'mta': 'mat'}
+
+def test_apply_corrections_replaces_every_occurance():
+    text = 'Teh cat sat on teh mat'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    corrected, applied = apply_corrections(text, mispelled_words, {'teh': 'the'})
+    assert corrected == 'The cat sat on the mat'
+    assert [(item['start'], item['end'], item['replacement']) for item in applied] == [(0, 3, 'The'), (15, 18, 'the')]
+    assert mispelled_words.getItems() == []
+
+def test_apply_corrections_moves_remaining_words():
+    # the replacements change the length of the text before the words that are left
+    text = 'tthe zz cta qq dgo zz'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    corrected, _ = apply_corrections(text, mispelled_words, {'tthe': 'the', 'cta': 'cat', 'dgo': 'and dog'})
+    assert corrected == 'the zz cat qq and dog zz'
+    assert [item['word'] for item in mispelled_words.getItems()] == ['zz', 'qq', 'zz']
+    assert words_at_offsets(corrected, mispelled_words) == ['zz', 'qq', 'zz']
+
+def test_apply_corrections_without_corrections():
+    text = 'zz cta'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    corrected, applied = apply_corrections(text, mispelled_words, {})
+    assert (corrected, applied) == (text, [])
+    assert words_at_offsets(corrected, mispelled_words) == ['zz', 'cta']
+
+def test_auto_correct_matches_full_check():
+    text = 'Teh dgo sat on teh mta, xyzzy'
+    corrected, _ = auto_correct(SuggestionEngine(set(DICTIONARY)), text)
+    assert corrected == 'The dog sat on the mat, xyzzy'
+    assert words_at_offsets(corrected, spell_check_words(DICTIONARY, corrected)) == ['xyzzy']
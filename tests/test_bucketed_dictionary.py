@@ -0,0 +1,34 @@
+'''
+Checks that the length buckets of BucketedDictionary hold every word and that brute force search over them finds the same words as
+comparing the word against every dictionary word with edit_distance
+'''
+import pytest
+
+from bucketed_dictionary import BucketedDictionary
+from suggestions import brute_force_search, candidate_words
+
+DISTANCES = (1, 2, 3)
+
+
+def test_words_of_length(words):
+    dictionary = BucketedDictionary(words)
+    assert len(dictionary) == len(words) and sorted(dictionary) == words
+    for length in range(10):
+        assert sorted(dictionary.wordsOfLength(length)) == [word for word in words if len(word) == length]
+    dictionary.add('abcdeabcde')
+    dictionary.add(words[0])
+    assert len(dictionary) == len(words) + 1 and 'abcdeabcde' in dictionary.wordsOfLength(10)
+
+def test_candidate_words_only_visit_close_lengths(words):
+    dictionary = BucketedDictionary(words)
+    for min_dist in (0, 1, 2):
+        candidates = sorted(candidate_words(dictionary, 'abcd', 2, min_dist))
+        assert candidates == sorted(candidate_words(set(words), 'abcd', 2, min_dist))
+        assert candidates == sorted(word for word in words if min_dist <= abs(len(word) - 4) <= 2)
+
+@pytest.mark.parametrize('bucketed', [False, True])
+def test_brute_force_search(words, queries, bucketed, expected_matches):
+    dictionary = BucketedDictionary(words) if bucketed else set(words)
+    for word in queries:
+        for max_distance in DISTANCES:
+            assert sorted(brute_force_search(dictionary, word, max_distance)) == expected_matches(word, max_distance)
@@ -0,0 +1,80 @@
+'''
+Checks that a compiled dictionary holds the same words as its text file and that the DAWG graph stored in it finds the same
+suggestions as a graph built from the words
+'''
+import os
+import random
+
+import pytest
+
+import compiled_dictionary
+from compiled_dictionary import CompiledDictionary, compile_dictionary, load_compiled_dictionary
+from dawg import DawgIndex
+from suggestions import bounded_edit_distance
+
+WORDS = ['a', 'i', 'an', 'cat', 'cart', 'care', 'dog', 'door', 'über', 'naïve', 'straße', 'hello', 'help', 'world']
+
+
+def write_words(path, words:list[str]) -> str:
+    path.write_text('\n'.join(words) + '\n', encoding='utf-8')
+    return str(path)
+
+@pytest.fixture
+def dictionary(tmp_path):
+    compiled = load_compiled_dictionary(write_words(tmp_path / 'words.txt', WORDS))
+    yield compiled
+    compiled.close()
+
+def test_membership_and_index(dictionary):
+    assert len(dictionary) == dictionary.wordCount() == len(WORDS)
+    for word in WORDS:
+        assert word in dictionary
+    for word in ('', 'b', 'ca', 'cats', 'Cat', 'hellos', 'straßee', 'x' * 50):
+        assert word not in dictionary and dictionary.indexOf(word) == -1
+    # positions go from 0 to wordCount() - 1, shortest words first
+    positions = sorted((dictionary.indexOf(word), word) for word in WORDS)
+    assert [position for position, _ in positions] == list(range(len(WORDS)))
+    assert [len(word) for _, word in positions] == sorted(len(word) for word in WORDS)
+    assert sorted(dictionary) == sorted(WORDS)
+
+def test_words_of_length_and_added_words(dictionary):
+    assert sorted(dictionary.wordsOfLength(4)) == ['care', 'cart', 'door', 'help', 'über']
+    dictionary.add('cant')
+    dictionary.add('cat')
+    assert 'cant' in dictionary and dictionary.indexOf('cant') == -1
+    assert dictionary.getAddedWords() == ['cant'] and len(dictionary) == len(WORDS) + 1
+    assert 'cant' in dictionary.wordsOfLength(4)
+
+def test_many_words(tmp_path):
+    rng = random.Random(0)
+    words = sorted({''.join(rng.choice('abcdefgh') for _ in range(rng.randint(1, 9))) for _ in range(3000)})
+    compiled = load_compiled_dictionary(write_words(tmp_path / 'words.txt', words))
+    assert all(word in compiled for word in words)
+    assert sum(1 for _ in range(2000) if ''.join(rng.choice('abcdefgh') for _ in range(10)) in compiled) == 0
+    compiled.close()
+
+def test_empty_dictionary(tmp_path):
+    compiled = load_compiled_dictionary(write_words(tmp_path / 'words.txt', []))
+    assert len(compiled) == 0 and 'a' not in compiled and compiled.wordsOfLength(1) == []
+    compiled.close()
+
+def test_incompatible_file_is_compiled_again(tmp_path, monkeypatch):
+    name = write_words(tmp_path / 'words.txt', WORDS)
+    monkeypatch.setattr(compiled_dictionary, 'VERSION', compiled_dictionary.VERSION + 1)
+    compile_dictionary(name)
+    monkeypatch.undo()
+    with pytest.raises(ValueError):
+        CompiledDictionary(compiled_dictionary.compiled_file_name(name))
+    # the compiled file is newer than the text file, but it was written by another version
+    assert os.path.getmtime(compiled_dictionary.compiled_file_name(name)) >= os.path.getmtime(name)
+    compiled = load_compiled_dictionary(name)
+    assert 'cat' in compiled
+    compiled.close()
+
+@pytest.mark.parametrize('word', ['cat', 'cta', 'helo', 'uber', 'strasse', 'a', 'wrold', 'doro'])
+def test_stored_graph_matches_built_graph(dictionary, word):
+    stored = DawgIndex(bounded_edit_distance, graph=dictionary.getDawg())
+    built = DawgIndex(bounded_edit_distance, WORDS)
+    assert stored.getNodeCount() == built.getNodeCount() and stored.getSize() == built.getSize()
+    for max_distance in (1, 2, 3):
+        assert sorted(stored.search(word, max_distance)) == sorted(built.search(word, max_distance))
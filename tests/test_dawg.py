@@ -0,0 +1,19 @@
+'''
+Checks that searching the DAWG finds exactly the words that comparing the word against every dictionary word with edit_distance
+finds, for each distance the program uses, including words added after the graph was built
+'''
+from dawg import DawgIndex
+from suggestions import bounded_edit_distance
+
+DISTANCES = (1, 2, 3)
+
+
+def test_dawg_search(words, queries, expected_matches):
+    # words added after the graph is built are searched separately
+    index = DawgIndex(bounded_edit_distance, words[:-100])
+    for word in words[-100:]:
+        index.add(word)
+    assert index.getSize() == len(words)
+    for word in queries:
+        for max_distance in DISTANCES:
+            assert sorted(index.search(word, max_distance)) == expected_matches(word, max_distance)
@@ -0,0 +1,36 @@
+'''
+Checks the faster edit distance functions against edit_distance, the full Damerau-Levenshtein (optimal string alignment) table
+'''
+import pytest
+
+import suggestions
+from suggestions import batch_edit_distance, bounded_edit_distance, edit_distance
+
+DISTANCES = (1, 2, 3)
+
+
+def test_bounded_edit_distance(words, queries):
+    for word in queries:
+        for candidate in words[::7]:
+            distance = edit_distance(word, candidate)
+            for max_distance in DISTANCES:
+                assert bounded_edit_distance(word, candidate, max_distance) == min(distance, max_distance + 1)
+
+def test_bounded_edit_distance_examples():
+    assert bounded_edit_distance('teh', 'the', 1) == 1 # transposition
+    assert bounded_edit_distance('', 'abc', 2) == 3
+    assert bounded_edit_distance('kitten', 'sitting', 5) == 3
+    # words whose lengths differ by more than max_distance are not compared
+    assert bounded_edit_distance('a', 'abcdef', 2) == 3
+
+def test_batch_edit_distance(words, queries):
+    if suggestions.numpy is None:
+        pytest.skip('numpy is not installed')
+    for word in queries:
+        assert batch_edit_distance(word, words) == [edit_distance(word, candidate) for candidate in words]
+
+def test_batch_edit_distance_without_candidates():
+    if suggestions.numpy is None:
+        pytest.skip('numpy is not installed')
+    assert batch_edit_distance('word', []) == []
+    assert batch_edit_distance('', ['', 'a', 'ab']) == [0, 1, 2]
@@ -0,0 +1,21 @@
+'''
+Checks that searching the dictionary on several worker processes finds the same words as comparing the word against every
+dictionary word with edit_distance, sorted by distance
+'''
+from bucketed_dictionary import BucketedDictionary
+from parallel_search import ParallelSearch
+from suggestions import brute_force_search
+
+DISTANCES = (1, 2, 3)
+
+
+def test_parallel_search(words, queries, expected_matches):
+    search = ParallelSearch(brute_force_search, BucketedDictionary(words), workers=2, min_words=0)
+    try:
+        for word in queries[:10]:
+            for max_distance in DISTANCES:
+                matches = search.search(word, max_distance)
+                assert matches == sorted(matches, key=lambda match: (match[1], match[0]))
+                assert sorted(matches) == expected_matches(word, max_distance)
+    finally:
+        search.close()
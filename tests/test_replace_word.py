@@ -0,0 +1,68 @@
+'''
+Checks that replacing misspelled words through the menu edits the text, keeps the start and end of the remaining misspelled words
+pointing at them and flags misspelled words in the replacement
+'''
+import builtins
+
+import pytest
+
+from selection_of_word import replace_word
+from spell_checker import spell_check_words
+from text_buffer import TextBuffer
+
+DICTIONARY = {'the', 'cat', 'sat', 'on', 'a', 'mat'}
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    '''
+    Answers the prompts of replace_word in order
+    '''
+    queue = []
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': queue.pop(0))
+    return queue
+
+def words_at_offsets(text:str, mispelled_words) -> list[str]:
+    return [text[item['start']:item['end']] for item in mispelled_words.getItems()]
+
+def test_replace_all_occurances(answers):
+    text = 'teh cta sat on teh mta and teh cta'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    answers.extend(['y', 'y'])
+    new_text = replace_word(mispelled_words.getInfo(), mispelled_words, TextBuffer(text), 's', DICTIONARY, new_word='the')
+    assert str(new_text) == 'the cta sat on the mta and the cta'
+    assert [item['word'] for item in mispelled_words.getItems()] == ['cta', 'mta', 'and', 'cta']
+    assert words_at_offsets(str(new_text), mispelled_words) == ['cta', 'mta', 'and', 'cta']
+
+def test_replace_all_with_longer_word(answers):
+    text = 'zz teh zz mta zz'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    answers.extend(['y', 'y'])
+    new_text = replace_word(mispelled_words.getInfo(), mispelled_words, TextBuffer(text), 's', DICTIONARY, new_word='cat')
+    assert str(new_text) == 'cat teh cat mta cat'
+    assert words_at_offsets(str(new_text), mispelled_words) == ['teh', 'mta']
+
+def test_unsaved_replacement_keeps_text(answers):
+    text = 'teh cta'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    answers.extend(['y', 'n'])
+    user_input = TextBuffer(text)
+    assert replace_word(mispelled_words.getInfo(), mispelled_words, user_input, 's', DICTIONARY, new_word='the') is user_input
+    assert str(user_input) == text
+
+def test_typed_replacement_is_checked(answers):
+    text = 'the zz sat on a mat'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    answers.extend(['n', 'y'])
+    new_text = replace_word(mispelled_words.getInfo(), mispelled_words, TextBuffer(text), 'c', DICTIONARY, new_word='cat teh')
+    assert str(new_text) == 'the cat teh sat on a mat'
+    assert words_at_offsets(str(new_text), mispelled_words) == ['teh']
+
+def test_replace_all_matches_full_check(answers):
+    text = 'zz teh zz-cat mta zz, zz'
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    answers.extend(['y', 'y'])
+    new_text = str(replace_word(mispelled_words.getInfo(), mispelled_words, TextBuffer(text), 's', DICTIONARY, new_word='a tta'))
+    expected = spell_check_words(DICTIONARY, new_text)
+    assert [(item['word'], item['start'], item['end']) for item in mispelled_words.getItems()] == \
+        [(item['word'], item['start'], item['end']) for item in expected.getItems()]
@@ -0,0 +1,34 @@
+'''
+Checks that searching the suggestions one distance tier at a time finds the same words as searching every distance at once, with
+each tier only holding the words at its distance
+'''
+import pytest
+
+from bucketed_dictionary import BucketedDictionary
+from dawg import DawgIndex
+from suggestions import bounded_edit_distance, brute_force_search, search_tiers_by_length
+from symspell import SymSpellIndex
+
+DISTANCES = (1, 2, 3)
+
+
+@pytest.mark.parametrize('method', ['dawg', 'symspell', 'brute_force'])
+def test_search_tiers(words, queries, method, expected_matches):
+    if method == 'dawg':
+        search_tiers = DawgIndex(bounded_edit_distance, words).searchTiers
+    elif method == 'symspell':
+        search_tiers = SymSpellIndex(bounded_edit_distance, words).searchTiers
+    else:
+        dictionary = BucketedDictionary(words)
+        search_tiers = lambda word, max_distance, first_tier: search_tiers_by_length(
+            lambda *arguments: brute_force_search(dictionary, *arguments), word, max_distance, first_tier)
+    for word in queries:
+        for max_distance in DISTANCES:
+            expected = expected_matches(word, max_distance)
+            for first_tier in range(1, max_distance + 1):
+                tiers = list(search_tiers(word, max_distance, first_tier))
+                assert len(tiers) == max_distance - first_tier + 1
+                assert all(match[1] <= first_tier for match in tiers[0])
+                for distance, tier in enumerate(tiers[1:], first_tier + 1):
+                    assert all(match[1] == distance for match in tier)
+                assert sorted(match for tier in tiers for match in tier) == expected
@@ -0,0 +1,61 @@
+'''
+Checks that the spell check server answers valid requests, turns bad requests into error responses and answers a line that is too
+long instead of dropping the connection
+'''
+import asyncio
+import json
+
+import suggestions
+from server import SpellCheckServer
+from suggestion_engine import SuggestionEngine
+
+DICTIONARY = {'the', 'cat', 'sat', 'on', 'a', 'mat', 'hello', 'world', 'would', 'word'}
+
+
+def make_server() -> SpellCheckServer:
+    suggestions.set_suggestion_method('brute_force')
+    return SpellCheckServer(SuggestionEngine(set(DICTIONARY)))
+
+def test_check_and_suggest():
+    server = make_server()
+    response = server.handleRequest({'id': 1, 'method': 'check', 'params': {'text': 'the cta sat', 'suggestions': 1}})
+    assert response == {'id': 1, 'result': [{'word': 'cta', 'start': 4, 'end': 7, 'suggestions': ['cat']}]}
+    response = server.handleRequest({'id': 2, 'method': 'check', 'params': {'texts': ['the cat', 'teh']}})
+    assert [len(result) for result in response['result']] == [0, 1]
+    response = server.handleRequest({'id': 3, 'method': 'suggest', 'params': {'words': ['wrold'], 'limit': 1}})
+    assert response['result'][0][0]['distance'] == 1 and len(response['result'][0]) == 1
+
+def test_added_word_is_not_misspelled():
+    server = make_server()
+    assert server.handleRequest({'id': 1, 'method': 'add_word', 'params': {'word': 'cta'}}) == {'id': 1, 'result': True}
+    assert server.handleRequest({'id': 2, 'method': 'check', 'params': {'text': 'the cta'}})['result'] == []
+
+def test_bad_requests_are_answered_with_errors():
+    server = make_server()
+    assert 'error' in server.handleRequest([1, 2])
+    assert 'unknown method' in server.handleRequest({'id': 1, 'method': 'nope'})['error']
+    assert 'params must be' in server.handleRequest({'id': 1, 'method': 'check', 'params': []})['error']
+    assert 'invalid params' in server.handleRequest({'id': 1, 'method': 'check', 'params': {'texts': 'abc'}})['error']
+    assert 'invalid params' in server.handleRequest({'id': 1, 'method': 'add_word', 'params': {'word': ' '}})['error']
+    assert json.loads(server.handleLine(b'{not json')) == {'id': None, 'error': "invalid json"}
+    responses = json.loads(server.handleLine(b'[{"id": 1, "method": "check", "params": {"text": "teh"}}, 5]'))
+    assert responses[0]['id'] == 1 and 'error' in responses[1]
+
+def test_line_too_large():
+    server = make_server()
+
+    async def run() -> list:
+        listener = await asyncio.start_server(server.handleConnection, '127.0.0.1', 0, limit=64)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"id": 1, "method": "check", "params": {"text": "teh"}}\n')
+            writer.write(b'{"id": 2, "method": "check", "params": {"text": "' + b'x' * 200 + b'"}}\n')
+            await writer.drain()
+            lines = [json.loads(line) async for line in reader]
+            writer.close()
+            return lines
+
+    responses = asyncio.run(run())
+    assert responses[0]['id'] == 1 and len(responses[0]['result']) == 1
+    assert responses[1:] == [{'id': None, 'error': "request too large"}]
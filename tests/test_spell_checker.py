@@ -0,0 +1,95 @@
+'''
+Checks that the regex tokenizer splits text into the same words as checking is_word_character one character at a time and that
+recheck_range leaves the list of misspelled words the same as spell checking the whole edited text again
+'''
+import random
+
+import pytest
+
+from spell_checker import is_word_character, recheck_range, recheck_ranges, spell_check_words, split_word_offsets, split_words
+
+DICTIONARY = {'the', 'cat', 'sat', 'on', 'a', 'mat', 'and', 'dog', "it's", 'well-known'}
+WORDS = sorted(DICTIONARY) + ['teh', 'cta', 'dgo', 'mta', 'zz']
+
+SAMPLES = [
+    '',
+    'Helo wrold',
+    "it's a well-known fact, isn't it?",
+    '  leading and trailing  ',
+    'numbers 123 and mixed4words',
+    'under_score and snake_case_words',
+    'ünïcödé wörds — and dashes',
+    '--- \'\' -',
+    'line\nbreaks\r\nand\ttabs',
+]
+
+def character_loop_words(text:str) -> list[dict]:
+    '''
+    Reference tokenizer: a word is a run of characters for which is_word_character is true
+    '''
+    words = []
+    start = None
+    for index, character in enumerate(text):
+        if is_word_character(character):
+            if start is None:
+                start = index
+        elif start is not None:
+            words.append({'word': text[start:index], 'start': start, 'end': index})
+            start = None
+    if start is not None:
+        words.append({'word': text[start:], 'start': start, 'end': len(text)})
+    return words
+
+def random_texts(count:int) -> list[str]:
+    rng = random.Random(3)
+    return [''.join(rng.choice("ab Z9-'_.\né\r") for _ in range(rng.randint(0, 60))) for _ in range(count)]
+
+@pytest.mark.parametrize('text', SAMPLES + random_texts(200))
+def test_split_words_matches_character_loop(text):
+    assert split_words(text) == character_loop_words(text)
+
+@pytest.mark.parametrize('text', SAMPLES + random_texts(50))
+def test_split_word_offsets(text):
+    starts, ends = split_word_offsets(text)
+    assert [(word['start'], word['end']) for word in split_words(text)] == list(zip(starts, ends))
+
+def random_edits(rng:random.Random, length:int, count:int):
+    for _ in range(count):
+        start = rng.randint(0, length)
+        end = rng.randint(start, min(length, start + 6))
+        text = rng.choice(['', ' ', 'x', 'cat', ' dgo ', 'teh mat', ',', '-'])
+        yield start, end, text
+        length += len(text) - (end - start)
+
+def records(mispelled_words) -> list[tuple]:
+    return [(item['word'], item['start'], item['end']) for item in mispelled_words.getItems()]
+
+@pytest.mark.parametrize('seed', range(30))
+def test_recheck_range_matches_full_check(seed):
+    rng = random.Random(seed)
+    text = ' '.join(rng.choice(WORDS) for _ in range(20))
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    for start, end, new_text in random_edits(rng, len(text), 15):
+        text = text[:start] + new_text + text[end:]
+        recheck_range(DICTIONARY, text, mispelled_words, start, end, len(new_text) - (end - start))
+        assert records(mispelled_words) == records(spell_check_words(DICTIONARY, text))
+
+@pytest.mark.parametrize('seed', range(30))
+def test_recheck_ranges_matches_full_check(seed):
+    rng = random.Random(seed)
+    text = ' '.join(rng.choice(WORDS) for _ in range(30))
+    mispelled_words = spell_check_words(DICTIONARY, text)
+    # several edits of the same text made at once, some of them next to each other
+    edits = []
+    position = 0
+    while len(edits) < 6:
+        start = rng.randint(position, min(len(text), position + 8))
+        end = rng.randint(start, min(len(text), start + 4))
+        edits.append((start, end, rng.choice(['', 'x', 'cat', ' dgo ', '-', 'teh mat'])))
+        if end == len(text):
+            break
+        position = end + rng.randint(0, 1)
+    for start, end, new_text in reversed(edits):
+        text = text[:start] + new_text + text[end:]
+    recheck_ranges(DICTIONARY, text, mispelled_words, [(start, end, len(new_text) - (end - start)) for start, end, new_text in edits])
+    assert records(mispelled_words) == records(spell_check_words(DICTIONARY, text))
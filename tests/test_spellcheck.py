@@ -0,0 +1,37 @@
+'''
+Checks the non interactive spell check command: files cut into parts give the same results as checking them whole
+'''
+import io
+import json
+
+import pytest
+
+import spellcheck
+
+
+@pytest.fixture
+def dictionary(tmp_path) -> str:
+    path = tmp_path / 'words.txt'
+    path.write_text('\n'.join(['the', 'cat', 'sat', 'on', 'a', 'mat']) + '\n')
+    return str(path)
+
+def run_check(files:list[str], dictionary:str, workers:int=1) -> tuple[list[dict], dict]:
+    output = io.StringIO()
+    summary = spellcheck.check_files(files, dictionary, workers, 1, 'brute_force', output)
+    return [json.loads(line) for line in output.getvalue().splitlines()], summary
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parts_match_whole_files(tmp_path, monkeypatch, dictionary, workers):
+    first = tmp_path / 'first.txt'
+    first.write_text('the cta sat\non teh mat\n' * 20 + 'zz')
+    second = tmp_path / 'second.txt'
+    second.write_text('a mta\n')
+    files = [str(first), str(tmp_path / 'missing.txt'), str(second)]
+    expected, expected_summary = run_check(files, dictionary)
+    monkeypatch.setattr(spellcheck, 'PART_SIZE', 16)
+    results, summary = run_check(files, dictionary, workers)
+    assert results == expected
+    text = first.read_text()
+    assert all(text[result['start']:result['end']] == result['word'] for result in results if result['file'] == str(first))
+    assert [summary[key] for key in ('files', 'characters', 'misspellings', 'errors')] == [2, len(text) + 6, 42, 1]
+    assert [expected_summary[key] for key in ('files', 'characters', 'misspellings', 'errors')] == [2, len(text) + 6, 42, 1]
@@ -0,0 +1,78 @@
+'''
+Checks that the streaming checker finds the same words as checking the whole text at once however the file is split into chunks
+and parts
+'''
+import io
+import random
+
+import pytest
+
+import stream_checker
+from spell_checker import split_words, spell_check_words
+from stream_checker import iter_words, stream_misspellings
+
+SAMPLES = [
+    '',
+    'Helo wrold',
+    "it's a well-known fact, isn't it?",
+    '  leading and trailing  ',
+    'numbers 123 and mixed4words',
+    'under_score and snake_case_words',
+    'ünïcödé wörds — and dashes',
+    '--- \'\' -',
+    'line\nbreaks\r\nand\ttabs',
+]
+
+def random_texts(count:int) -> list[str]:
+    rng = random.Random(3)
+    return [''.join(rng.choice("ab Z9-'_.\né\r") for _ in range(rng.randint(0, 60))) for _ in range(count)]
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1000])
+def test_iter_words_matches_split_words(chunk_size):
+    for text in SAMPLES + random_texts(100):
+        counts = {}
+        words = [(word, start, end) for word, start, end, _ in iter_words(io.StringIO(text), chunk_size, counts)]
+        assert words == [(word['word'], word['start'], word['end']) for word in split_words(text)]
+        assert counts['characters'] == len(text)
+
+def test_iter_words_splits_long_runs(monkeypatch):
+    monkeypatch.setattr(stream_checker, 'MAX_WORD_LENGTH', 10)
+    text = 'a' * 95 + ' end'
+    words = [word for word, _, _, _ in iter_words(io.StringIO(text), 4)]
+    assert ''.join(words[:-1]) == 'a' * 95
+    assert words[-1] == 'end'
+    assert max(len(word) for word in words) <= 10 + 4
+
+def test_stream_misspellings_offsets(tmp_path):
+    # offsets are in the text as stored, so a Windows line ending counts as two characters
+    text = 'helo\r\nthe wrld\r\n'
+    path = tmp_path / 'input.txt'
+    path.write_bytes(text.encode('utf-8'))
+    counts = {}
+    found = list(stream_misspellings({'the'}, str(path), chunk_size=3, counts=counts))
+    assert [(item['word'], item['start'], item['end']) for item in found] == [('helo', 0, 4), ('wrld', 10, 14)]
+    assert [text[item['start']:item['end']] for item in found] == ['helo', 'wrld']
+    assert counts['characters'] == len(text)
+    expected = spell_check_words({'the'}, text).getItems()
+    assert [(item['word'], item['start'], item['end']) for item in found] == [(item['word'], item['start'], item['end']) for item in expected]
+
+@pytest.mark.parametrize('part_size', [1, 5, 17, 1 << 20])
+def test_file_parts_match_whole_file(tmp_path, monkeypatch, part_size):
+    # a small memo is forgotten many times while checking
+    monkeypatch.setattr(stream_checker, 'MAX_MEMO_SIZE', 2)
+    text = 'helo wörld\nthe cat\r\n\nsat ön\nthe mta zz\nlast'
+    path = tmp_path / 'input.txt'
+    path.write_bytes(text.encode('utf-8'))
+    ranges = stream_checker.split_file(str(path), part_size)
+    assert ranges[0][0] == 0 and ranges[-1][1] is None
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    found = []
+    offset = 0
+    for start, end in ranges:
+        counts = {}
+        for item in stream_misspellings({'the', 'cat', 'sat'}, str(path), chunk_size=4, counts=counts, start=start, end=end):
+            found.append((item['word'], offset + item['start'], offset + item['end']))
+        offset += counts['characters']
+    assert offset == len(text)
+    expected = spell_check_words({'the', 'cat', 'sat'}, text).getItems()
+    assert found == [(item['word'], item['start'], item['end']) for item in expected]
@@ -0,0 +1,64 @@
+'''
+Checks the suggestion cache on its own and the hits and misses the suggestion engine counts in it
+'''
+import suggestions
+from suggestion_cache import SuggestionCache
+from suggestion_engine import SuggestionEngine
+
+DICTIONARY = {'the', 'then', 'them', 'cat', 'cart', 'care', 'dog', 'door', 'hello', 'help', 'held', 'world', 'would', 'word'}
+
+
+def stats(engine:SuggestionEngine) -> tuple[int, int]:
+    cache_stats = engine.getCache().getStats()
+    return cache_stats['hits'], cache_stats['misses']
+
+def test_entries_are_keyed_by_generation_and_method():
+    cache = SuggestionCache(4)
+    cache.put('Word', 0, 'dawg', ['a'])
+    assert cache.get('word', 0, 'dawg') == ['a']
+    assert cache.get('word', 1, 'dawg') is None
+    assert cache.get('word', 0, 'symspell') is None
+    assert cache.getStats()['hits'] == 1 and cache.getStats()['misses'] == 2
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SuggestionCache(2)
+    cache.put('a', 0, 'dawg', [])
+    cache.put('b', 0, 'dawg', [])
+    cache.get('a', 0, 'dawg')
+    cache.put('c', 0, 'dawg', [])
+    assert cache.peek('a', 0, 'dawg') == [] and cache.peek('b', 0, 'dawg') is None and len(cache) == 2
+
+def test_full_entry_replaces_first_tier():
+    cache = SuggestionCache()
+    cache.put('word', 0, 'dawg', ['first'], first_tier=True)
+    cache.put('word', 0, 'dawg', ['first', 'second'])
+    assert cache.peek('word', 0, 'dawg', first_tier=True) is None and len(cache) == 1
+
+def test_peek_is_not_counted():
+    cache = SuggestionCache()
+    cache.put('word', 0, 'dawg', ['a'])
+    assert cache.peek('word', 0, 'dawg') == ['a'] and cache.peek('other', 0, 'dawg') is None
+    assert cache.getStats()['hits'] == 0 and cache.getStats()['misses'] == 0
+
+def test_engine_counts_one_lookup_per_call():
+    suggestions.set_suggestion_method('brute_force')
+    engine = SuggestionEngine(set(DICTIONARY))
+    engine.calculate('wrold', limit=1)
+    assert stats(engine) == (0, 1)
+    # the prefetcher only checks the cache, so it is not a lookup
+    engine.prefetch('helo')
+    engine.prefetch('helo')
+    assert stats(engine) == (0, 1)
+    engine.calculate('wrold')
+    engine.calculate('wrold')
+    assert stats(engine) == (1, 2)
+
+def test_save_and_load(tmp_path):
+    suggestions.set_suggestion_method('brute_force')
+    engine = SuggestionEngine(set(DICTIONARY))
+    expected = engine.calculate('wrold')
+    engine.saveCache(tmp_path / 'cache.json', 'key')
+    loaded = SuggestionEngine(set(DICTIONARY))
+    assert not loaded.loadCache(tmp_path / 'cache.json', 'other key')
+    assert loaded.loadCache(tmp_path / 'cache.json', 'key')
+    assert loaded.calculate('wrold') == expected and stats(loaded) == (1, 0)
@@ -0,0 +1,112 @@
+'''
+Checks that the suggestion engine finds the same suggestions one distance tier at a time as all at once, only searches the tiers
+that are used, adds suggestions to a misspelled word a page at a time and keeps its indexes and cache in step with the dictionary
+'''
+import pytest
+
+import suggestions
+from spell_checker import spell_check_words
+from suggestion_engine import SuggestionEngine
+from word_frequency import FrequencyTable
+
+DICTIONARY = {'the', 'then', 'them', 'cat', 'cart', 'care', 'dog', 'door', 'hello', 'help', 'held', 'world', 'would', 'word'}
+METHODS = ['dawg', 'symspell', 'brute_force']
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_iter_suggestions_matches_calculate(words, queries, method, monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', method)
+    tiered = SuggestionEngine(set(words))
+    engine = SuggestionEngine(set(words))
+    for word in queries:
+        found = list(tiered.iterSuggestions(word))
+        assert found == engine.calculate(word)
+        # the full list is cached once every tier has been searched
+        assert tiered.getCache().peek(word.casefold().strip(), 0, method) == found
+
+@pytest.mark.parametrize('method', METHODS)
+def test_iter_suggestions_searches_tiers_when_used(method, monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', method)
+    engine = SuggestionEngine(set(DICTIONARY))
+    stream = engine.iterSuggestions('wrold')
+    first = next(stream)
+    assert first['distance'] <= 1
+    assert engine.getCache().peek('wrold', 0, method) is None
+    rest = list(stream)
+    distances = [suggestion['distance'] for suggestion in [first] + rest]
+    assert distances == sorted(distances) and max(distances) == 2
+    assert engine.getCache().peek('wrold', 0, method) == [first] + rest
+
+def test_get_suggestions_adds_pages(monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', 'dawg')
+    engine = SuggestionEngine(set(DICTIONARY))
+    expected = [suggestion['word'] for suggestion in SuggestionEngine(set(DICTIONARY)).calculate('helo')]
+    mispelled_words = spell_check_words(DICTIONARY, 'helo cat helo')
+    word = mispelled_words.getInfo()
+    stream = engine.getSuggestions(mispelled_words, word, limit=2)
+    assert stream is not None and word['suggestions'] == expected[:2]
+    stream = engine.getSuggestions(mispelled_words, word, limit=4, stream=stream)
+    assert word['suggestions'] == expected[:4]
+    # the stream ends once every suggestion has been added
+    assert engine.getSuggestions(mispelled_words, word, stream=stream) is None
+    assert word['suggestions'] == expected
+    assert mispelled_words.getOccurrences('helo')[1]['suggestions'] == expected
+
+def test_get_suggestions_skips_known_suggestions(monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', 'dawg')
+    engine = SuggestionEngine(set(DICTIONARY))
+    expected = [suggestion['word'] for suggestion in engine.calculate('helo')]
+    mispelled_words = spell_check_words(DICTIONARY, 'helo')
+    word = mispelled_words.getInfo()
+    mispelled_words.updateSuggestions([{'word': expected[1]}], 'helo')
+    assert engine.getSuggestions(mispelled_words, word) is None
+    assert sorted(word['suggestions']) == sorted(expected)
+
+@pytest.mark.parametrize('method', METHODS)
+def test_added_word_is_suggested(method, monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', method)
+    engine = SuggestionEngine(set(DICTIONARY))
+    engine.prepare()
+    before = engine.calculate('wrold')
+    assert 'wrld' not in [suggestion['word'] for suggestion in before]
+    engine.addWord(' Wrld ')
+    assert 'wrld' in engine.getDictionary()
+    # suggestions cached before the word was added are not used
+    expected = SuggestionEngine(set(DICTIONARY) | {'wrld'}).calculate('wrold')
+    assert 'wrld' in [suggestion['word'] for suggestion in expected]
+    assert engine.calculate('wrold') == expected
+    assert engine.getCache().getStats()['hits'] == 0
+    assert list(engine.iterSuggestions('wrold')) == expected
+
+@pytest.mark.parametrize('method', ['dawg', 'symspell'])
+def test_index_is_built_once(method, monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', method)
+    builds = []
+    build_index = suggestions.build_index
+    monkeypatch.setattr(suggestions, 'build_index', lambda *arguments: builds.append(arguments) or build_index(*arguments))
+    engine = SuggestionEngine(set(DICTIONARY))
+    engine.prepare()
+    engine.calculate('helo')
+    engine.addWord('helo')
+    assert engine.calculate('helo')[0] == {'word': 'helo', 'distance': 0}
+    engine.prefetch('wrold')
+    list(engine.iterSuggestions('dgo'))
+    assert len(builds) == 1
+
+def test_engines_do_not_share_suggestions(monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', 'dawg')
+    small = SuggestionEngine({'dog'})
+    large = SuggestionEngine(set(DICTIONARY))
+    assert [suggestion['word'] for suggestion in small.calculate('cta')] == []
+    assert 'cat' in [suggestion['word'] for suggestion in large.calculate('cta')]
+
+def test_frequency_table_changes_ranking(monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', 'dawg')
+    engine = SuggestionEngine(set(DICTIONARY))
+    alphabetical = [suggestion['word'] for suggestion in engine.calculate('helo')]
+    frequencies = FrequencyTable(engine.getDictionary())
+    frequencies.setCount('help', 100)
+    engine.setFrequencyTable(frequencies)
+    assert len(engine.getCache()) == 0
+    ranked = [suggestion['word'] for suggestion in engine.calculate('helo')]
+    assert sorted(ranked) == sorted(alphabetical) and ranked[0] == 'help' != alphabetical[0]
@@ -0,0 +1,57 @@
+'''
+Checks that prefetching caches the first distance tier of a word's suggestions and that the prefetcher queues the words the user is
+about to look at
+'''
+import time
+
+import pytest
+
+import suggestions
+from spell_checker import spell_check_words
+from suggestion_engine import SuggestionEngine
+from suggestion_prefetcher import SuggestionPrefetcher, nearby_words
+
+DICTIONARY = {'the', 'then', 'them', 'cat', 'cart', 'care', 'dog', 'door', 'hello', 'help', 'held', 'world', 'would', 'word'}
+
+
+@pytest.mark.parametrize('method', ['dawg', 'symspell', 'brute_force'])
+def test_prefetch_caches_first_tier(method, monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', method)
+    engine = SuggestionEngine(set(DICTIONARY))
+    expected = SuggestionEngine(set(DICTIONARY)).calculate('wrold')
+    engine.prefetch('Wrold')
+    cache = engine.getCache()
+    assert cache.peek('wrold', 0, method) is None
+    assert cache.peek('wrold', 0, method, first_tier=True) == [match for match in expected if match['distance'] <= 1]
+    # the prefetched tier is used and the later tiers are searched
+    assert list(engine.iterSuggestions('wrold')) == expected
+    assert cache.peek('wrold', 0, method) == expected
+
+def test_prefetch_of_short_word_is_full_list(monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', 'dawg')
+    engine = SuggestionEngine(set(DICTIONARY))
+    engine.prefetch('dgo')
+    assert engine.getCache().peek('dgo', 0, 'dawg') == SuggestionEngine(set(DICTIONARY)).calculate('dgo')
+
+def test_nearby_words_wrap_around():
+    mispelled_words = spell_check_words(DICTIONARY, 'aa bb Aa cc dd ee')
+    assert nearby_words(mispelled_words) == ['aa', 'bb', 'ee', 'cc']
+    mispelled_words.setCurrent(5)
+    assert nearby_words(mispelled_words, ahead=2) == ['ee', 'aa', 'dd', 'bb']
+    assert nearby_words(spell_check_words(DICTIONARY, 'the cat')) == []
+
+def test_prefetcher_fills_cache(monkeypatch):
+    monkeypatch.setattr(suggestions, 'suggestion_method', 'dawg')
+    engine = SuggestionEngine(set(DICTIONARY))
+    engine.prepare()
+    prefetcher = SuggestionPrefetcher(engine)
+    prefetcher.start(spell_check_words(DICTIONARY, 'helo wrold dgo'))
+    deadline = time.monotonic() + 10
+    while prefetcher.getStats()['prefetched'] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    prefetcher.stop()
+    assert prefetcher.getStats() == {'queued': 0, 'prefetched': 3}
+    cache = engine.getCache()
+    for word in ('helo', 'wrold', 'dgo'):
+        assert cache.peek(word, 0, 'dawg') is not None or cache.peek(word, 0, 'dawg', first_tier=True) is not None
+    assert cache.getStats()['hits'] == 0 and cache.getStats()['misses'] == 0
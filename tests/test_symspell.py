@@ -0,0 +1,23 @@
+'''
+Checks that the SymSpell index finds exactly the words that comparing the word against every dictionary word with edit_distance
+finds, including words added after the index was built and words short enough to be deleted down to the empty string
+'''
+from suggestions import bounded_edit_distance
+from symspell import SymSpellIndex, generate_deletes
+
+DISTANCES = (1, 2, 3)
+
+
+def test_symspell_search(words, queries, expected_matches):
+    index = SymSpellIndex(bounded_edit_distance, words[:-100])
+    for word in words[-100:]:
+        index.add(word)
+    for word in queries:
+        for max_distance in DISTANCES:
+            assert sorted(index.search(word, max_distance)) == expected_matches(word, max_distance)
+
+def test_deletes_reach_the_empty_string():
+    assert '' in generate_deletes('ab', 2)
+    assert '' not in generate_deletes('abc', 2)
+    index = SymSpellIndex(bounded_edit_distance, ['a', 'ab', 'abc'])
+    assert sorted(index.search('b', 1)) == [('a', 1), ('ab', 1)]
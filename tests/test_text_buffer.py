@@ -0,0 +1,74 @@
+'''
+Checks that TextBuffer edits give the same text as editing a string
+'''
+import random
+
+import pytest
+
+from text_buffer import TextBuffer
+
+WORDS = ['a', 'and', 'cat', 'dog', "it's", 'mat', 'on', 'sat', 'the', 'well-known', 'teh', 'cta', 'dgo', 'mta', 'zz']
+
+
+def random_edits(rng:random.Random, length:int, count:int):
+    for _ in range(count):
+        start = rng.randint(0, length)
+        end = rng.randint(start, min(length, start + 6))
+        text = rng.choice(['', ' ', 'x', 'cat', ' dgo ', 'teh mat', ',', '-'])
+        yield start, end, text
+        length += len(text) - (end - start)
+
+def test_empty_buffer():
+    buffer = TextBuffer()
+    assert str(buffer) == '' and len(buffer) == 0
+    assert buffer.replace(0, 0, 'abc') == 3
+    assert str(buffer) == 'abc'
+
+@pytest.mark.parametrize('seed', range(20))
+def test_replace_matches_string_edits(seed):
+    rng = random.Random(seed)
+    text = ' '.join(rng.choice(WORDS) for _ in range(15))
+    buffer = TextBuffer(text)
+    for start, end, new_text in random_edits(rng, len(text), 25):
+        assert buffer.replace(start, end, new_text) == len(new_text) - (end - start)
+        text = text[:start] + new_text + text[end:]
+        assert len(buffer) == len(text)
+        assert str(buffer) == text
+        if text:
+            position = rng.randrange(len(text))
+            assert buffer[position] == text[position]
+            assert buffer[position:position + 5] == text[position:position + 5]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_replace_all_matches_string_edits(seed):
+    rng = random.Random(seed)
+    text = ' '.join(rng.choice(WORDS) for _ in range(30))
+    buffer = TextBuffer(text)
+    # earlier edits leave the buffer split into several pieces
+    for start, end, new_text in random_edits(rng, len(text), 5):
+        buffer.replace(start, end, new_text)
+        text = text[:start] + new_text + text[end:]
+    ranges = []
+    position = 0
+    while position < len(text) and len(ranges) < 8:
+        position = rng.randint(position, len(text))
+        end = min(len(text), position + rng.randint(0, 4))
+        ranges.append((position, end))
+        position = end + 1
+    new_text = rng.choice(['', 'x', 'cat'])
+    edits = buffer.replaceAll(list(reversed(ranges)), new_text)
+    expected = text
+    for start, end in reversed(ranges):
+        expected = expected[:start] + new_text + expected[end:]
+    assert str(buffer) == expected and len(buffer) == len(expected)
+    assert edits == [(start, end, len(new_text) - (end - start)) for start, end in ranges]
+    if expected:
+        position = rng.randrange(len(expected))
+        assert buffer[position] == expected[position]
+
+def test_copy_is_independent():
+    buffer = TextBuffer('the cat sat')
+    copy = buffer.copy()
+    copy.replace(4, 7, 'dog')
+    assert str(buffer) == 'the cat sat'
+    assert str(copy) == 'the dog sat'
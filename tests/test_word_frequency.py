@@ -0,0 +1,55 @@
+'''
+Checks that word frequency counts are the same whether they are read from the frequency file or from the compiled dictionary, and
+that changing the frequency file compiles the dictionary again
+'''
+import os
+
+from compiled_dictionary import load_compiled_dictionary
+from main import upload_dictionary
+from word_frequency import FrequencyTable, frequency_file_name, load_frequency_table
+
+WORDS = ['the', 'cat', 'cart', 'care', 'dog', 'naïve']
+FREQUENCIES = 'the 100\nThe 5\ncat 7\ncare x\nunknown 3\nnaïve 2 extra\ndog 4\n'
+
+
+def write_dictionary(tmp_path, frequencies:str=FREQUENCIES) -> str:
+    name = tmp_path / 'words.txt'
+    name.write_text('\n'.join(WORDS) + '\n', encoding='utf-8')
+    if frequencies is not None:
+        with open(frequency_file_name(str(name)), 'w', encoding='utf-8') as file:
+            file.write(frequencies)
+    return str(name)
+
+def counts(table:FrequencyTable) -> dict:
+    return {word: table.getCount(word) for word in WORDS + ['unknown']}
+
+def test_stored_counts_match_frequency_file(tmp_path):
+    name = write_dictionary(tmp_path)
+    dictionary = load_compiled_dictionary(name)
+    assert dictionary.getCounts() is not None
+    stored = load_frequency_table(dictionary, name)
+    parsed = FrequencyTable(dictionary)
+    assert parsed.load(frequency_file_name(name)) == 4
+    in_memory = load_frequency_table(upload_dictionary(name, compiled=False), name)
+    expected = {'the': 105, 'cat': 7, 'cart': 0, 'care': 0, 'dog': 4, 'naïve': 0, 'unknown': 0}
+    assert counts(stored) == counts(parsed) == counts(in_memory) == expected
+    # stored counts are copied, so they can still be changed
+    assert stored.setCount('cart', 9) and stored.getCount('cart') == 9
+    dictionary.close()
+
+def test_no_frequency_file(tmp_path):
+    name = write_dictionary(tmp_path, None)
+    dictionary = load_compiled_dictionary(name)
+    assert dictionary.getCounts() is None and load_frequency_table(dictionary, name) is None
+    dictionary.close()
+
+def test_newer_frequency_file_is_compiled_again(tmp_path):
+    name = write_dictionary(tmp_path)
+    load_compiled_dictionary(name).close()
+    with open(frequency_file_name(name), 'w', encoding='utf-8') as file:
+        file.write('cart 12\n')
+    later = os.path.getmtime(name) + 10
+    os.utime(frequency_file_name(name), (later, later))
+    dictionary = load_compiled_dictionary(name)
+    assert counts(load_frequency_table(dictionary, name))['cart'] == 12
+    dictionary.close()
@@ -0,0 +1,126 @@
+'''
+Checks that WordList keeps its records, word index and current position the same as a plain list of dictionaries would
+'''
+import random
+
+import pytest
+
+from spell_checker import spell_check_words
+from word_list import WordList
+
+DICTIONARY = {'the', 'cat', 'sat', 'on', 'a', 'mat'}
+WORDS = sorted(DICTIONARY) + ['teh', 'cta', 'mta', 'zz']
+MISSPELLED = ['teh', 'Teh', 'cta', 'mta', 'zz']
+
+
+def offsets(mispelled_words:WordList) -> list[tuple]:
+    return [(item['word'], item['start'], item['end']) for item in mispelled_words.getItems()]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_remap_offsets_matches_shifting_each_edit(seed):
+    rng = random.Random(seed)
+    text = ' '.join(rng.choice(WORDS) for _ in range(40))
+    remapped = spell_check_words(DICTIONARY, text)
+    shifted = spell_check_words(DICTIONARY, text)
+    positions = sorted(rng.sample(range(len(text) + 1), 6))
+    edits = [(position, rng.choice([-2, 0, 1, 3])) for position in positions]
+    remapped.remapOffsets(edits)
+    # shifting from the last edit to the first keeps each position valid for the edits still to be applied
+    for position, delta in reversed(edits):
+        shifted.shiftOffsets(position, delta)
+    assert offsets(remapped) == offsets(shifted)
+
+def test_shift_offsets_only_moves_later_items():
+    mispelled_words = WordList()
+    for index, (word, start) in enumerate((('teh', 0), ('cta', 8), ('zz', 20))):
+        mispelled_words.append(word, start, start + len(word), index)
+    mispelled_words.shiftOffsets(8, 5)
+    assert offsets(mispelled_words) == [('teh', 0, 3), ('cta', 13, 16), ('zz', 25, 27)]
+
+def test_records_read_and_write_like_dicts():
+    mispelled_words = WordList()
+    mispelled_words.append('teh', 0, 3, 0)
+    record = mispelled_words.getInfo()
+    record['start'] = 4
+    assert (record['word'], record['start'], record['end'], record['og_index']) == ('teh', 4, 3, 0)
+    with pytest.raises(KeyError):
+        record['missing']
+    with pytest.raises(KeyError):
+        record['missing'] = 1
+
+def test_occurrences_share_suggestions():
+    mispelled_words = spell_check_words(DICTIONARY, 'teh cat Teh mta teh')
+    mispelled_words.updateSuggestions([{'word': 'the'}, {'word': 'tea'}], 'teh')
+    mispelled_words.updateSuggestions([{'word': 'tea'}, {'word': 'ten'}], 'TEH')
+    records = mispelled_words.getOccurrences('teh')
+    assert len(records) == 3
+    assert all(record['suggestions'] is records[0]['suggestions'] for record in records)
+    assert records[0]['suggestions'] == ['the', 'tea', 'ten']
+    assert mispelled_words.findItem('mta')['suggestions'] == []
+
+def delete_from_model(model:list, current:int, indexes:list[int]) -> int:
+    '''
+    Reference for removing items: a plain list where every removal moves current left if it was at or before it
+    '''
+    for index in sorted(indexes, reverse=True):
+        model.pop(index)
+        if not model:
+            current = 0
+        elif index <= current:
+            current = (current - 1) % len(model)
+    return current
+
+def check_index(mispelled_words:WordList, model:list):
+    assert [(item['word'], item['start']) for item in mispelled_words.getItems()] == model
+    assert mispelled_words.getSize() == len(model)
+    for word in MISSPELLED:
+        positions = [index for index, (item, _) in enumerate(model) if item.casefold() == word.casefold()]
+        records = mispelled_words.getOccurrences(word)
+        assert [(item['word'], item['start']) for item in records] == [model[index] for index in positions]
+        assert mispelled_words.getIndex(word) == (positions[0] if positions else None)
+    counts = {}
+    for item, _ in model:
+        counts[item.casefold()] = counts.get(item.casefold(), 0) + 1
+    assert mispelled_words.getWordCounts() == counts
+
+@pytest.mark.parametrize('seed', range(50))
+def test_index_and_current_match_plain_list(seed):
+    rng = random.Random(seed)
+    mispelled_words = WordList()
+    model = []
+    position = 0
+    for index in range(rng.randint(0, 12)):
+        word = rng.choice(MISSPELLED)
+        mispelled_words.append(word, position, position + len(word), index)
+        model.append((word, position))
+        position += len(word) + rng.randint(1, 3)
+    current = 0
+    if model:
+        current = rng.randrange(len(model))
+        mispelled_words.setCurrent(current)
+
+    for _ in range(30):
+        operation = rng.choice(['insert', 'delete', 'removeAllItems', 'deleteItems'])
+        if operation == 'insert':
+            word = rng.choice(MISSPELLED)
+            start = rng.randint(0, position)
+            index = sum(1 for _, item_start in model if item_start <= start)
+            if index <= current and model:
+                current += 1
+            model.insert(index, (word, start))
+            mispelled_words.insert(word, start, start + len(word), None)
+        elif operation == 'delete' and model:
+            index = rng.randrange(len(model))
+            current = delete_from_model(model, current, [index])
+            mispelled_words.delete(index)
+        elif operation == 'removeAllItems':
+            word = rng.choice(MISSPELLED)
+            indexes = [index for index, (item, _) in enumerate(model) if item.casefold() == word.casefold()]
+            current = delete_from_model(model, current, indexes)
+            mispelled_words.removeAllItems(word)
+        elif operation == 'deleteItems' and model:
+            indexes = rng.sample(range(len(model)), rng.randint(0, len(model)))
+            current = delete_from_model(model, current, indexes)
+            mispelled_words.deleteItems(indexes)
+        check_index(mispelled_words, model)
+        assert mispelled_words.current() == current